@@ -4,7 +4,7 @@ Central configuration manager for Etsy AI Assistant
 import streamlit as st
 from .settings import *
 from .translations import TRANSLATIONS, get_translation
-from .env_config import load_environment, validate_environment, get_debug_mode
+from .env_config import load_environment, validate_environment, get_debug_mode, get_metrics_port, get_metrics_file, get_trace_file, get_profiler_backend
 
 
 class ConfigManager:
@@ -53,11 +53,20 @@ class ConfigManager:
             'window_seconds': RATE_LIMIT_WINDOW
         }
     
+    def get_job_settings(self):
+        """Get background job configuration"""
+        return {
+            'workers': JOB_WORKERS,
+            'poll_seconds': JOB_POLL_SECONDS,
+            'result_ttl_seconds': JOB_RESULT_TTL_SECONDS
+        }
+    
     def get_cache_settings(self):
         """Get cache configuration"""
         return {
             'expiry_hours': CACHE_EXPIRY_HOURS,
-            'max_entries': MAX_CACHE_ENTRIES
+            'max_entries': MAX_CACHE_ENTRIES,
+            'generated_content_max_age_minutes': GENERATED_CONTENT_MAX_AGE_MINUTES
         }
     
     def get_validation_settings(self):
@@ -67,7 +76,8 @@ class ConfigManager:
             'max_description_length': MAX_DESCRIPTION_LENGTH,
             'min_category_length': MIN_CATEGORY_LENGTH,
             'min_audience_length': MIN_AUDIENCE_LENGTH,
-            'min_theme_length': MIN_THEME_LENGTH
+            'min_theme_length': MIN_THEME_LENGTH,
+            'product_form_fields': PRODUCT_FORM_FIELDS
         }
     
     def get_etsy_settings(self):
@@ -77,14 +87,21 @@ class ConfigManager:
             'title_min_chars': ETSY_TITLE_MIN_CHARS,
             'max_tags': ETSY_MAX_TAGS,
             'tag_max_chars': ETSY_TAG_MAX_CHARS,
-            'image_size': ETSY_IMAGE_SIZE
+            'image_size': ETSY_IMAGE_SIZE,
+            'title_max_pad_chars': ETSY_TITLE_MAX_PAD_CHARS,
+            'tag_max_pad': ETSY_TAG_MAX_PAD
         }
     
     def get_image_settings(self):
         """Get image generation configuration"""
         return {
             'dalle_sizes': DALLE_IMAGE_SIZES,
-            'default_size': DEFAULT_IMAGE_SIZE
+            'dalle_model': DALLE_MODEL,
+            'dalle_size_models': DALLE_SIZE_MODELS,
+            'default_size': DEFAULT_IMAGE_SIZE,
+            'thumbnail_sizes': THUMBNAIL_SIZES,
+            'thumbnail_format': THUMBNAIL_FORMAT,
+            'thumbnail_cache_dir': THUMBNAIL_CACHE_DIR
         }
     
     def get_batch_settings(self):
@@ -94,12 +111,92 @@ class ConfigManager:
             'delay_seconds': BATCH_DELAY_SECONDS
         }
     
+    def get_bulk_settings(self):
+        """Get bulk generation configuration"""
+        return {
+            'concurrency': BULK_CONCURRENCY,
+            'default_steps': BULK_DEFAULT_STEPS,
+            'default_options': BULK_DEFAULT_OPTIONS,
+            'max_retries': BULK_MAX_RETRIES,
+            'retry_backoff_seconds': BULK_RETRY_BACKOFF_SECONDS,
+            'journal_db_path': BULK_JOURNAL_DB_PATH
+        }
+    
+    def get_batch_api_settings(self):
+        """Get Batch API configuration"""
+        return {
+            'price_factor': BATCH_PRICE_FACTOR,
+            'completion_window': BATCH_COMPLETION_WINDOW,
+            'poll_seconds': BATCH_POLL_SECONDS,
+            'max_requests': BATCH_MAX_REQUESTS,
+            'standin_port': BATCH_STANDIN_PORT
+        }
+    
+    def get_usage_settings(self):
+        """Get token usage and cost configuration"""
+        return {
+            'model_prices': MODEL_PRICES,
+            'listing_cost_budget_usd': LISTING_COST_BUDGET_USD,
+            'db_path': USAGE_DB_PATH
+        }
+    
     def get_analytics_settings(self):
         """Get analytics configuration"""
         return {
             'max_api_call_history': MAX_API_CALL_HISTORY,
             'max_error_log_entries': MAX_ERROR_LOG_ENTRIES,
-            'max_content_history': MAX_CONTENT_HISTORY
+            'max_content_history': MAX_CONTENT_HISTORY,
+            'histogram_min_seconds': HISTOGRAM_MIN_SECONDS,
+            'histogram_max_seconds': HISTOGRAM_MAX_SECONDS,
+            'histogram_growth_factor': HISTOGRAM_GROWTH_FACTOR
+        }
+    
+    def get_metrics_settings(self):
+        """Get metrics export configuration"""
+        return {
+            'host': METRICS_HOST,
+            'port': get_metrics_port(),
+            'file': get_metrics_file(),
+            'file_interval': METRICS_FILE_INTERVAL,
+            'latency_buckets': METRICS_LATENCY_BUCKETS
+        }
+    
+    def get_tracing_settings(self):
+        """Get tracing configuration"""
+        return {
+            'buffer_size': TRACE_BUFFER_SIZE,
+            'max_spans': TRACE_MAX_SPANS,
+            'export_file': get_trace_file()
+        }
+    
+    def get_profiler_settings(self):
+        """Get rerun profiler configuration"""
+        return {
+            'enabled': self.is_debug_mode(),
+            'backend': get_profiler_backend(),
+            'report_size': PROFILER_REPORT_SIZE,
+            'top_functions': PROFILER_TOP_FUNCTIONS,
+            'profile_dir': PROFILE_DIR
+        }
+    
+    def get_memory_settings(self):
+        """Get memory budget configuration"""
+        return {
+            'budget_mb': MEMORY_BUDGET_MB,
+            'idle_seconds': MEMORY_IDLE_SECONDS,
+            'accounting_interval': MEMORY_ACCOUNTING_INTERVAL,
+            'tracked_keys': MEMORY_TRACKED_KEYS
+        }
+    
+    def get_session_settings(self):
+        """Get session persistence configuration"""
+        return {
+            'persistence_enabled': SESSION_PERSISTENCE_ENABLED,
+            'db_path': SESSION_DB_PATH,
+            'token_param': SESSION_TOKEN_PARAM,
+            'snapshot_ttl_days': SESSION_SNAPSHOT_TTL_DAYS,
+            'persisted_keys': PERSISTED_SESSION_KEYS,
+            'deferred_keys': DEFERRED_SESSION_KEYS
         }
     
     def get_feature_names(self):
@@ -110,7 +207,10 @@ class ConfigManager:
         """Get UI configuration"""
         return {
             'sidebar_width': SIDEBAR_WIDTH,
-            'content_max_chars_preview': CONTENT_MAX_CHARS_PREVIEW
+            'content_max_chars_preview': CONTENT_MAX_CHARS_PREVIEW,
+            'total_steps': TOTAL_STEPS,
+            'step_query_param': STEP_QUERY_PARAM,
+            'stats_refresh_seconds': STATS_REFRESH_SECONDS
         }
     
     def is_debug_mode(self):
@@ -127,12 +227,21 @@ class ConfigManager:
             },
             'api': self.get_api_settings(),
             'rate_limit': self.get_rate_limit_settings(),
+            'jobs': self.get_job_settings(),
             'cache': self.get_cache_settings(),
             'validation': self.get_validation_settings(),
             'etsy': self.get_etsy_settings(),
             'image': self.get_image_settings(),
             'batch': self.get_batch_settings(),
+            'bulk': self.get_bulk_settings(),
+            'batch_api': self.get_batch_api_settings(),
             'analytics': self.get_analytics_settings(),
+            'usage': self.get_usage_settings(),
+            'metrics': self.get_metrics_settings(),
+            'tracing': self.get_tracing_settings(),
+            'profiler': self.get_profiler_settings(),
+            'memory': self.get_memory_settings(),
+            'session': self.get_session_settings(),
             'ui': self.get_ui_settings(),
             'debug': self.is_debug_mode()
         }
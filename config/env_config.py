@@ -30,6 +30,28 @@ def get_debug_mode():
     return os.getenv("DEBUG", "false").lower() == "true"
 
 
+def get_metrics_port():
+    """Get the port of the Prometheus metrics endpoint (None disables it)"""
+    port = os.getenv("METRICS_PORT")
+    return int(port) if port else None
+
+
+def get_metrics_file():
+    """Get the path the metrics are periodically written to (None disables it)"""
+    return os.getenv("METRICS_FILE") or None
+
+
+def get_trace_file():
+    """Get the JSONL file finished traces are appended to (None disables export)"""
+    return os.getenv("TRACE_FILE") or None
+
+
+def get_profiler_backend():
+    """Get the per-rerun profile capture backend: 'cprofile', 'pyinstrument' or None"""
+    backend = os.getenv("PROFILER", "").lower()
+    return backend if backend in ('cprofile', 'pyinstrument') else None
+
+
 def get_environment_type():
     """Get environment type (development/production)"""
     return os.getenv("ENVIRONMENT", "development")
@@ -60,6 +82,10 @@ def get_all_env_vars():
         'PORT': os.getenv("PORT"),
         'DEBUG': os.getenv("DEBUG"),
         'ENVIRONMENT': os.getenv("ENVIRONMENT"),
+        'METRICS_PORT': os.getenv("METRICS_PORT"),
+        'METRICS_FILE': os.getenv("METRICS_FILE"),
+        'TRACE_FILE': os.getenv("TRACE_FILE"),
+        'PROFILER': os.getenv("PROFILER"),
     }
     
     return {k: v for k, v in env_vars.items() if v is not None} 
\ No newline at end of file
@@ -0,0 +1,518 @@
+"""
+Prompt templates for Etsy AI Assistant
+One system/user prompt pair per generated content type and language
+"""
+import textwrap
+from config.settings import MAX_TOKENS_DEFAULT, PRODUCT_FORM_FIELDS
+
+
+PROMPTS = {
+    'print_guide': {
+        'tr': (
+            "Sen bir DTG (Direct-to-Garment) baskı uzmanısın.",
+            """
+            Ürün: {product_description}
+
+            Bu ürün için DTG baskı hazırlık rehberi oluştur:
+            1. Dosya formatı ve çözünürlük gereksinimleri
+            2. Renk profili ayarları (RGB vs CMYK)
+            3. Tasarım boyutlandırma rehberi
+            4. Farklı ürün tipleri için baskı alanları
+            5. Kalite kontrol listesi
+            6. Yaygın baskı hataları ve çözümleri
+            """
+        ),
+        'en': (
+            "You are a DTG (Direct-to-Garment) printing expert.",
+            """
+            Product: {product_description}
+
+            Create a comprehensive DTG print preparation guide for this product:
+            1. File format and resolution requirements
+            2. Color profile settings (RGB vs CMYK)
+            3. Design sizing guidelines
+            4. Print areas for different product types
+            5. Quality control checklist
+            6. Common printing issues and solutions
+            7. Pre-press optimization tips
+            """
+        )
+    },
+    'image_guide': {
+        'tr': (
+            "Sen bir e-ticaret görsel uzmanısın. Etsy için ürün görsellerini optimize etme konusunda uzmanısın.",
+            """
+            Ürün: {product_description}
+            Kategori: {product_category}
+
+            Bu ürün için Etsy görsel optimizasyon rehberi oluştur:
+            1. Görsel boyut ve format özellikleri (2000x2000px kare format)
+            2. Ana ürün görseli özellikleri
+            3. Ek görseller (mockup, detay, kullanım)
+            4. SEO için alt text önerileri
+            5. Görsel sıralaması stratejisi
+            6. Mobil optimizasyon ipuçları
+            """
+        ),
+        'en': (
+            "You are an e-commerce visual expert specializing in Etsy product image optimization.",
+            """
+            Product: {product_description}
+            Category: {product_category}
+
+            Create a comprehensive Etsy image optimization guide for this product:
+            1. Image size and format specifications (2000x2000px square format)
+            2. Main product image characteristics
+            3. Additional images (mockups, details, usage)
+            4. SEO alt text suggestions
+            5. Image sequence strategy
+            6. Mobile optimization tips
+            7. Best practices for Etsy search visibility
+            """
+        )
+    },
+    'titles': {
+        'tr': (
+            "Sen bir Etsy SEO uzmanısın. Yüksek dönüşüm oranına sahip başlıklar oluşturuyorsun.",
+            """
+            Ürün: {product_description}
+            Hedef Kitle: {target_audience}
+            Tasarım Teması: {design_theme}
+
+            {num_titles} adet SEO optimized Etsy başlığı oluştur:
+            - Her başlık 130-140 karakter arası
+            - Anahtar kelimeler, tema, hedef kitle, ürün tipi içersin
+            - Yüksek arama hacimli kelimeler kullan
+            - Her başlık için karakter sayısını belirt
+            """
+        ),
+        'en': (
+            "You are an Etsy SEO expert. Create high-converting titles between 130-140 characters.",
+            """
+            Product: {product_description}
+            Target Audience: {target_audience}
+            Style: {design_theme}
+
+            Create {num_titles} SEO optimized Etsy titles:
+            - Each title 130-140 characters
+            - Include keywords, theme, target audience, product type
+            - Use high search volume keywords
+            - Include character count for each title
+            """
+        )
+    },
+    'tags': {
+        'tr': (
+            "Sen bir Etsy SEO uzmanısın. En etkili 13 etiketi seçiyorsun.",
+            """
+            Ürün: {product_description}
+            Kategori: {product_category}
+            Hedef Kitle: {target_audience}
+
+            Bu ürün için tam 13 adet Etsy etiketi oluştur:
+            - Her etiket maksimum 20 karakter
+            - Yüksek arama hacimli kelimeler kullan
+            - Uzun kuyruk anahtar kelimeler ekle
+            - Ürün tipi, stil, hedef kitle, malzeme, renk kategorilerinden seç
+            - Her etiketin neden seçildiğini kısaca açıkla
+            """
+        ),
+        'en': (
+            "You are an Etsy SEO expert. Select the most effective 13 tags.",
+            """
+            Product: {product_description}
+            Category: {product_category}
+            Target Audience: {target_audience}
+
+            Create exactly 13 Etsy tags for this product:
+            - Each tag maximum 20 characters
+            - Use high search volume keywords
+            - Include long-tail keywords
+            - Choose from categories: product type, style, target audience, material, color
+            - Briefly explain why each tag was selected
+            """
+        )
+    },
+    'description': {
+        'max_tokens': 1500,
+        'tr': (
+            "Sen bir e-ticaret copywriting uzmanısın. Etsy için dönüşüm odaklı ürün açıklamaları yazıyorsun.",
+            """
+            Ürün: {product_description}
+            Kategori: {product_category}
+            Hedef Kitle: {target_audience}
+            Tasarım: {design_theme}
+
+            Bu ürün için kapsamlı Etsy açıklaması yaz:
+            1. Dikkat çekici açılış cümlesi
+            2. Ürün özellikleri ve faydaları
+            3. Malzeme ve kalite bilgileri
+            4. Boyut ve kullanım rehberi
+            5. Hediye önerileri
+            6. Kişiselleştirme seçenekleri (varsa)
+            7. Kargo ve iade bilgileri
+            8. Harekete geçirici sonuç cümlesi
+
+            Açıklama 1000-1500 kelime arası olsun ve SEO dostu olsun.
+            """
+        ),
+        'en': (
+            "You are an e-commerce copywriting expert. Write conversion-focused product descriptions for Etsy.",
+            """
+            Product: {product_description}
+            Category: {product_category}
+            Target Audience: {target_audience}
+            Design: {design_theme}
+
+            Write a comprehensive Etsy description for this product:
+            1. Attention-grabbing opening statement
+            2. Product features and benefits
+            3. Material and quality information
+            4. Size and usage guide
+            5. Gift suggestions
+            6. Customization options (if applicable)
+            7. Shipping and return information
+            8. Call-to-action closing statement
+
+            Description should be 1000-1500 words and SEO-friendly.
+            """
+        )
+    },
+    'listing_core': {
+        'max_tokens': 2000,
+        'tr': (
+            "Sen bir Etsy SEO ve copywriting uzmanısın. Yalnızca tek bir JSON nesnesiyle yanıt veriyorsun.",
+            """
+            Ürün: {product_description}
+            Kategori: {product_category}
+            Hedef Kitle: {target_audience}
+            Tasarım Teması: {design_theme}
+
+            Etsy listesi için yalnızca şu JSON nesnesini döndür:
+            {{"titles": [...], "tags": [...], "description": "..."}}
+            - titles: {num_titles} SEO başlığı, her biri 130-140 karakter; anahtar kelime, tema, hedef kitle, ürün tipi
+            - tags: tam 13 etiket, her biri en fazla 20 karakter, uzun kuyruk anahtar kelimeler
+            - description: açılış, özellikler ve faydalar, malzeme, boyut ve kullanım, hediye önerileri, kargo ve iade, harekete geçirici kapanış; SEO dostu, en az 300 kelime
+            """
+        ),
+        'en': (
+            "You are an Etsy SEO and copywriting expert. You reply with a single JSON object only.",
+            """
+            Product: {product_description}
+            Category: {product_category}
+            Target Audience: {target_audience}
+            Style: {design_theme}
+
+            Return only this JSON object for the Etsy listing:
+            {{"titles": [...], "tags": [...], "description": "..."}}
+            - titles: {num_titles} SEO titles, each 130-140 characters, with keywords, theme, audience, product type
+            - tags: exactly 13 tags, each at most 20 characters, long-tail keywords
+            - description: opening hook, features and benefits, materials, size and usage, gift ideas, shipping and returns, call to action; SEO-friendly, at least 300 words
+            """
+        )
+    },
+    'title_fix': {
+        'max_tokens': 400,
+        'tr': (
+            "Sen bir Etsy SEO uzmanısın. Tam olarak 130-140 karakter uzunluğunda başlıklar yazıyorsun.",
+            """
+            Ürün: {product_description}
+            Hedef Kitle: {target_audience}
+            Tasarım Teması: {design_theme}
+
+            {num_titles} adet SEO optimized Etsy başlığı oluştur, her biri 130-140 karakter arası.
+            Her satıra yalnızca bir başlık yaz; numara, tırnak veya açıklama ekleme.
+            """
+        ),
+        'en': (
+            "You are an Etsy SEO expert. You write titles of exactly 130-140 characters.",
+            """
+            Product: {product_description}
+            Target Audience: {target_audience}
+            Style: {design_theme}
+
+            Create {num_titles} SEO optimized Etsy titles, each 130-140 characters.
+            Write one title per line with no numbering, quotes or explanations.
+            """
+        )
+    },
+    'tag_fill': {
+        'max_tokens': 200,
+        'tr': (
+            "Sen bir Etsy SEO uzmanısın. Kısa ve etkili etiketler seçiyorsun.",
+            """
+            Ürün: {product_description}
+            Kategori: {product_category}
+            Hedef Kitle: {target_audience}
+
+            Mevcut etiketler: {tags}
+            Bu etiketlerden farklı {num_tags} yeni Etsy etiketi oluştur, her biri maksimum 20 karakter.
+            Yalnızca etiketleri virgülle ayırarak yaz.
+            """
+        ),
+        'en': (
+            "You are an Etsy SEO expert. You choose short, effective tags.",
+            """
+            Product: {product_description}
+            Category: {product_category}
+            Target Audience: {target_audience}
+
+            Existing tags: {tags}
+            Create {num_tags} new Etsy tags different from these, each maximum 20 characters.
+            Write only the tags, separated by commas.
+            """
+        )
+    },
+    'variation_strategy': {
+        'tr': (
+            "Sen bir Etsy varyasyon uzmanısın. Satışları artıran varyasyon stratejileri geliştiriyorsun.",
+            """
+            Ürün: {product_description}
+            Kategori: {product_category}
+            Varyasyon Tipi: {variation_type}
+            Varyasyon Sayısı: {num_variations}
+
+            Bu ürün için varyasyon stratejisi oluştur:
+            1. Önerilen varyasyon seçenekleri
+            2. Her varyasyon için fiyatlandırma önerileri
+            3. Varyasyon görsellerinin nasıl olması gerektiği
+            4. Stok yönetimi ipuçları
+            5. Müşteri seçim kolaylığı için düzenleme önerileri
+            6. Varyasyon SEO optimizasyonu
+            """
+        ),
+        'en': (
+            "You are an Etsy variation expert. Develop variation strategies that increase sales.",
+            """
+            Product: {product_description}
+            Category: {product_category}
+            Variation Type: {variation_type}
+            Number of Variations: {num_variations}
+
+            Create a variation strategy for this product:
+            1. Recommended variation options
+            2. Pricing suggestions for each variation
+            3. How variation images should look
+            4. Inventory management tips
+            5. Organization tips for customer selection ease
+            6. Variation SEO optimization
+            """
+        )
+    },
+    'pricing_strategy': {
+        'tr': (
+            "Sen bir Etsy fiyatlandırma uzmanısın. Psikoloji temelli ve rekabetçi fiyatlandırma stratejileri geliştiriyorsun.",
+            """
+            Ürün: {product_description}
+            Kategori: {product_category}
+            Malzeme Maliyeti: ${material_cost}
+            Çalışma Saati: {time_hours} saat
+            Saat Ücreti: ${hourly_rate}
+            Hedef Kar Marjı: %{target_margin}
+
+            Bu ürün için kapsamlı fiyatlandırma stratejisi oluştur:
+            1. Maliyet analizi ve hesaplaması
+            2. Piyasa araştırması ve rekabet analizi
+            3. Psikolojik fiyatlandırma teknikleri
+            4. Promosyon ve indirim stratejileri
+            5. Değer algısını artırma yöntemleri
+            6. Fiyat testleri ve optimizasyon önerileri
+            7. Minimum ve maksimum fiyat önerileri
+            """
+        ),
+        'en': (
+            "You are an Etsy pricing expert. Develop psychology-based and competitive pricing strategies.",
+            """
+            Product: {product_description}
+            Category: {product_category}
+            Material Cost: ${material_cost}
+            Work Hours: {time_hours} hours
+            Hourly Rate: ${hourly_rate}
+            Target Margin: {target_margin}%
+
+            Create comprehensive pricing strategy for this product:
+            1. Cost analysis and calculation
+            2. Market research and competition analysis
+            3. Psychological pricing techniques
+            4. Promotion and discount strategies
+            5. Value perception enhancement methods
+            6. Price testing and optimization recommendations
+            7. Minimum and maximum price suggestions
+            """
+        )
+    },
+    'listing_analysis': {
+        'tr': (
+            "Sen bir Etsy ilanı optimizasyon uzmanısın. İlanları analiz edip iyileştirme önerileri sunuyorsun.",
+            """
+            Ürün: {product_description}
+            Kategori: {product_category}
+            Hedef Kitle: {target_audience}
+
+            Bu ürün için detaylı ilanı analizi yap:
+            1. İlan tamamlılık skoru
+            2. SEO optimizasyon durumu
+            3. Görsel kalite değerlendirmesi
+            4. Rekabet avantajları
+            5. Geliştirilmesi gereken alanlar
+            6. Yayınlama öncesi son kontroller
+            7. İlan performansını artırma önerileri
+            """
+        ),
+        'en': (
+            "You are an Etsy listing optimization expert. Analyze listings and provide improvement suggestions.",
+            """
+            Product: {product_description}
+            Category: {product_category}
+            Target Audience: {target_audience}
+
+            Perform detailed listing analysis for this product:
+            1. Listing completeness score
+            2. SEO optimization status
+            3. Image quality assessment
+            4. Competitive advantages
+            5. Areas for improvement
+            6. Pre-launch final checks
+            7. Listing performance enhancement suggestions
+            """
+        )
+    },
+    'seo_promotion': {
+        'max_tokens': 1200,
+        'tr': (
+            "Sen bir Etsy SEO ve pazarlama uzmanısın. Organik trafik ve satış artırıcı stratejiler geliştiriyorsun.",
+            """
+            Ürün: {product_description}
+            Kategori: {product_category}
+            Hedef Kitle: {target_audience}
+            Tanıtım Tipi: {promo_type}
+            Bütçe: ${budget}
+
+            Bu ürün için kapsamlı SEO ve tanıtım planı oluştur:
+            1. Etsy SEO optimizasyon rehberi
+            2. Anahtar kelime araştırması ve strateji
+            3. Sosyal medya tanıtım planı
+            4. Pinterest SEO stratejisi
+            5. İnfluencer işbirliği önerileri
+            6. Email marketing kampanyası
+            7. Ücretsiz tanıtım yöntemleri
+            8. Bütçe dağılımı ve ROI beklentileri
+            """
+        ),
+        'en': (
+            "You are an Etsy SEO and marketing expert. Develop strategies to increase organic traffic and sales.",
+            """
+            Product: {product_description}
+            Category: {product_category}
+            Target Audience: {target_audience}
+            Promotion Type: {promo_type}
+            Budget: ${budget}
+
+            Create comprehensive SEO and promotion plan for this product:
+            1. Etsy SEO optimization guide
+            2. Keyword research and strategy
+            3. Social media promotion plan
+            4. Pinterest SEO strategy
+            5. Influencer collaboration suggestions
+            6. Email marketing campaign
+            7. Free promotion methods
+            8. Budget allocation and ROI expectations
+            """
+        )
+    },
+    'analytics_plan': {
+        'max_tokens': 1200,
+        'tr': (
+            "Sen bir Etsy analitik uzmanısın. Veri odaklı optimizasyon stratejileri geliştiriyorsun.",
+            """
+            Ürün: {product_description}
+            Kategori: {product_category}
+            Analiz Dönemi: {analysis_period}
+
+            Bu ürün için kapsamlı analitik ve optimizasyon planı oluştur:
+            1. Takip edilmesi gereken anahtar metrikler
+            2. Etsy Stats kullanım rehberi
+            3. A/B test önerileri (başlık, fiyat, görsel)
+            4. Rekabet analizi yöntemleri
+            5. Sezonsal trendleri değerlendirme
+            6. Performans iyileştirme aksiyon planı
+            7. Başarı göstergeleri ve hedefler
+            8. Veri toplama ve raporlama stratejisi
+            """
+        ),
+        'en': (
+            "You are an Etsy analytics expert. Develop data-driven optimization strategies.",
+            """
+            Product: {product_description}
+            Category: {product_category}
+            Analysis Period: {analysis_period}
+
+            Create comprehensive analytics and optimization plan for this product:
+            1. Key metrics to track
+            2. Etsy Stats usage guide
+            3. A/B testing suggestions (title, price, images)
+            4. Competitor analysis methods
+            5. Seasonal trend evaluation
+            6. Performance improvement action plan
+            7. Success indicators and targets
+            8. Data collection and reporting strategy
+            """
+        )
+    },
+    'order_management': {
+        'max_tokens': 1500,
+        'tr': (
+            "Sen bir POD (Print on Demand) ve sipariş yönetimi uzmanısın. Verimli süreçler tasarlıyorsun.",
+            """
+            Ürün: {product_description}
+            POD Sağlayıcısı: {pod_provider}
+            Ürün Tipi: {product_type}
+
+            Bu ürün için kapsamlı sipariş yönetim sistemi oluştur:
+            1. POD entegrasyon rehberi
+            2. Sipariş işlem adımları
+            3. Kalite kontrol süreci
+            4. Müşteri iletişim şablonları
+            5. Kargo ve teslimat yönetimi
+            6. İade ve değişim politikaları
+            7. Envanter takip sistemi
+            8. Müşteri memnuniyeti stratejileri
+            9. Otomasyon önerileri
+            10. Sorun çözme rehberi
+            """
+        ),
+        'en': (
+            "You are a POD (Print on Demand) and order management expert. Design efficient processes.",
+            """
+            Product: {product_description}
+            POD Provider: {pod_provider}
+            Product Type: {product_type}
+
+            Create comprehensive order management system for this product:
+            1. POD integration guide
+            2. Order processing steps
+            3. Quality control process
+            4. Customer communication templates
+            5. Shipping and delivery management
+            6. Return and exchange policies
+            7. Inventory tracking system
+            8. Customer satisfaction strategies
+            9. Automation recommendations
+            10. Problem-solving guide
+            """
+        )
+    }
+}
+
+
+def build_prompt(content_type, language, form_data, **options):
+    """Get the (system_prompt, user_prompt) pair for a content type, filled from form data and step options"""
+    system_prompt, template = PROMPTS[content_type][language]
+    fields = {key: form_data.get(key, '') for key in PRODUCT_FORM_FIELDS}
+    fields.update(options)
+    return system_prompt, textwrap.dedent(template).strip().format(**fields)
+
+
+def get_max_tokens(content_type):
+    """Get the completion token limit used for a content type"""
+    return PROMPTS[content_type].get('max_tokens', MAX_TOKENS_DEFAULT)
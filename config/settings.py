@@ -20,18 +20,78 @@ OPENAI_MODEL = "gpt-3.5-turbo"
 OPENAI_TEMPERATURE = 0.7
 MAX_TOKENS_DEFAULT = 800
 
+# Usage & Cost Settings (USD; chat prices per 1K tokens, image prices per image by size)
+MODEL_PRICES = {
+    'gpt-3.5-turbo': {'prompt': 0.0005, 'completion': 0.0015},
+    'dall-e-2': {'256x256': 0.016, '512x512': 0.018, '1024x1024': 0.020},
+    'dall-e-3': {'1024x1024': 0.040, '1792x1024': 0.080, '1024x1792': 0.080}  # standard quality
+}
+LISTING_COST_BUDGET_USD = 0.25       # per product listing (form fingerprint); None disables
+USAGE_DB_PATH = '.cache/usage.db'
+
 # Rate Limiting
 RATE_LIMIT_REQUESTS = 30  # requests per minute
 RATE_LIMIT_WINDOW = 60    # seconds
 
+# Background Job Settings
+JOB_WORKERS = 4                      # generation network calls running at once, process-wide
+JOB_POLL_SECONDS = 1                 # job status refresh while a session has jobs running
+JOB_RESULT_TTL_SECONDS = 600         # finished jobs never picked up by their session are dropped after this
+
 # Cache Settings
 CACHE_EXPIRY_HOURS = 24
 MAX_CACHE_ENTRIES = 100
+GENERATED_CONTENT_MAX_AGE_MINUTES = 30  # stored step results older than this regenerate on click
 
 # Analytics Settings
 MAX_API_CALL_HISTORY = 50
 MAX_ERROR_LOG_ENTRIES = 50
-MAX_CONTENT_HISTORY = 100
+MAX_CONTENT_HISTORY = 100  # in-memory history backend only
+HISTOGRAM_MIN_SECONDS = 0.0001       # smallest distinguishable latency (cache hits)
+HISTOGRAM_MAX_SECONDS = 300          # larger latencies share the overflow bucket
+HISTOGRAM_GROWTH_FACTOR = 1.05       # bucket width ratio, ~2.5% percentile error
+
+# Metrics Export Settings (METRICS_PORT / METRICS_FILE environment variables enable export)
+METRICS_HOST = '127.0.0.1'
+METRICS_FILE_INTERVAL = 15           # seconds between metrics file writes
+METRICS_LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60)
+
+# Tracing Settings (TRACE_FILE environment variable enables JSONL export)
+TRACE_BUFFER_SIZE = 20               # recent traces kept for the debug waterfall
+TRACE_MAX_SPANS = 500                # spans kept per trace, later ones are counted as dropped
+
+# Rerun Profiler Settings (debug mode; PROFILER=cprofile|pyinstrument also writes a profile per rerun)
+PROFILER_REPORT_SIZE = 10            # slowest reruns kept in the report
+PROFILER_TOP_FUNCTIONS = 15          # cProfile functions listed per rerun
+PROFILE_DIR = '.cache/profiles'
+
+# History Storage Settings
+HISTORY_BACKEND = 'sqlite'  # 'sqlite' or 'memory'
+HISTORY_DB_PATH = '.cache/history.db'
+HISTORY_PAGE_SIZE = 20
+
+# Memory Budget Settings
+MEMORY_BUDGET_MB = 512               # total across all sessions in this process
+MEMORY_IDLE_SECONDS = 300            # sessions idle this long may be evicted
+MEMORY_ACCOUNTING_INTERVAL = 15      # seconds between footprint estimates per session
+MEMORY_MIN_HISTORY_ENTRIES = 10      # in-memory history entries kept after eviction
+MEMORY_TRACKED_KEYS = [
+    'api_cache', 'blob_store', 'content_history', 'generated_content',
+    'analytics', 'error_log', 'form_data'
+]
+SPILL_DB_PATH = '.cache/spill.db'
+
+# Session Persistence Settings
+SESSION_PERSISTENCE_ENABLED = True
+SESSION_DB_PATH = '.cache/sessions.db'
+SESSION_TOKEN_PARAM = 'sid'  # URL query parameter holding the client token
+SESSION_SNAPSHOT_TTL_DAYS = 30
+PERSISTED_SESSION_KEYS = [
+    'language', 'form_data', 'generated_content', 'blob_store', 'api_cache',
+    'cache_stats', 'content_history', 'saved_projects', 'custom_templates',
+    'analytics', 'error_log', 'ui_state', 'usage', 'user_id'
+]
+DEFERRED_SESSION_KEYS = ['api_cache', 'blob_store', 'content_history']  # Large keys, restored on first use
 
 # Validation Settings
 MIN_DESCRIPTION_LENGTH = 10
@@ -39,10 +99,15 @@ MAX_DESCRIPTION_LENGTH = 1000
 MIN_CATEGORY_LENGTH = 3
 MIN_AUDIENCE_LENGTH = 5
 MIN_THEME_LENGTH = 3
+PRODUCT_FORM_FIELDS = ['product_description', 'product_category', 'target_audience', 'design_theme']
 
 # UI Settings
 SIDEBAR_WIDTH = 400
 CONTENT_MAX_CHARS_PREVIEW = 200
+TOTAL_STEPS = 13
+STEP_QUERY_PARAM = 'step'            # ?step=5 opens step 5; only the active step renders
+STEP_WIDGET_PREFIX = 'step'          # widget keys kept while their step is not rendered
+STATS_REFRESH_SECONDS = 10           # sidebar stats refresh on their own timer
 
 # Language Settings
 DEFAULT_LANGUAGE = 'tr'
@@ -58,15 +123,48 @@ ETSY_TITLE_MIN_CHARS = 130
 ETSY_MAX_TAGS = 13
 ETSY_TAG_MAX_CHARS = 20
 ETSY_IMAGE_SIZE = "2000x2000"
+ETSY_TITLE_MAX_PAD_CHARS = 30       # short titles within this many characters are padded with keywords, others regenerated
+ETSY_TAG_MAX_PAD = 3                 # up to this many missing tags are filled with keywords, more are regenerated
 
 # Image Generation Settings
 DALLE_IMAGE_SIZES = ["1024x1024", "1792x1024", "1024x1792"]
 DEFAULT_IMAGE_SIZE = "1024x1024"
+DALLE_MODEL = "dall-e-2"
+DALLE_SIZE_MODELS = {"1792x1024": "dall-e-3", "1024x1792": "dall-e-3"}  # sizes DALLE_MODEL does not offer
+
+# Image Preview Settings
+THUMBNAIL_SIZES = {'small': 256, 'medium': 512, 'large': 1024}
+THUMBNAIL_FORMAT = 'WEBP'
+THUMBNAIL_FALLBACK_FORMAT = 'JPEG'
+THUMBNAIL_QUALITY = 80
+THUMBNAIL_CACHE_DIR = '.cache/thumbnails'
+IMAGE_DOWNLOAD_TIMEOUT = 30  # seconds
+
+# Background Removal Settings
+BG_REMOVAL_TOLERANCE = 30     # RGB distance still treated as background
+BG_REMOVAL_SOFTNESS = 40      # RGB distance range of the alpha ramp at edges
+BG_REMOVAL_FEATHER = 3        # edge band width in pixels
+BG_REMOVAL_CORNER_PATCH = 10  # corner patch size used as fill seeds
 
 # Batch Operation Settings
 MAX_BATCH_SIZE = 20
 BATCH_DELAY_SECONDS = 1
 
+# Bulk Generation Settings (python -m utils.bulk)
+BULK_CONCURRENCY = 4                 # products generated at once; their API calls share one rate limit
+BULK_DEFAULT_STEPS = ['titles', 'tags', 'description']
+BULK_DEFAULT_OPTIONS = {'num_titles': 5}  # step options not given as input columns
+BULK_MAX_RETRIES = 3                 # extra attempts for a failed step, with exponential backoff
+BULK_RETRY_BACKOFF_SECONDS = 2       # delay before the first retry, doubled for each later one
+BULK_JOURNAL_DB_PATH = '.cache/bulk.db'  # per-product, per-step progress so interrupted runs resume
+
+# Batch API Settings (python -m utils.bulk --backend batch)
+BATCH_PRICE_FACTOR = 0.5             # Batch API price relative to interactive calls
+BATCH_COMPLETION_WINDOW = '24h'
+BATCH_POLL_SECONDS = 30              # status checks while a batch runs
+BATCH_MAX_REQUESTS = 50000           # requests per batch file; larger runs are split
+BATCH_STANDIN_PORT = 8765            # offline stand-in server: python -m utils.batch_api
+
 # Feature Names for Analytics
 FEATURE_NAMES = {
     'design_prompt': 'Design Prompt Generation',
@@ -76,6 +174,7 @@ FEATURE_NAMES = {
     'image_generation': 'Image Generation',
     'mockup_generation': 'Mockup Generation',
     'image_enhancement': 'Image Enhancement',
+    'background_removal': 'Background Removal',
     'batch_operations': 'Batch Operations',
     'template_usage': 'Template Usage',
     'project_save': 'Project Save',
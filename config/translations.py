@@ -16,6 +16,27 @@ TRANSLATIONS = {
         "target_audience_placeholder": "e.g., Women, Men, Kids, Halloween lovers",
         "design_theme": "Design Theme/Style",
         "design_theme_placeholder": "e.g., Vintage, Minimalist, Gothic, Cute",
+        "save_product_info": "💾 Save Product Info",
+        "product_info_saved": "✅ Product info saved",
+        "result_reused": "Already generated for these inputs",
+        "result_outdated": "⚠️ Generated from earlier inputs. Generate again to update.",
+        "job_running": "Still generating, the result will appear here",
+        "job_done": "✅ result ready",
+        "image_gallery": "🖼️ Your Listing Images",
+        "gallery_design": "Design",
+        "gallery_mockup": "Mockup",
+        "listing_core_button": "⚡ Title, Tags & Description in One Call",
+        "listing_core_spinner": "Generating title, tags and description...",
+        "listing_core_applied": "✅ Steps 5, 6 and 7 were filled from one response",
+        "listing_core_source": "⚡ Filled by the combined generation. Generate to replace it with this step's own result.",
+        "titles_checked": "✅ All titles are {min}-{max} characters",
+        "titles_failing": "⚠️ Titles {numbers} are still not {min}-{max} characters after automatic fixes",
+        "fix_titles_button": "🔧 Regenerate Only These Titles",
+        "fix_titles_spinner": "Regenerating titles...",
+        "tags_checked": "✅ {count} unique tags, each at most {max} characters",
+        "tags_missing": "⚠️ {missing} tags missing after removing duplicate and invalid tags",
+        "fill_tags_button": "🔧 Generate Only the Missing Tags",
+        "fill_tags_spinner": "Generating missing tags...",
         "step": "Step",
         "generate": "🚀 Generate",
         "copy": "📋 Copy",
@@ -38,6 +59,27 @@ TRANSLATIONS = {
         "target_audience_placeholder": "örn., Kadınlar, Erkekler, Çocuklar, Halloween severleri",
         "design_theme": "Tasarım Teması/Stili",
         "design_theme_placeholder": "örn., Vintage, Minimalist, Gotik, Sevimli",
+        "save_product_info": "💾 Ürün Bilgilerini Kaydet",
+        "product_info_saved": "✅ Ürün bilgileri kaydedildi",
+        "result_reused": "Bu girdiler için zaten oluşturuldu",
+        "result_outdated": "⚠️ Önceki girdilerle oluşturuldu. Güncellemek için tekrar oluşturun.",
+        "job_running": "Hâlâ oluşturuluyor, sonuç burada görünecek",
+        "job_done": "✅ sonuç hazır",
+        "image_gallery": "🖼️ Liste Görselleriniz",
+        "gallery_design": "Tasarım",
+        "gallery_mockup": "Mockup",
+        "listing_core_button": "⚡ Başlık, Etiket ve Açıklama Tek Seferde",
+        "listing_core_spinner": "Başlık, etiketler ve açıklama oluşturuluyor...",
+        "listing_core_applied": "✅ Adım 5, 6 ve 7 tek yanıttan dolduruldu",
+        "listing_core_source": "⚡ Birleşik oluşturmadan dolduruldu. Bu adımın kendi sonucuyla değiştirmek için oluşturun.",
+        "titles_checked": "✅ Tüm başlıklar {min}-{max} karakter",
+        "titles_failing": "⚠️ {numbers} numaralı başlıklar otomatik düzeltmeden sonra da {min}-{max} karakter değil",
+        "fix_titles_button": "🔧 Yalnızca Bu Başlıkları Yeniden Oluştur",
+        "fix_titles_spinner": "Başlıklar yeniden oluşturuluyor...",
+        "tags_checked": "✅ {count} benzersiz etiket, her biri en fazla {max} karakter",
+        "tags_missing": "⚠️ Tekrarlanan ve geçersiz etiketler çıkarıldıktan sonra {missing} etiket eksik",
+        "fill_tags_button": "🔧 Yalnızca Eksik Etiketleri Oluştur",
+        "fill_tags_spinner": "Eksik etiketler oluşturuluyor...",
         "step": "Adım",
         "generate": "🚀 Oluştur",
         "copy": "📋 Kopyala",
@@ -5,21 +5,35 @@ Refactored to use modular structure
 
 import streamlit as st
 from PIL import Image
+from contextlib import contextmanager
+import html
 import io
+import time
 
 # Import our modular utilities
 from config.config_manager import config
 from config.translations import get_translation
+from config.prompts import build_prompt, get_max_tokens
+from utils.background_removal import remove_background_bytes
 from utils import (
-    init_session_state, get_form_data, set_form_data,
-    call_openai, generate_image, enhance_image,
+    init_session_state, get_form_data, set_form_values,
+    enhance_image,
     get_cache_stats, get_rate_limit_status, get_analytics_summary,
-    track_feature_usage, clear_cache
+    track_feature_usage, clear_cache, render_image_preview, render_image_grid, persist_session_state,
+    track_session_memory, session_memory_lock, get_memory_report, set_current_step, get_latency_percentiles,
+    start_metrics_exporter, span, get_recent_traces, get_usage_summary,
+    profile_rerun, get_rerun_report, get_user_id,
+    get_active_step, set_active_step, keep_widget_state,
+    generate_cache_key, get_form_fingerprint, save_generated_content, get_generated_content, should_regenerate,
+    submit_openai, submit_image, get_pending_job, get_session_jobs, has_finished_jobs, deliver_finished_jobs,
+    parse_listing_core, split_listing_core, parse_titles, parse_tags, format_titles, format_tags,
+    review_titles, review_tags, delete_generated_content, mark_dirty, get_session
 )
 
 # Initialize configuration and session state
 config.initialize()
 init_session_state()
+start_metrics_exporter()
 
 
 def t(key):
@@ -126,6 +140,16 @@ def apply_custom_css():
     return load_custom_css()
 
 
+def _commit_product_form():
+    """Commit the submitted product info form to form_data"""
+    set_form_values({
+        "product_description": st.session_state.product_desc_input,
+        "product_category": st.session_state.product_cat_input,
+        "target_audience": st.session_state.target_audience_input,
+        "design_theme": st.session_state.design_theme_input
+    })
+
+
 def render_sidebar():
     """Render the sidebar with form inputs and controls"""
     with st.sidebar:
@@ -135,66 +159,71 @@ def render_sidebar():
             ["Türkçe", "English"], 
             index=0 if st.session_state['language'] == 'tr' else 1
         )
-        st.session_state['language'] = 'tr' if language == "Türkçe" else 'en'
+        if st.session_state['language'] != ('tr' if language == "Türkçe" else 'en'):
+            st.session_state['language'] = 'tr' if language == "Türkçe" else 'en'
+            mark_dirty('language')
         
         st.markdown("---")
         st.markdown("### " + t("product_info"))
         
-        # Form inputs with validation
-        product_description = st.text_area(
-            t("product_description"),
-            value=get_form_data("product_description"),
-            placeholder=t("product_desc_placeholder"),
-            height=120,
-            key="product_desc_input",
-            on_change=lambda: set_form_data("product_description", st.session_state.product_desc_input),
-            help="Minimum 10 characters, maximum 1000 characters"
-        )
+        validation = config.get_validation_settings()
+        
+        # Inputs are committed together on submit; typing does not rerun the app
+        with st.form("product_info_form", border=False):
+            st.text_area(
+                t("product_description"),
+                value=get_form_data("product_description"),
+                placeholder=t("product_desc_placeholder"),
+                height=120,
+                max_chars=validation['max_description_length'],
+                key="product_desc_input",
+                help=f"Minimum {validation['min_description_length']} characters, maximum {validation['max_description_length']} characters"
+            )
+            st.text_input(
+                t("product_category"),
+                value=get_form_data("product_category"),
+                placeholder=t("product_cat_placeholder"),
+                max_chars=100,
+                key="product_cat_input"
+            )
+            st.text_input(
+                t("target_audience"),
+                value=get_form_data("target_audience"),
+                placeholder=t("target_audience_placeholder"),
+                max_chars=100,
+                key="target_audience_input"
+            )
+            st.text_input(
+                t("design_theme"),
+                value=get_form_data("design_theme"),
+                placeholder=t("design_theme_placeholder"),
+                max_chars=100,
+                key="design_theme_input"
+            )
+            submitted = st.form_submit_button(t("save_product_info"), on_click=_commit_product_form, use_container_width=True)
         
-        # Real-time validation
+        product_description = get_form_data("product_description")
+        product_category = get_form_data("product_category")
+        target_audience = get_form_data("target_audience")
+        design_theme = get_form_data("design_theme")
+        
+        # Validation of the committed description
         if product_description:
             char_count = len(product_description)
-            if char_count < 10:
-                st.warning(f"⚠️ Too short: {char_count}/10 minimum characters")
-            elif char_count > 1000:
-                st.error(f"❌ Too long: {char_count}/1000 maximum characters")
-            else:
-                st.success(f"✅ Good length: {char_count}/1000 characters")
-        
-        # Other form fields
-        product_category = st.text_input(
-            t("product_category"),
-            value=get_form_data("product_category"),
-            placeholder=t("product_cat_placeholder"),
-            key="product_cat_input",
-            on_change=lambda: set_form_data("product_category", st.session_state.product_cat_input)
-        )
-        
-        target_audience = st.text_input(
-            t("target_audience"),
-            value=get_form_data("target_audience"),
-            placeholder=t("target_audience_placeholder"),
-            key="target_audience_input",
-            on_change=lambda: set_form_data("target_audience", st.session_state.target_audience_input)
-        )
-        
-        design_theme = st.text_input(
-            t("design_theme"),
-            value=get_form_data("design_theme"),
-            placeholder=t("design_theme_placeholder"),
-            key="design_theme_input",
-            on_change=lambda: set_form_data("design_theme", st.session_state.design_theme_input)
-        )
+            if char_count < validation['min_description_length']:
+                st.warning(f"⚠️ Too short: {char_count}/{validation['min_description_length']} minimum characters")
+            elif submitted:
+                st.success(t("product_info_saved"))
         
         # Form completion indicator
         st.markdown("---")
         st.markdown("📊 **Form Completion**")
         
         required_fields = [
-            ("Product Description", product_description, 10),
-            ("Product Category", product_category, 3),
-            ("Target Audience", target_audience, 5),
-            ("Design Theme", design_theme, 3)
+            ("Product Description", product_description, validation['min_description_length']),
+            ("Product Category", product_category, validation['min_category_length']),
+            ("Target Audience", target_audience, validation['min_audience_length']),
+            ("Design Theme", design_theme, validation['min_theme_length'])
         ]
         
         completed_fields = sum(1 for _, value, min_len in required_fields 
@@ -205,11 +234,18 @@ def render_sidebar():
         st.markdown(f"**{completion_percentage:.0f}% Complete** ({completed_fields}/{len(required_fields)} fields)")
         
         # Cache and system stats
-        render_system_stats()
+        with span("render_system_stats"):
+            render_system_stats()
 
 
+@st.fragment(run_every=config.get_ui_settings()['stats_refresh_seconds'])
 def render_system_stats():
-    """Render system statistics in sidebar"""
+    """Render system statistics in sidebar (refreshes on its own timer)"""
+    with session_memory_lock():
+        _render_system_stats()
+
+
+def _render_system_stats():
     # Cache statistics
     st.markdown("---")
     st.markdown("📊 **Cache Stats**")
@@ -223,8 +259,10 @@ def render_system_stats():
     
     if st.button("🗑️ Clear Cache"):
         clear_cache()
+        # This fragment's timed reruns never reach main()'s finish, so snapshot the cleared cache now
+        finish_rerun()
         st.success("Cache cleared!")
-        st.rerun()
+        st.rerun(scope="fragment")
     
     # Rate limit status
     st.markdown("---")
@@ -251,6 +289,374 @@ def render_system_stats():
         st.metric("Session Time", f"{analytics['session_duration']:.1f} min")
         st.metric("API Calls", analytics['total_api_calls'])
         st.metric("Success Rate", f"{analytics['success_rate']:.1f}%")
+    
+    render_latency_stats()
+    render_usage_stats()
+    
+    if config.is_debug_mode():
+        render_memory_admin()
+        render_rerun_report()
+        render_trace_waterfall()
+
+
+def render_latency_stats():
+    """Render p50/p95/p99 latency for cache hits, cache misses and image calls"""
+    rows = {
+        "Cache hit": get_latency_percentiles("openai_chat:cache_hit"),
+        "Cache miss": get_latency_percentiles("openai_chat:cache_miss", "openai_chat:uncached"),
+        "Image": get_latency_percentiles("dalle_image", "dalle_edit")
+    }
+    rows = {label: p for label, p in rows.items() if p}
+    if not rows:
+        return
+    
+    def _format(seconds):
+        return f"{seconds * 1000:.1f} ms" if seconds < 1 else f"{seconds:.2f} s"
+    
+    st.markdown("⏱️ **Latency**")
+    st.table({
+        label: {"p50": _format(p[50]), "p95": _format(p[95]), "p99": _format(p[99]), "n": str(p['count'])}
+        for label, p in rows.items()
+    })
+
+
+def render_usage_stats():
+    """Render session token usage, cost, cache savings and the listing budget"""
+    usage = get_usage_summary()
+    total = usage['total']
+    if not total['calls'] and not total['cache_hits']:
+        return
+    
+    st.markdown("💰 **Usage & Cost**")
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric("Session Cost", f"${total['cost']:.4f}")
+        st.metric("Tokens", f"{total['prompt_tokens'] + total['completion_tokens']:,}")
+    with col2:
+        st.metric("Saved by Cache", f"${total['saved_cost']:.4f}")
+        st.metric("Images", total['images'])
+    
+    if usage['listing_budget']:
+        st.progress(min(usage['listing_budget_used'], 100) / 100)
+        st.caption(f"This listing: ${usage['listing_cost']:.4f} of ${usage['listing_budget']:.2f} budget")
+    
+    with st.expander("Cost by step", expanded=False):
+        st.table([
+            {
+                'Step': row['step'],
+                'Calls': row['calls'],
+                'Tokens': row['prompt_tokens'] + row['completion_tokens'],
+                'Cost $': f"{row['cost']:.4f}",
+                'Cache hits': row['cache_hits'],
+                'Saved $': f"{row['saved_cost']:.4f}"
+            }
+            for row in usage['by_step']
+        ])
+
+
+def render_memory_admin():
+    """Render per-session and total memory usage (debug mode only)"""
+    st.markdown("---")
+    st.markdown("🧠 **Memory**")
+    
+    report = get_memory_report()
+    st.progress(min(report['budget_used'], 100) / 100)
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric("Total", f"{report['total_mb']:.1f} MB")
+    with col2:
+        st.metric("Sessions", report['session_count'])
+    st.caption(f"Budget: {report['budget_mb']} MB ({report['budget_used']:.0f}% used)")
+    
+    with st.expander("Per-session usage", expanded=False):
+        st.table([
+            {
+                'Session': row['session'],
+                'MB': f"{row['size_mb']:.2f}",
+                'Idle (s)': f"{row['idle_seconds']:.0f}",
+                'Largest': row['largest_key'],
+                'Evictions': row['evictions']
+            }
+            for row in report['sessions']
+        ])
+
+
+def render_rerun_report():
+    """Render rerun percentiles and the slowest reruns broken down by function (debug mode only)"""
+    report = get_rerun_report()
+    if not report['count']:
+        return
+    
+    st.markdown("---")
+    st.markdown("🐢 **Reruns**")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("p50", f"{report['p50_ms']:.0f} ms")
+    with col2:
+        st.metric("p95", f"{report['p95_ms']:.0f} ms")
+    with col3:
+        st.metric("p99", f"{report['p99_ms']:.0f} ms")
+    
+    with st.expander(f"Slowest {len(report['slowest'])} reruns", expanded=False):
+        for rerun in report['slowest']:
+            when = time.strftime('%H:%M:%S', time.localtime(rerun['timestamp']))
+            st.markdown(f"**{rerun['duration'] * 1000:.0f} ms** · {rerun['name']} · {when} · {rerun['session_id'][:8]}")
+            st.table([
+                {'Function': name, 'Self ms': f"{self_ms:.1f}"}
+                for name, self_ms in list(rerun['breakdown'].items())[:8]
+            ])
+            if rerun['profile_path']:
+                st.caption(f"Profile: {rerun['profile_path']}")
+
+
+def render_trace_waterfall():
+    """Render the span waterfall of recent reruns (debug mode only)"""
+    traces = get_recent_traces(session_id=get_session().session_id)
+    if not traces:
+        return
+    
+    st.markdown("---")
+    st.markdown("🔎 **Traces**")
+    
+    labels = [
+        f"{time.strftime('%H:%M:%S', time.localtime(trace['start_time']))} · {trace['name']} · {trace['duration_ms']:.0f} ms"
+        for trace in traces
+    ]
+    selected = st.selectbox("Recent requests", range(len(traces)), format_func=labels.__getitem__, key="trace_select")
+    trace = traces[selected]
+    total_ms = max(trace['duration_ms'], 0.001)
+    
+    rows = []
+    for s in trace['spans']:
+        left = s['offset_ms'] / total_ms * 100
+        width = max(s['duration_ms'] / total_ms * 100, 0.5)
+        color = "#e74c3c" if s['status'] == 'error' else "#3498db"
+        rows.append(
+            f"<div style='font-size: 0.75em; white-space: nowrap;'>"
+            f"<span style='padding-left: {s['depth'] * 8}px;'>{html.escape(s['name'])}</span> "
+            f"<span style='color: #666;'>{s['duration_ms']:.1f} ms</span>"
+            f"<div style='background: #eee; height: 6px; position: relative;'>"
+            f"<div style='position: absolute; left: {left:.2f}%; width: {width:.2f}%; height: 6px; background: {color};'></div>"
+            f"</div></div>"
+        )
+    if trace['dropped_spans']:
+        rows.append(f"<div style='font-size: 0.75em; color: #666;'>+{trace['dropped_spans']} spans dropped</div>")
+    st.markdown(''.join(rows), unsafe_allow_html=True)
+
+
+def render_ai_output(result):
+    """Render generated text in the output box"""
+    st.markdown(f'<div class="ai-output">{result}</div>', unsafe_allow_html=True)
+
+
+def image_renderer(caption, download_label):
+    """Get a render callback showing a generated image with its download link"""
+    def render(image_url):
+        render_image_preview(image_url, caption=caption)
+        st.markdown(f"[{download_label}]({image_url})")
+    return render
+
+
+def apply_listing_core(content, metadata):
+    """Fill the title, tag and description panels from one combined listing core result
+
+    The parts keep the listing core fingerprint and a source marker, so each step still counts them
+    as not generated by its own prompt (step 7 can still write its full-length description).
+    """
+    for part, text in split_listing_core(parse_listing_core(content)).items():
+        part_metadata = {**metadata, 'source': 'listing_core'}
+        save_generated_content(part, text, part_metadata)
+        handle_result(part, text, part_metadata)
+
+
+def check_titles(content, metadata):
+    """Store generated titles repaired to the Etsy length limits, remembering the ones still off"""
+    titles, failing = review_titles(content, st.session_state['form_data'])
+    save_generated_content('titles', format_titles(titles), {**metadata, 'failing_titles': failing})
+
+
+def check_tags(content, metadata):
+    """Store generated tags normalized, deduped and filled up, remembering how many are still missing"""
+    tags, missing = review_tags(content, st.session_state['form_data'])
+    save_generated_content('tags', format_tags(tags), {**metadata, 'missing_tags': missing})
+
+
+def is_repair_target(stored, metadata):
+    """Check that a stored result is still the one a repair job was started for"""
+    return stored is not None and (
+        stored['metadata'].get('fingerprint') == metadata.get('target_fingerprint')
+        and stored['timestamp'] == metadata.get('target_timestamp')
+    )
+
+
+def apply_title_fix(content, metadata):
+    """Put regenerated titles in place of the failing ones, unless the titles changed while the job ran"""
+    delete_generated_content('title_fix')
+    stored = get_generated_content('titles')
+    if is_repair_target(stored, metadata):
+        titles = parse_titles(stored['content'])
+        for index, title in zip(stored['metadata'].get('failing_titles', []), parse_titles(content)):
+            titles[index] = title
+        check_titles(format_titles(titles), stored['metadata'])
+
+
+def apply_tag_fill(content, metadata):
+    """Add regenerated tags to the stored ones, unless the tags changed while the job ran"""
+    delete_generated_content('tag_fill')
+    stored = get_generated_content('tags')
+    if is_repair_target(stored, metadata):
+        check_tags(format_tags(parse_tags(stored['content']) + parse_tags(content)), stored['metadata'])
+
+
+# Content type -> callback(content, metadata) run whenever a result of that type is stored
+RESULT_HANDLERS = {
+    'listing_core': apply_listing_core,
+    'titles': check_titles,
+    'tags': check_tags,
+    'title_fix': apply_title_fix,
+    'tag_fill': apply_tag_fill
+}
+
+
+def handle_result(content_type, content, metadata):
+    """Run the result handler of a content type, if it has one"""
+    if content_type in RESULT_HANDLERS:
+        RESULT_HANDLERS[content_type](content, metadata)
+
+
+def render_image_gallery():
+    """Render the listing's generated images as a grid of small previews"""
+    sources, captions = [], []
+    for content_type in ('design', 'mockup'):
+        stored = get_generated_content(content_type)
+        if stored and stored.get('content'):
+            sources.append(stored['content'])
+            captions.append(t(f"gallery_{content_type}"))
+    if sources:
+        st.markdown(f"### {t('image_gallery')}")
+        render_image_grid(sources, captions)
+
+
+def render_generation(content_type, button_label, spinner_text, fingerprint, submit, render,
+                      feature=None, missing_input=None, metadata=None):
+    """Render a step's stored result; the button starts a job only when it is missing, stale or from other inputs"""
+    extra_metadata = metadata or {}
+    stored = get_generated_content(content_type)
+    current = stored is not None and stored['metadata'].get('fingerprint') == fingerprint
+    pending = get_pending_job(content_type)
+    
+    if st.button(button_label):
+        max_age = config.get_cache_settings()['generated_content_max_age_minutes']
+        if missing_input:
+            st.warning(missing_input)
+        elif pending is not None:
+            st.caption(t("job_running"))
+        elif current and not should_regenerate(content_type, max_age):
+            st.caption(t("result_reused"))
+        else:
+            if feature:
+                track_feature_usage(feature)
+            metadata = {
+                'fingerprint': fingerprint,
+                'listing': get_form_fingerprint(),
+                'language': st.session_state['language'],
+                **extra_metadata
+            }
+            # Cache hits come back at once; anything else runs as a job that survives navigation
+            result = submit(metadata)
+            if result:
+                save_generated_content(content_type, result, metadata)
+                handle_result(content_type, result, metadata)
+                stored, current = get_generated_content(content_type), True
+            elif get_pending_job(content_type) is not None:
+                # A full rerun starts the job status poller
+                st.rerun()
+    
+    if pending is not None:
+        st.info(f"⏳ {spinner_text}")
+    if stored:
+        if stored['metadata'].get('source', content_type) != content_type:
+            st.caption(t(f"{stored['metadata']['source']}_source"))
+        elif not current:
+            st.caption(t("result_outdated"))
+        render(stored['content'])
+
+
+def render_text_generation(content_type, button_label, spinner_text, feature=None, missing_input=None, **options):
+    """Render a prompt-based step result from config.prompts through render_generation"""
+    system_prompt, user_prompt = build_prompt(content_type, st.session_state['language'], st.session_state['form_data'], **options)
+    max_tokens = get_max_tokens(content_type)
+    render_generation(
+        content_type, button_label, spinner_text,
+        fingerprint=generate_cache_key(system_prompt, user_prompt, max_tokens),
+        submit=lambda metadata: submit_openai(content_type, system_prompt, user_prompt, max_tokens, metadata),
+        render=render_ai_output,
+        feature=feature,
+        missing_input=missing_input
+    )
+
+
+def render_listing_core_generation(num_titles):
+    """Render the combined generation filling steps 5-7 with one structured call"""
+    system_prompt, user_prompt = build_prompt('listing_core', st.session_state['language'], st.session_state['form_data'],
+                                              num_titles=num_titles)
+    max_tokens = get_max_tokens('listing_core')
+    render_generation(
+        'listing_core', t("listing_core_button"), t("listing_core_spinner"),
+        fingerprint=generate_cache_key(system_prompt, user_prompt, max_tokens),
+        submit=lambda metadata: submit_openai('listing_core', system_prompt, user_prompt, max_tokens, metadata,
+                                              validate=parse_listing_core),
+        render=lambda content: st.caption(t("listing_core_applied")),
+        feature='listing_core_generation'
+    )
+
+
+def render_repair_generation(content_type, target, button_label, spinner_text, **options):
+    """Render a targeted regeneration of failing items in the stored target result
+
+    Always a fresh call, since a cached answer is what failed. The target's fingerprint and timestamp go
+    with the job, so its handler can tell whether the target was regenerated meanwhile.
+    """
+    system_prompt, user_prompt = build_prompt(content_type, st.session_state['language'], st.session_state['form_data'], **options)
+    max_tokens = get_max_tokens(content_type)
+    render_generation(
+        content_type, button_label, spinner_text,
+        fingerprint=generate_cache_key(system_prompt, user_prompt, max_tokens),
+        submit=lambda metadata: submit_openai(content_type, system_prompt, user_prompt, max_tokens, metadata, use_cache=False),
+        render=lambda content: None,
+        metadata={'target_fingerprint': target['metadata'].get('fingerprint'), 'target_timestamp': target['timestamp']}
+    )
+
+
+def render_title_check():
+    """Render the length check of the stored titles, with a regeneration of only the failing ones"""
+    stored = get_generated_content('titles')
+    if not stored or 'failing_titles' not in stored['metadata']:
+        return
+    etsy = config.get_etsy_settings()
+    limits = {'min': etsy['title_min_chars'], 'max': etsy['title_max_chars']}
+    failing = stored['metadata']['failing_titles']
+    if not failing:
+        st.caption(t("titles_checked").format(**limits))
+        return
+    st.warning(t("titles_failing").format(numbers=', '.join(str(index + 1) for index in failing), **limits))
+    render_repair_generation('title_fix', stored, t("fix_titles_button"), t("fix_titles_spinner"), num_titles=len(failing))
+
+
+def render_tag_check():
+    """Render the check of the stored tags, with a generation of only the missing ones"""
+    stored = get_generated_content('tags')
+    if not stored or 'missing_tags' not in stored['metadata']:
+        return
+    tags = parse_tags(stored['content'])
+    missing = stored['metadata']['missing_tags']
+    if not missing:
+        st.caption(t("tags_checked").format(count=len(tags), max=config.get_etsy_settings()['tag_max_chars']))
+        return
+    st.warning(t("tags_missing").format(missing=missing))
+    render_repair_generation('tag_fill', stored, t("fill_tags_button"), t("fill_tags_spinner"),
+                             tags=format_tags(tags), num_tags=missing)
 
 
 def render_step_1():
@@ -268,24 +674,21 @@ def render_step_1():
             "Tasarım prompt'ı:",
             placeholder="komik gözlüklü kedi t-shirt tasarımı, minimalist stil",
             height=100,
-            key="design_prompt_tr"
+            key="step1_design_prompt_tr"
         )
         
         col1, col2 = st.columns(2)
         with col1:
-            image_size = st.selectbox("Görsel boyutu:", ["1024x1024", "1792x1024", "1024x1792"])
+            image_size = st.selectbox("Görsel boyutu:", ["1024x1024", "1792x1024", "1024x1792"], key="step1_image_size_tr")
         with col2:
-            if st.button("🎨 Tasarım Oluştur"):
-                if design_prompt_input.strip():
-                    track_feature_usage('design_generation')
-                    with st.spinner("Tasarım oluşturuluyor..."):
-                        image_url = generate_image(design_prompt_input, image_size)
-                        if image_url:
-                            st.image(image_url, caption="Oluşturulan Tasarım")
-                            st.markdown('<div class="success-box">✅ Tasarım başarıyla oluşturuldu!</div>', unsafe_allow_html=True)
-                            st.markdown(f"[Tasarımı İndir]({image_url})")
-                else:
-                    st.warning("Lütfen bir tasarım prompt'ı girin.")
+            render_generation(
+                'design', "🎨 Tasarım Oluştur", "Tasarım oluşturuluyor...",
+                fingerprint=generate_cache_key('image', design_prompt_input, image_size),
+                submit=lambda metadata: submit_image('design', design_prompt_input, image_size, metadata),
+                render=image_renderer("Oluşturulan Tasarım", "Tasarımı İndir"),
+                feature='design_generation',
+                missing_input=None if design_prompt_input.strip() else "Lütfen bir tasarım prompt'ı girin."
+            )
     else:
         st.markdown("""
         <div class="tip-box">
@@ -297,24 +700,21 @@ def render_step_1():
             "Design prompt:",
             placeholder="funny cat wearing sunglasses t-shirt design, minimalist style",
             height=100,
-            key="design_prompt_en"
+            key="step1_design_prompt_en"
         )
         
         col1, col2 = st.columns(2)
         with col1:
-            image_size = st.selectbox("Image size:", ["1024x1024", "1792x1024", "1024x1792"])
+            image_size = st.selectbox("Image size:", ["1024x1024", "1792x1024", "1024x1792"], key="step1_image_size_en")
         with col2:
-            if st.button("🎨 Generate Design"):
-                if design_prompt_input.strip():
-                    track_feature_usage('design_generation')
-                    with st.spinner("Generating design..."):
-                        image_url = generate_image(design_prompt_input, image_size)
-                        if image_url:
-                            st.image(image_url, caption="Generated Design")
-                            st.markdown('<div class="success-box">✅ Design generated successfully!</div>', unsafe_allow_html=True)
-                            st.markdown(f"[Download Design]({image_url})")
-                else:
-                    st.warning("Please enter a design prompt.")
+            render_generation(
+                'design', "🎨 Generate Design", "Generating design...",
+                fingerprint=generate_cache_key('image', design_prompt_input, image_size),
+                submit=lambda metadata: submit_image('design', design_prompt_input, image_size, metadata),
+                render=image_renderer("Generated Design", "Download Design"),
+                feature='design_generation',
+                missing_input=None if design_prompt_input.strip() else "Please enter a design prompt."
+            )
 
 
 def render_step_2():
@@ -332,24 +732,7 @@ def render_step_2():
         </div>
         """, unsafe_allow_html=True)
         
-        if st.button("Baskı Hazırlık Rehberi Oluştur"):
-            with st.spinner("Baskı rehberi oluşturuluyor..."):
-                system_prompt = "Sen bir DTG (Direct-to-Garment) baskı uzmanısın."
-                user_prompt = f"""
-                Ürün: {get_form_data('product_description')}
-                
-                Bu ürün için DTG baskı hazırlık rehberi oluştur:
-                1. Dosya formatı ve çözünürlük gereksinimleri
-                2. Renk profili ayarları (RGB vs CMYK)
-                3. Tasarım boyutlandırma rehberi
-                4. Farklı ürün tipleri için baskı alanları
-                5. Kalite kontrol listesi
-                6. Yaygın baskı hataları ve çözümleri
-                """
-                
-                result = call_openai(system_prompt, user_prompt)
-                if result:
-                    st.markdown(f'<div class="ai-output">{result}</div>', unsafe_allow_html=True)
+        render_text_generation('print_guide', "Baskı Hazırlık Rehberi Oluştur", "Baskı rehberi oluşturuluyor...")
     else:
         st.markdown("""
         <div class="tip-box">
@@ -361,25 +744,41 @@ def render_step_2():
         </div>
         """, unsafe_allow_html=True)
         
-        if st.button("Generate Print Preparation Guide"):
-            with st.spinner("Generating print guide..."):
-                system_prompt = "You are a DTG (Direct-to-Garment) printing expert."
-                user_prompt = f"""
-                Product: {get_form_data('product_description')}
-                
-                Create a comprehensive DTG print preparation guide for this product:
-                1. File format and resolution requirements
-                2. Color profile settings (RGB vs CMYK)
-                3. Design sizing guidelines
-                4. Print areas for different product types
-                5. Quality control checklist
-                6. Common printing issues and solutions
-                7. Pre-press optimization tips
-                """
-                
-                result = call_openai(system_prompt, user_prompt)
-                if result:
-                    st.markdown(f'<div class="ai-output">{result}</div>', unsafe_allow_html=True)
+        render_text_generation('print_guide', "Generate Print Preparation Guide", "Generating print guide...")
+    
+    render_transparency_tool()
+
+
+def render_transparency_tool():
+    """Render local background removal for transparent DTG print files"""
+    is_tr = st.session_state['language'] == 'tr'
+    
+    st.markdown("---")
+    st.markdown("### 🪄 Şeffaf Arkaplan" if is_tr else "### 🪄 Transparent Background")
+    
+    uploaded_design = st.file_uploader(
+        "Tasarımı yükleyin:" if is_tr else "Upload design:",
+        type=['png', 'jpg', 'jpeg'],
+        key="transparency_upload"
+    )
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        tolerance = st.slider("Arkaplan toleransı:" if is_tr else "Background tolerance:", 5, 120, 30, key="step2_transparency_tolerance")
+    with col2:
+        feather = st.slider("Kenar yumuşatma (px):" if is_tr else "Edge feather (px):", 0, 10, 3, key="step2_transparency_feather")
+    
+    if uploaded_design and st.button("🪄 Arkaplanı Kaldır" if is_tr else "🪄 Remove Background"):
+        track_feature_usage('background_removal')
+        with st.spinner("Arkaplan kaldırılıyor..." if is_tr else "Removing background..."):
+            png_bytes = remove_background_bytes(uploaded_design.getvalue(), tolerance=tolerance, feather=feather)
+            render_image_preview(png_bytes, caption="Şeffaf PNG" if is_tr else "Transparent PNG")
+            st.download_button(
+                "⬇️ PNG İndir" if is_tr else "⬇️ Download PNG",
+                data=png_bytes,
+                file_name=f"{uploaded_design.name.rsplit('.', 1)[0]}_transparent.png",
+                mime="image/png"
+            )
 
 
 def render_step_3():
@@ -391,77 +790,54 @@ def render_step_3():
             "Mockup prompt'ı:",
             placeholder="beyaz t-shirt üzerinde komik kedi tasarımı, stüdyo ışığı, profesyonel ürün fotoğrafı",
             height=100,
-            key="mockup_prompt_tr"
+            key="step3_mockup_prompt_tr"
         )
         
         col1, col2 = st.columns(2)
         with col1:
-            mockup_size = st.selectbox("Mockup boyutu:", ["1024x1024", "1792x1024", "1024x1792"])
+            mockup_size = st.selectbox("Mockup boyutu:", ["1024x1024", "1792x1024", "1024x1792"], key="step3_mockup_size_tr")
         with col2:
-            if st.button("📱 Mockup Oluştur"):
-                if mockup_prompt_input.strip():
-                    track_feature_usage('mockup_generation')
-                    with st.spinner("Mockup oluşturuluyor..."):
-                        image_url = generate_image(mockup_prompt_input, mockup_size)
-                        if image_url:
-                            st.image(image_url, caption="Oluşturulan Mockup")
-                            st.markdown('<div class="success-box">✅ Mockup başarıyla oluşturuldu!</div>', unsafe_allow_html=True)
-                            st.markdown(f"[Mockup İndir]({image_url})")
-                else:
-                    st.warning("Lütfen bir mockup prompt'ı girin.")
+            render_generation(
+                'mockup', "📱 Mockup Oluştur", "Mockup oluşturuluyor...",
+                fingerprint=generate_cache_key('image', mockup_prompt_input, mockup_size),
+                submit=lambda metadata: submit_image('mockup', mockup_prompt_input, mockup_size, metadata),
+                render=image_renderer("Oluşturulan Mockup", "Mockup İndir"),
+                feature='mockup_generation',
+                missing_input=None if mockup_prompt_input.strip() else "Lütfen bir mockup prompt'ı girin."
+            )
     else:
         mockup_prompt_input = st.text_area(
             "Mockup prompt:",
             placeholder="white t-shirt with funny cat design, studio lighting, professional product photography",
             height=100,
-            key="mockup_prompt_en"
+            key="step3_mockup_prompt_en"
         )
         
         col1, col2 = st.columns(2)
         with col1:
-            mockup_size = st.selectbox("Mockup size:", ["1024x1024", "1792x1024", "1024x1792"])
+            mockup_size = st.selectbox("Mockup size:", ["1024x1024", "1792x1024", "1024x1792"], key="step3_mockup_size_en")
         with col2:
-            if st.button("📱 Generate Mockup"):
-                if mockup_prompt_input.strip():
-                    track_feature_usage('mockup_generation')
-                    with st.spinner("Generating mockup..."):
-                        image_url = generate_image(mockup_prompt_input, mockup_size)
-                        if image_url:
-                            st.image(image_url, caption="Generated Mockup")
-                            st.markdown('<div class="success-box">✅ Mockup generated successfully!</div>', unsafe_allow_html=True)
-                            st.markdown(f"[Download Mockup]({image_url})")
-                else:
-                    st.warning("Please enter a mockup prompt.")
+            render_generation(
+                'mockup', "📱 Generate Mockup", "Generating mockup...",
+                fingerprint=generate_cache_key('image', mockup_prompt_input, mockup_size),
+                submit=lambda metadata: submit_image('mockup', mockup_prompt_input, mockup_size, metadata),
+                render=image_renderer("Generated Mockup", "Download Mockup"),
+                feature='mockup_generation',
+                missing_input=None if mockup_prompt_input.strip() else "Please enter a mockup prompt."
+            )
 
 
 def render_step_4():
     """Render Step 4: Image Preparation"""
     st.markdown('<div class="step-header">🖼️ Adım 4: Ürün Görsellerinin Hazırlanması</div>' if st.session_state['language'] == 'tr' else '<div class="step-header">🖼️ Step 4: Prepare Product Images</div>', unsafe_allow_html=True)
     
+    render_image_gallery()
+    
     if st.session_state['language'] == 'tr':
-        if st.button("Görsel Optimizasyon Rehberi Oluştur"):
-            product_description = get_form_data("product_description")
-            if product_description:
-                with st.spinner("Görsel rehberi oluşturuluyor..."):
-                    system_prompt = "Sen bir e-ticaret görsel uzmanısın. Etsy için ürün görsellerini optimize etme konusunda uzmanısın."
-                    user_prompt = f"""
-                    Ürün: {product_description}
-                    Kategori: {get_form_data('product_category')}
-                    
-                    Bu ürün için Etsy görsel optimizasyon rehberi oluştur:
-                    1. Görsel boyut ve format özellikleri (2000x2000px kare format)
-                    2. Ana ürün görseli özellikleri
-                    3. Ek görseller (mockup, detay, kullanım)
-                    4. SEO için alt text önerileri
-                    5. Görsel sıralaması stratejisi
-                    6. Mobil optimizasyon ipuçları
-                    """
-                    
-                    result = call_openai(system_prompt, user_prompt)
-                    if result:
-                        st.markdown(f'<div class="ai-output">{result}</div>', unsafe_allow_html=True)
-            else:
-                st.warning("Lütfen önce ürün açıklaması girin.")
+        render_text_generation(
+            'image_guide', "Görsel Optimizasyon Rehberi Oluştur", "Görsel rehberi oluşturuluyor...",
+            missing_input=None if get_form_data("product_description") else "Lütfen önce ürün açıklaması girin."
+        )
                 
         # Image enhancement section
         st.markdown("---")
@@ -477,7 +853,7 @@ def render_step_4():
             with st.spinner("Görsel iyileştiriliyor..."):
                 enhanced_url = enhance_image(uploaded_image)
                 if enhanced_url:
-                    st.image(enhanced_url, caption="İyileştirilmiş Görsel")
+                    render_image_preview(enhanced_url, caption="İyileştirilmiş Görsel")
                     st.markdown('<div class="success-box">✅ Görsel başarıyla iyileştirildi!</div>', unsafe_allow_html=True)
     else:
         st.markdown("""
@@ -490,30 +866,10 @@ def render_step_4():
         </div>
         """, unsafe_allow_html=True)
         
-        if st.button("Generate Image Optimization Guide"):
-            product_description = get_form_data("product_description")
-            if product_description:
-                with st.spinner("Generating image guide..."):
-                    system_prompt = "You are an e-commerce visual expert specializing in Etsy product image optimization."
-                    user_prompt = f"""
-                    Product: {product_description}
-                    Category: {get_form_data('product_category')}
-                    
-                    Create a comprehensive Etsy image optimization guide for this product:
-                    1. Image size and format specifications (2000x2000px square format)
-                    2. Main product image characteristics
-                    3. Additional images (mockups, details, usage)
-                    4. SEO alt text suggestions
-                    5. Image sequence strategy
-                    6. Mobile optimization tips
-                    7. Best practices for Etsy search visibility
-                    """
-                    
-                    result = call_openai(system_prompt, user_prompt)
-                    if result:
-                        st.markdown(f'<div class="ai-output">{result}</div>', unsafe_allow_html=True)
-            else:
-                st.warning("Please enter a product description first.")
+        render_text_generation(
+            'image_guide', "Generate Image Optimization Guide", "Generating image guide...",
+            missing_input=None if get_form_data("product_description") else "Please enter a product description first."
+        )
 
 
 def render_step_5():
@@ -521,48 +877,22 @@ def render_step_5():
     st.markdown('<div class="step-header">📝 Adım 5: Ürün Başlığı Yazma</div>' if st.session_state['language'] == 'tr' else '<div class="step-header">📝 Step 5: Write Product Title</div>', unsafe_allow_html=True)
     
     product_description = get_form_data("product_description")
-    target_audience = get_form_data("target_audience")
-    design_theme = get_form_data("design_theme")
     
     if not product_description:
         st.warning("Lütfen önce sidebar'dan ürün bilgilerini doldurun." if st.session_state['language'] == 'tr' else "Please fill in product information in the sidebar first.")
         return
     
-    num_titles = st.slider("Oluşturulacak başlık sayısı:" if st.session_state['language'] == 'tr' else "Number of titles to generate:", 1, 10, 5)
+    num_titles = st.slider("Oluşturulacak başlık sayısı:" if st.session_state['language'] == 'tr' else "Number of titles to generate:", 1, 10, 5, key="step5_num_titles")
     
-    if st.button("🚀 SEO Başlıkları Oluştur" if st.session_state['language'] == 'tr' else "🚀 Generate SEO Titles"):
-        track_feature_usage('title_generation')
-        with st.spinner("Başlıklar oluşturuluyor..." if st.session_state['language'] == 'tr' else "Generating titles..."):
-            if st.session_state['language'] == 'tr':
-                system_prompt = "Sen bir Etsy SEO uzmanısın. Yüksek dönüşüm oranına sahip başlıklar oluşturuyorsun."
-                user_prompt = f"""
-                Ürün: {product_description}
-                Hedef Kitle: {target_audience}
-                Tasarım Teması: {design_theme}
-                
-                {num_titles} adet SEO optimized Etsy başlığı oluştur:
-                - Her başlık 130-140 karakter arası
-                - Anahtar kelimeler, tema, hedef kitle, ürün tipi içersin
-                - Yüksek arama hacimli kelimeler kullan
-                - Her başlık için karakter sayısını belirt
-                """
-            else:
-                system_prompt = "You are an Etsy SEO expert. Create high-converting titles between 130-140 characters."
-                user_prompt = f"""
-                Product: {product_description}
-                Target Audience: {target_audience}
-                Style: {design_theme}
-                
-                Create {num_titles} SEO optimized Etsy titles:
-                - Each title 130-140 characters
-                - Include keywords, theme, target audience, product type
-                - Use high search volume keywords
-                - Include character count for each title
-                """
-            
-            result = call_openai(system_prompt, user_prompt)
-            if result:
-                st.markdown(f'<div class="ai-output">{result}</div>', unsafe_allow_html=True)
+    render_listing_core_generation(num_titles)
+    
+    render_text_generation(
+        'titles',
+        "🚀 SEO Başlıkları Oluştur" if st.session_state['language'] == 'tr' else "🚀 Generate SEO Titles",
+        "Başlıklar oluşturuluyor..." if st.session_state['language'] == 'tr' else "Generating titles...",
+        feature='title_generation', num_titles=num_titles
+    )
+    render_title_check()
 
 
 def render_step_6():
@@ -574,41 +904,13 @@ def render_step_6():
         st.warning("Lütfen önce ürün açıklaması girin." if st.session_state['language'] == 'tr' else "Please enter product description first.")
         return
     
-    if st.button("🏷️ 13 Etiket Oluştur" if st.session_state['language'] == 'tr' else "🏷️ Generate 13 Tags"):
-        track_feature_usage('tag_generation')
-        with st.spinner("Etiketler oluşturuluyor..." if st.session_state['language'] == 'tr' else "Generating tags..."):
-            if st.session_state['language'] == 'tr':
-                system_prompt = "Sen bir Etsy SEO uzmanısın. En etkili 13 etiketi seçiyorsun."
-                user_prompt = f"""
-                Ürün: {product_description}
-                Kategori: {get_form_data('product_category')}
-                Hedef Kitle: {get_form_data('target_audience')}
-                
-                Bu ürün için tam 13 adet Etsy etiketi oluştur:
-                - Her etiket maksimum 20 karakter
-                - Yüksek arama hacimli kelimeler kullan
-                - Uzun kuyruk anahtar kelimeler ekle
-                - Ürün tipi, stil, hedef kitle, malzeme, renk kategorilerinden seç
-                - Her etiketin neden seçildiğini kısaca açıkla
-                """
-            else:
-                system_prompt = "You are an Etsy SEO expert. Select the most effective 13 tags."
-                user_prompt = f"""
-                Product: {product_description}
-                Category: {get_form_data('product_category')}
-                Target Audience: {get_form_data('target_audience')}
-                
-                Create exactly 13 Etsy tags for this product:
-                - Each tag maximum 20 characters
-                - Use high search volume keywords
-                - Include long-tail keywords
-                - Choose from categories: product type, style, target audience, material, color
-                - Briefly explain why each tag was selected
-                """
-            
-            result = call_openai(system_prompt, user_prompt)
-            if result:
-                st.markdown(f'<div class="ai-output">{result}</div>', unsafe_allow_html=True)
+    render_text_generation(
+        'tags',
+        "🏷️ 13 Etiket Oluştur" if st.session_state['language'] == 'tr' else "🏷️ Generate 13 Tags",
+        "Etiketler oluşturuluyor..." if st.session_state['language'] == 'tr' else "Generating tags...",
+        feature='tag_generation'
+    )
+    render_tag_check()
 
 
 def render_step_7():
@@ -620,53 +922,12 @@ def render_step_7():
         st.warning("Lütfen önce ürün açıklaması girin." if st.session_state['language'] == 'tr' else "Please enter product description first.")
         return
     
-    if st.button("📄 Detaylı Açıklama Oluştur" if st.session_state['language'] == 'tr' else "📄 Generate Detailed Description"):
-        track_feature_usage('description_generation')
-        with st.spinner("Açıklama yazılıyor..." if st.session_state['language'] == 'tr' else "Writing description..."):
-            if st.session_state['language'] == 'tr':
-                system_prompt = "Sen bir e-ticaret copywriting uzmanısın. Etsy için dönüşüm odaklı ürün açıklamaları yazıyorsun."
-                user_prompt = f"""
-                Ürün: {product_description}
-                Kategori: {get_form_data('product_category')}
-                Hedef Kitle: {get_form_data('target_audience')}
-                Tasarım: {get_form_data('design_theme')}
-                
-                Bu ürün için kapsamlı Etsy açıklaması yaz:
-                1. Dikkat çekici açılış cümlesi
-                2. Ürün özellikleri ve faydaları
-                3. Malzeme ve kalite bilgileri
-                4. Boyut ve kullanım rehberi
-                5. Hediye önerileri
-                6. Kişiselleştirme seçenekleri (varsa)
-                7. Kargo ve iade bilgileri
-                8. Harekete geçirici sonuç cümlesi
-                
-                Açıklama 1000-1500 kelime arası olsun ve SEO dostu olsun.
-                """
-            else:
-                system_prompt = "You are an e-commerce copywriting expert. Write conversion-focused product descriptions for Etsy."
-                user_prompt = f"""
-                Product: {product_description}
-                Category: {get_form_data('product_category')}
-                Target Audience: {get_form_data('target_audience')}
-                Design: {get_form_data('design_theme')}
-                
-                Write a comprehensive Etsy description for this product:
-                1. Attention-grabbing opening statement
-                2. Product features and benefits
-                3. Material and quality information
-                4. Size and usage guide
-                5. Gift suggestions
-                6. Customization options (if applicable)
-                7. Shipping and return information
-                8. Call-to-action closing statement
-                
-                Description should be 1000-1500 words and SEO-friendly.
-                """
-            
-            result = call_openai(system_prompt, user_prompt, max_tokens=1500)
-            if result:
-                st.markdown(f'<div class="ai-output">{result}</div>', unsafe_allow_html=True)
+    render_text_generation(
+        'description',
+        "📄 Detaylı Açıklama Oluştur" if st.session_state['language'] == 'tr' else "📄 Generate Detailed Description",
+        "Açıklama yazılıyor..." if st.session_state['language'] == 'tr' else "Writing description...",
+        feature='description_generation'
+    )
 
 
 def render_step_8():
@@ -689,33 +950,17 @@ def render_step_8():
         with col1:
             variation_type = st.selectbox(
                 "Varyasyon tipi:",
-                ["Renk", "Boyut", "Malzeme", "Stil", "Set/Paket"]
+                ["Renk", "Boyut", "Malzeme", "Stil", "Set/Paket"],
+                key="step8_variation_type_tr"
             )
             
         with col2:
-            num_variations = st.slider("Varyasyon sayısı:", 2, 10, 3)
+            num_variations = st.slider("Varyasyon sayısı:", 2, 10, 3, key="step8_num_variations_tr")
         
-        if st.button("🎯 Varyasyon Stratejisi Oluştur"):
-            with st.spinner("Varyasyon stratejisi oluşturuluyor..."):
-                system_prompt = "Sen bir Etsy varyasyon uzmanısın. Satışları artıran varyasyon stratejileri geliştiriyorsun."
-                user_prompt = f"""
-                Ürün: {get_form_data('product_description')}
-                Kategori: {get_form_data('product_category')}
-                Varyasyon Tipi: {variation_type}
-                Varyasyon Sayısı: {num_variations}
-                
-                Bu ürün için varyasyon stratejisi oluştur:
-                1. Önerilen varyasyon seçenekleri
-                2. Her varyasyon için fiyatlandırma önerileri
-                3. Varyasyon görsellerinin nasıl olması gerektiği
-                4. Stok yönetimi ipuçları
-                5. Müşteri seçim kolaylığı için düzenleme önerileri
-                6. Varyasyon SEO optimizasyonu
-                """
-                
-                result = call_openai(system_prompt, user_prompt)
-                if result:
-                    st.markdown(f'<div class="ai-output">{result}</div>', unsafe_allow_html=True)
+        render_text_generation(
+            'variation_strategy', "🎯 Varyasyon Stratejisi Oluştur", "Varyasyon stratejisi oluşturuluyor...",
+            variation_type=variation_type, num_variations=num_variations
+        )
     else:
         st.markdown("""
         <div class="tip-box">
@@ -732,33 +977,17 @@ def render_step_8():
         with col1:
             variation_type = st.selectbox(
                 "Variation type:",
-                ["Color", "Size", "Material", "Style", "Set/Bundle"]
+                ["Color", "Size", "Material", "Style", "Set/Bundle"],
+                key="step8_variation_type_en"
             )
             
         with col2:
-            num_variations = st.slider("Number of variations:", 2, 10, 3)
+            num_variations = st.slider("Number of variations:", 2, 10, 3, key="step8_num_variations_en")
         
-        if st.button("🎯 Generate Variation Strategy"):
-            with st.spinner("Generating variation strategy..."):
-                system_prompt = "You are an Etsy variation expert. Develop variation strategies that increase sales."
-                user_prompt = f"""
-                Product: {get_form_data('product_description')}
-                Category: {get_form_data('product_category')}
-                Variation Type: {variation_type}
-                Number of Variations: {num_variations}
-                
-                Create a variation strategy for this product:
-                1. Recommended variation options
-                2. Pricing suggestions for each variation
-                3. How variation images should look
-                4. Inventory management tips
-                5. Organization tips for customer selection ease
-                6. Variation SEO optimization
-                """
-                
-                result = call_openai(system_prompt, user_prompt)
-                if result:
-                    st.markdown(f'<div class="ai-output">{result}</div>', unsafe_allow_html=True)
+        render_text_generation(
+            'variation_strategy', "🎯 Generate Variation Strategy", "Generating variation strategy...",
+            variation_type=variation_type, num_variations=num_variations
+        )
 
 
 def render_step_9():
@@ -769,74 +998,36 @@ def render_step_9():
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            material_cost = st.number_input("Malzeme maliyeti ($):", min_value=0.0, value=5.0, step=0.5)
+            material_cost = st.number_input("Malzeme maliyeti ($):", min_value=0.0, value=5.0, step=0.5, key="step9_material_cost")
         with col2:
-            time_hours = st.number_input("Çalışma saati:", min_value=0.1, value=2.0, step=0.1)
+            time_hours = st.number_input("Çalışma saati:", min_value=0.1, value=2.0, step=0.1, key="step9_time_hours")
         with col3:
-            hourly_rate = st.number_input("Saat ücreti ($):", min_value=5.0, value=20.0, step=1.0)
+            hourly_rate = st.number_input("Saat ücreti ($):", min_value=5.0, value=20.0, step=1.0, key="step9_hourly_rate")
         
-        target_margin = st.slider("Hedef kar marjı (%):", 20, 80, 50)
+        target_margin = st.slider("Hedef kar marjı (%):", 20, 80, 50, key="step9_target_margin")
         
-        if st.button("💰 Fiyat Stratejisi Oluştur"):
-            with st.spinner("Fiyat analizi yapılıyor..."):
-                system_prompt = "Sen bir Etsy fiyatlandırma uzmanısın. Psikoloji temelli ve rekabetçi fiyatlandırma stratejileri geliştiriyorsun."
-                user_prompt = f"""
-                Ürün: {get_form_data('product_description')}
-                Kategori: {get_form_data('product_category')}
-                Malzeme Maliyeti: ${material_cost}
-                Çalışma Saati: {time_hours} saat
-                Saat Ücreti: ${hourly_rate}
-                Hedef Kar Marjı: %{target_margin}
-                
-                Bu ürün için kapsamlı fiyatlandırma stratejisi oluştur:
-                1. Maliyet analizi ve hesaplaması
-                2. Piyasa araştırması ve rekabet analizi
-                3. Psikolojik fiyatlandırma teknikleri
-                4. Promosyon ve indirim stratejileri
-                5. Değer algısını artırma yöntemleri
-                6. Fiyat testleri ve optimizasyon önerileri
-                7. Minimum ve maksimum fiyat önerileri
-                """
-                
-                result = call_openai(system_prompt, user_prompt)
-                if result:
-                    st.markdown(f'<div class="ai-output">{result}</div>', unsafe_allow_html=True)
+        render_text_generation(
+            'pricing_strategy', "💰 Fiyat Stratejisi Oluştur", "Fiyat analizi yapılıyor...",
+            material_cost=material_cost, time_hours=time_hours,
+            hourly_rate=hourly_rate, target_margin=target_margin
+        )
     else:
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            material_cost = st.number_input("Material cost ($):", min_value=0.0, value=5.0, step=0.5)
+            material_cost = st.number_input("Material cost ($):", min_value=0.0, value=5.0, step=0.5, key="step9_material_cost")
         with col2:
-            time_hours = st.number_input("Work hours:", min_value=0.1, value=2.0, step=0.1)
+            time_hours = st.number_input("Work hours:", min_value=0.1, value=2.0, step=0.1, key="step9_time_hours")
         with col3:
-            hourly_rate = st.number_input("Hourly rate ($):", min_value=5.0, value=20.0, step=1.0)
+            hourly_rate = st.number_input("Hourly rate ($):", min_value=5.0, value=20.0, step=1.0, key="step9_hourly_rate")
         
-        target_margin = st.slider("Target profit margin (%):", 20, 80, 50)
+        target_margin = st.slider("Target profit margin (%):", 20, 80, 50, key="step9_target_margin")
         
-        if st.button("💰 Generate Pricing Strategy"):
-            with st.spinner("Analyzing pricing..."):
-                system_prompt = "You are an Etsy pricing expert. Develop psychology-based and competitive pricing strategies."
-                user_prompt = f"""
-                Product: {get_form_data('product_description')}
-                Category: {get_form_data('product_category')}
-                Material Cost: ${material_cost}
-                Work Hours: {time_hours} hours
-                Hourly Rate: ${hourly_rate}
-                Target Margin: {target_margin}%
-                
-                Create comprehensive pricing strategy for this product:
-                1. Cost analysis and calculation
-                2. Market research and competition analysis
-                3. Psychological pricing techniques
-                4. Promotion and discount strategies
-                5. Value perception enhancement methods
-                6. Price testing and optimization recommendations
-                7. Minimum and maximum price suggestions
-                """
-                
-                result = call_openai(system_prompt, user_prompt)
-                if result:
-                    st.markdown(f'<div class="ai-output">{result}</div>', unsafe_allow_html=True)
+        render_text_generation(
+            'pricing_strategy', "💰 Generate Pricing Strategy", "Analyzing pricing...",
+            material_cost=material_cost, time_hours=time_hours,
+            hourly_rate=hourly_rate, target_margin=target_margin
+        )
 
 
 def render_step_10():
@@ -867,29 +1058,9 @@ def render_step_10():
         st.markdown("### 📋 İlan Kontrol Listesi")
         
         for i, item in enumerate(checklist_items):
-            st.checkbox(item, key=f"checklist_{i}")
+            st.checkbox(item, key=f"step10_checklist_tr_{i}")
         
-        if st.button("🔍 İlan Analizi Yap"):
-            with st.spinner("İlan analizi yapılıyor..."):
-                system_prompt = "Sen bir Etsy ilanı optimizasyon uzmanısın. İlanları analiz edip iyileştirme önerileri sunuyorsun."
-                user_prompt = f"""
-                Ürün: {get_form_data('product_description')}
-                Kategori: {get_form_data('product_category')}
-                Hedef Kitle: {get_form_data('target_audience')}
-                
-                Bu ürün için detaylı ilanı analizi yap:
-                1. İlan tamamlılık skoru
-                2. SEO optimizasyon durumu
-                3. Görsel kalite değerlendirmesi
-                4. Rekabet avantajları
-                5. Geliştirilmesi gereken alanlar
-                6. Yayınlama öncesi son kontroller
-                7. İlan performansını artırma önerileri
-                """
-                
-                result = call_openai(system_prompt, user_prompt)
-                if result:
-                    st.markdown(f'<div class="ai-output">{result}</div>', unsafe_allow_html=True)
+        render_text_generation('listing_analysis', "🔍 İlan Analizi Yap", "İlan analizi yapılıyor...")
     else:
         st.markdown("""
         <div class="tip-box">
@@ -914,29 +1085,9 @@ def render_step_10():
         st.markdown("### 📋 Listing Checklist")
         
         for i, item in enumerate(checklist_items):
-            st.checkbox(item, key=f"checklist_en_{i}")
+            st.checkbox(item, key=f"step10_checklist_en_{i}")
         
-        if st.button("🔍 Analyze Listing"):
-            with st.spinner("Analyzing listing..."):
-                system_prompt = "You are an Etsy listing optimization expert. Analyze listings and provide improvement suggestions."
-                user_prompt = f"""
-                Product: {get_form_data('product_description')}
-                Category: {get_form_data('product_category')}
-                Target Audience: {get_form_data('target_audience')}
-                
-                Perform detailed listing analysis for this product:
-                1. Listing completeness score
-                2. SEO optimization status
-                3. Image quality assessment
-                4. Competitive advantages
-                5. Areas for improvement
-                6. Pre-launch final checks
-                7. Listing performance enhancement suggestions
-                """
-                
-                result = call_openai(system_prompt, user_prompt)
-                if result:
-                    st.markdown(f'<div class="ai-output">{result}</div>', unsafe_allow_html=True)
+        render_text_generation('listing_analysis', "🔍 Analyze Listing", "Analyzing listing...")
 
 
 def render_step_11():
@@ -946,67 +1097,29 @@ def render_step_11():
     if st.session_state['language'] == 'tr':
         promo_type = st.selectbox(
             "Tanıtım stratejisi:",
-            ["Sosyal Medya Kampanyası", "İnfluencer İşbirliği", "Email Marketing", "Pinterest SEO", "Blog İçeriği"]
+            ["Sosyal Medya Kampanyası", "İnfluencer İşbirliği", "Email Marketing", "Pinterest SEO", "Blog İçeriği"],
+            key="step11_promo_type_tr"
         )
         
-        budget = st.slider("Tanıtım bütçesi ($):", 0, 500, 50)
+        budget = st.slider("Tanıtım bütçesi ($):", 0, 500, 50, key="step11_budget")
         
-        if st.button("📈 SEO & Tanıtım Planı Oluştur"):
-            with st.spinner("SEO ve tanıtım planı hazırlanıyor..."):
-                system_prompt = "Sen bir Etsy SEO ve pazarlama uzmanısın. Organik trafik ve satış artırıcı stratejiler geliştiriyorsun."
-                user_prompt = f"""
-                Ürün: {get_form_data('product_description')}
-                Kategori: {get_form_data('product_category')}
-                Hedef Kitle: {get_form_data('target_audience')}
-                Tanıtım Tipi: {promo_type}
-                Bütçe: ${budget}
-                
-                Bu ürün için kapsamlı SEO ve tanıtım planı oluştur:
-                1. Etsy SEO optimizasyon rehberi
-                2. Anahtar kelime araştırması ve strateji
-                3. Sosyal medya tanıtım planı
-                4. Pinterest SEO stratejisi
-                5. İnfluencer işbirliği önerileri
-                6. Email marketing kampanyası
-                7. Ücretsiz tanıtım yöntemleri
-                8. Bütçe dağılımı ve ROI beklentileri
-                """
-                
-                result = call_openai(system_prompt, user_prompt, max_tokens=1200)
-                if result:
-                    st.markdown(f'<div class="ai-output">{result}</div>', unsafe_allow_html=True)
+        render_text_generation(
+            'seo_promotion', "📈 SEO & Tanıtım Planı Oluştur", "SEO ve tanıtım planı hazırlanıyor...",
+            promo_type=promo_type, budget=budget
+        )
     else:
         promo_type = st.selectbox(
             "Promotion strategy:",
-            ["Social Media Campaign", "Influencer Collaboration", "Email Marketing", "Pinterest SEO", "Blog Content"]
+            ["Social Media Campaign", "Influencer Collaboration", "Email Marketing", "Pinterest SEO", "Blog Content"],
+            key="step11_promo_type_en"
         )
         
-        budget = st.slider("Promotion budget ($):", 0, 500, 50)
+        budget = st.slider("Promotion budget ($):", 0, 500, 50, key="step11_budget")
         
-        if st.button("📈 Generate SEO & Promotion Plan"):
-            with st.spinner("Creating SEO and promotion plan..."):
-                system_prompt = "You are an Etsy SEO and marketing expert. Develop strategies to increase organic traffic and sales."
-                user_prompt = f"""
-                Product: {get_form_data('product_description')}
-                Category: {get_form_data('product_category')}
-                Target Audience: {get_form_data('target_audience')}
-                Promotion Type: {promo_type}
-                Budget: ${budget}
-                
-                Create comprehensive SEO and promotion plan for this product:
-                1. Etsy SEO optimization guide
-                2. Keyword research and strategy
-                3. Social media promotion plan
-                4. Pinterest SEO strategy
-                5. Influencer collaboration suggestions
-                6. Email marketing campaign
-                7. Free promotion methods
-                8. Budget allocation and ROI expectations
-                """
-                
-                result = call_openai(system_prompt, user_prompt, max_tokens=1200)
-                if result:
-                    st.markdown(f'<div class="ai-output">{result}</div>', unsafe_allow_html=True)
+        render_text_generation(
+            'seo_promotion', "📈 Generate SEO & Promotion Plan", "Creating SEO and promotion plan...",
+            promo_type=promo_type, budget=budget
+        )
 
 
 def render_step_12():
@@ -1026,31 +1139,14 @@ def render_step_12():
         
         analysis_period = st.selectbox(
             "Analiz dönemi:",
-            ["İlk 7 gün", "İlk 30 gün", "İlk 3 ay", "Uzun dönem (6+ ay)"]
+            ["İlk 7 gün", "İlk 30 gün", "İlk 3 ay", "Uzun dönem (6+ ay)"],
+            key="step12_analysis_period_tr"
         )
         
-        if st.button("📊 Performans Analiz Planı Oluştur"):
-            with st.spinner("Analiz planı hazırlanıyor..."):
-                system_prompt = "Sen bir Etsy analitik uzmanısın. Veri odaklı optimizasyon stratejileri geliştiriyorsun."
-                user_prompt = f"""
-                Ürün: {get_form_data('product_description')}
-                Kategori: {get_form_data('product_category')}
-                Analiz Dönemi: {analysis_period}
-                
-                Bu ürün için kapsamlı analitik ve optimizasyon planı oluştur:
-                1. Takip edilmesi gereken anahtar metrikler
-                2. Etsy Stats kullanım rehberi
-                3. A/B test önerileri (başlık, fiyat, görsel)
-                4. Rekabet analizi yöntemleri
-                5. Sezonsal trendleri değerlendirme
-                6. Performans iyileştirme aksiyon planı
-                7. Başarı göstergeleri ve hedefler
-                8. Veri toplama ve raporlama stratejisi
-                """
-                
-                result = call_openai(system_prompt, user_prompt, max_tokens=1200)
-                if result:
-                    st.markdown(f'<div class="ai-output">{result}</div>', unsafe_allow_html=True)
+        render_text_generation(
+            'analytics_plan', "📊 Performans Analiz Planı Oluştur", "Analiz planı hazırlanıyor...",
+            analysis_period=analysis_period
+        )
     else:
         st.markdown("""
         <div class="tip-box">
@@ -1064,31 +1160,14 @@ def render_step_12():
         
         analysis_period = st.selectbox(
             "Analysis period:",
-            ["First 7 days", "First 30 days", "First 3 months", "Long term (6+ months)"]
+            ["First 7 days", "First 30 days", "First 3 months", "Long term (6+ months)"],
+            key="step12_analysis_period_en"
         )
         
-        if st.button("📊 Generate Performance Analysis Plan"):
-            with st.spinner("Creating analysis plan..."):
-                system_prompt = "You are an Etsy analytics expert. Develop data-driven optimization strategies."
-                user_prompt = f"""
-                Product: {get_form_data('product_description')}
-                Category: {get_form_data('product_category')}
-                Analysis Period: {analysis_period}
-                
-                Create comprehensive analytics and optimization plan for this product:
-                1. Key metrics to track
-                2. Etsy Stats usage guide
-                3. A/B testing suggestions (title, price, images)
-                4. Competitor analysis methods
-                5. Seasonal trend evaluation
-                6. Performance improvement action plan
-                7. Success indicators and targets
-                8. Data collection and reporting strategy
-                """
-                
-                result = call_openai(system_prompt, user_prompt, max_tokens=1200)
-                if result:
-                    st.markdown(f'<div class="ai-output">{result}</div>', unsafe_allow_html=True)
+        render_text_generation(
+            'analytics_plan', "📊 Generate Performance Analysis Plan", "Creating analysis plan...",
+            analysis_period=analysis_period
+        )
 
 
 def render_step_13():
@@ -1108,38 +1187,20 @@ def render_step_13():
         
         pod_provider = st.selectbox(
             "POD sağlayıcısı:",
-            ["Printful", "Printify", "Gooten", "SPOD", "Print on Demand", "Diğer"]
+            ["Printful", "Printify", "Gooten", "SPOD", "Print on Demand", "Diğer"],
+            key="step13_pod_provider_tr"
         )
         
         product_type = st.selectbox(
             "Ürün tipi:",
-            ["T-shirt", "Hoodie", "Mug", "Poster", "Phone Case", "Tote Bag", "Pillow"]
+            ["T-shirt", "Hoodie", "Mug", "Poster", "Phone Case", "Tote Bag", "Pillow"],
+            key="step13_product_type"
         )
         
-        if st.button("📦 Sipariş Yönetim Sistemi Oluştur"):
-            with st.spinner("Sipariş yönetim planı hazırlanıyor..."):
-                system_prompt = "Sen bir POD (Print on Demand) ve sipariş yönetimi uzmanısın. Verimli süreçler tasarlıyorsun."
-                user_prompt = f"""
-                Ürün: {get_form_data('product_description')}
-                POD Sağlayıcısı: {pod_provider}
-                Ürün Tipi: {product_type}
-                
-                Bu ürün için kapsamlı sipariş yönetim sistemi oluştur:
-                1. POD entegrasyon rehberi
-                2. Sipariş işlem adımları
-                3. Kalite kontrol süreci
-                4. Müşteri iletişim şablonları
-                5. Kargo ve teslimat yönetimi
-                6. İade ve değişim politikaları
-                7. Envanter takip sistemi
-                8. Müşteri memnuniyeti stratejileri
-                9. Otomasyon önerileri
-                10. Sorun çözme rehberi
-                """
-                
-                result = call_openai(system_prompt, user_prompt, max_tokens=1500)
-                if result:
-                    st.markdown(f'<div class="ai-output">{result}</div>', unsafe_allow_html=True)
+        render_text_generation(
+            'order_management', "📦 Sipariş Yönetim Sistemi Oluştur", "Sipariş yönetim planı hazırlanıyor...",
+            pod_provider=pod_provider, product_type=product_type
+        )
     else:
         st.markdown("""
         <div class="tip-box">
@@ -1153,38 +1214,20 @@ def render_step_13():
         
         pod_provider = st.selectbox(
             "POD provider:",
-            ["Printful", "Printify", "Gooten", "SPOD", "Print on Demand", "Other"]
+            ["Printful", "Printify", "Gooten", "SPOD", "Print on Demand", "Other"],
+            key="step13_pod_provider_en"
         )
         
         product_type = st.selectbox(
             "Product type:",
-            ["T-shirt", "Hoodie", "Mug", "Poster", "Phone Case", "Tote Bag", "Pillow"]
+            ["T-shirt", "Hoodie", "Mug", "Poster", "Phone Case", "Tote Bag", "Pillow"],
+            key="step13_product_type"
         )
         
-        if st.button("📦 Create Order Management System"):
-            with st.spinner("Creating order management plan..."):
-                system_prompt = "You are a POD (Print on Demand) and order management expert. Design efficient processes."
-                user_prompt = f"""
-                Product: {get_form_data('product_description')}
-                POD Provider: {pod_provider}
-                Product Type: {product_type}
-                
-                Create comprehensive order management system for this product:
-                1. POD integration guide
-                2. Order processing steps
-                3. Quality control process
-                4. Customer communication templates
-                5. Shipping and delivery management
-                6. Return and exchange policies
-                7. Inventory tracking system
-                8. Customer satisfaction strategies
-                9. Automation recommendations
-                10. Problem-solving guide
-                """
-                
-                result = call_openai(system_prompt, user_prompt, max_tokens=1500)
-                if result:
-                    st.markdown(f'<div class="ai-output">{result}</div>', unsafe_allow_html=True)
+        render_text_generation(
+            'order_management', "📦 Create Order Management System", "Creating order management plan...",
+            pod_provider=pod_provider, product_type=product_type
+        )
 
 
 def render_remaining_steps(step_number):
@@ -1202,70 +1245,145 @@ def render_remaining_steps(step_number):
     st.info(f"Adım {step_number} yakında eklenecek..." if st.session_state['language'] == 'tr' else f"Step {step_number} coming soon...")
 
 
-def main():
-    """Main application function"""
-    # Apply CSS
-    st.markdown(apply_custom_css(), unsafe_allow_html=True)
-    
-    # Render sidebar
-    render_sidebar()
-    
-    # Main header
-    st.markdown(f"""
-    <div style="text-align: center; padding: 20px;">
-        <h1>{t('app_title')}</h1>
-        <p style='font-size: 1.2em; color: #666;'>{t('app_subtitle')}</p>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    # Create tabs for steps
-    tab_labels = [f"{t('step')} {i+1}" for i in range(13)]
-    tabs = st.tabs(tab_labels)
+STEP_RENDERERS = [
+    render_step_1, render_step_2, render_step_3, render_step_4, render_step_5,
+    render_step_6, render_step_7, render_step_8, render_step_9, render_step_10,
+    render_step_11, render_step_12, render_step_13
+]
+
+
+def finish_rerun():
+    """Account memory and snapshot changed session keys at the end of a rerun"""
+    # Account this session's memory and trim idle sessions when over budget
+    with span("track_session_memory"):
+        track_session_memory()
     
-    # Render each step
-    with tabs[0]:  # Step 1
-        render_step_1()
+    # Snapshot changed session keys so a browser reload restores this state
+    if config.get_session_settings()['persistence_enabled']:
+        with span("persist_session_state"):
+            persist_session_state()
+
+
+@contextmanager
+def fragment_rerun(name):
+    """Profile and finish a fragment-only rerun the way main() does a full one"""
+    if st.session_state.get('_full_rerun_active'):
+        yield
+        return
     
-    with tabs[1]:  # Step 2
-        render_step_2()
-        
-    with tabs[2]:  # Step 3
-        render_step_3()
-        
-    with tabs[3]:  # Step 4
-        render_step_4()
+    with session_memory_lock():
+        with profile_rerun(get_user_id(), enabled=config.is_debug_mode(), name=name):
+            yield
+        finish_rerun()
+
+
+@st.fragment
+def render_step_fragment(step):
+    """Render one step as a fragment: its widgets rerun only this step"""
+    with fragment_rerun(f"fragment:step_{step}"):
+        with span(f"render_step_{step}"):
+            set_current_step(step)
+            STEP_RENDERERS[step - 1]()
+        set_current_step(None)
+
+
+@st.fragment(run_every=config.get_job_settings()['poll_seconds'])
+def render_job_status():
+    """Show this session's running jobs; rerun the app once one finishes so it gets delivered"""
+    if has_finished_jobs():
+        st.rerun()
     
-    with tabs[4]:  # Step 5  
-        render_step_5()
-        
-    with tabs[5]:  # Step 6
-        render_step_6()
-        
-    with tabs[6]:  # Step 7
-        render_step_7()
-        
-    with tabs[7]:  # Step 8
-        render_step_8()
+    for job in get_session_jobs():
+        st.caption(f"⏳ {t('step')} {job.step or '-'} · {job.content_type} · {time.time() - job.submitted:.0f}s")
+
+
+def _on_step_navigation():
+    """Switch to the step picked in the navigation bar"""
+    set_active_step(st.session_state['nav_step'])
+
+
+def render_step_navigation(active_step):
+    """Render the step selector; picking a step reruns with only that step rendered"""
+    st.session_state['nav_step'] = active_step
+    st.radio(
+        t('step'),
+        options=list(range(1, len(STEP_RENDERERS) + 1)),
+        format_func=lambda step: f"{t('step')} {step}",
+        horizontal=True,
+        label_visibility="collapsed",
+        key="nav_step",
+        on_change=_on_step_navigation
+    )
+
+
+def render_step_pager(active_step):
+    """Render previous/next buttons below the active step"""
+    st.markdown("---")
+    col1, _, col2 = st.columns([1, 3, 1])
+    with col1:
+        if active_step > 1:
+            st.button(f"← {t('step')} {active_step - 1}", key="nav_prev",
+                      on_click=set_active_step, args=(active_step - 1,))
+    with col2:
+        if active_step < len(STEP_RENDERERS):
+            st.button(f"{t('step')} {active_step + 1} →", key="nav_next",
+                      on_click=set_active_step, args=(active_step + 1,))
+
+
+def main():
+    """Main application function"""
+    # Fragments rendered during a full rerun leave profiling and persistence to main()
+    st.session_state['_full_rerun_active'] = True
+    try:
+        # The memory accountant evicts from idle sessions only while their lock is free
+        with session_memory_lock():
+            render_app()
+    finally:
+        st.session_state['_full_rerun_active'] = False
+
+
+def render_app():
+    """Render the whole page"""
+    # Each rerun is one trace; in debug mode it is also timed into the rerun report
+    with profile_rerun(get_user_id(), enabled=config.is_debug_mode()):
+        # Apply CSS
+        st.markdown(apply_custom_css(), unsafe_allow_html=True)
+        
+        # Render sidebar
+        with span("render_sidebar"):
+            render_sidebar()
+        
+        # Main header
+        st.markdown(f"""
+        <div style="text-align: center; padding: 20px;">
+            <h1>{t('app_title')}</h1>
+            <p style='font-size: 1.2em; color: #666;'>{t('app_subtitle')}</p>
+        </div>
+        """, unsafe_allow_html=True)
         
-    with tabs[8]:  # Step 9
-        render_step_9()
+        # Only the active step renders; the others keep their widget values meanwhile
+        active_step = get_active_step()
+        keep_widget_state(active_step)
+        render_step_navigation(active_step)
         
-    with tabs[9]:  # Step 10
-        render_step_10()
+        # Results of background jobs are applied here, whichever step is open
+        with span("deliver_jobs"):
+            for job in deliver_finished_jobs():
+                if job.status == 'done':
+                    handle_result(job.content_type, get_generated_content(job.content_type)['content'], job.metadata)
+                    st.toast(f"{t('step')} {job.step}: {t('job_done')}")
+        if get_session_jobs():
+            render_job_status()
         
-    with tabs[10]:  # Step 11
-        render_step_11()
+        render_step_fragment(active_step)
+        render_step_pager(active_step)
         
-    with tabs[11]:  # Step 12
-        render_step_12()
+        # Footer
+        st.markdown("---")
+        st.markdown(f"<div style='text-align: center; color: #666; padding: 20px;'>{t('footer')}</div>", unsafe_allow_html=True)
         
-    with tabs[12]:  # Step 13
-        render_step_13()
-    
-    # Footer
-    st.markdown("---")
-    st.markdown(f"<div style='text-align: center; color: #666; padding: 20px;'>{t('footer')}</div>", unsafe_allow_html=True)
+        finish_rerun()
 
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
@@ -0,0 +1,88 @@
+"""
+Bulk runs against a fake chat API
+"""
+import os
+import types
+import pytest
+import utils.api_client as api_client
+import utils.bulk as bulk
+import utils.session_helpers as session_helpers
+from utils import APIError, create_session, use_session
+from utils.history_db import get_database
+
+
+@pytest.fixture
+def fake_api(monkeypatch):
+    monkeypatch.setenv('OPENAI_API_KEY', 'sk-test')
+    calls = []
+
+    def chat_request(client, system_prompt, user_prompt, max_tokens):
+        calls.append(user_prompt)
+        message = types.SimpleNamespace(content=f"RESULT {len(calls)}")
+        return types.SimpleNamespace(
+            choices=[types.SimpleNamespace(message=message)],
+            usage=types.SimpleNamespace(prompt_tokens=100, completion_tokens=50)
+        )
+
+    monkeypatch.setattr(api_client, '_chat_request', chat_request)
+    return calls
+
+
+def test_bulk_run_leaves_history_db_unchanged(tmp_path, monkeypatch, fake_api):
+    history_db = str(tmp_path / 'history.db')
+    monkeypatch.setattr(session_helpers, 'HISTORY_BACKEND', 'sqlite')
+    monkeypatch.setattr(session_helpers, 'HISTORY_DB_PATH', history_db)
+    products = [
+        {'id': str(index), 'product_description': f"Cat shirt {index}", 'product_category': 'T-shirt',
+         'target_audience': 'cat lovers', 'design_theme': 'retro'}
+        for index in range(3)
+    ]
+
+    summary = bulk.run_bulk(products, ['titles', 'tags'], str(tmp_path / 'out.jsonl'), concurrency=2)
+
+    assert summary['succeeded'] == 3
+    assert len(fake_api) == 6
+    assert not os.path.exists(history_db) or get_database(history_db).execute("SELECT COUNT(*) FROM history")[0][0] == 0
+
+
+class RateLimitError(Exception):
+    pass
+
+
+class BadRequestError(Exception):
+    status_code = 400
+
+
+class InternalServerError(Exception):
+    status_code = 503
+
+
+@pytest.mark.parametrize('error_class, calls', [(RateLimitError, 4), (InternalServerError, 4), (BadRequestError, 1)])
+def test_run_step_retries_only_transient_errors(monkeypatch, error_class, calls):
+    monkeypatch.setenv('OPENAI_API_KEY', 'sk-test')
+    monkeypatch.setattr(bulk, 'BULK_MAX_RETRIES', 3)
+    monkeypatch.setattr(bulk, 'BULK_RETRY_BACKOFF_SECONDS', 0)
+    made = []
+
+    def chat_request(client, system_prompt, user_prompt, max_tokens):
+        made.append(user_prompt)
+        raise error_class('boom')
+
+    monkeypatch.setattr(api_client, '_chat_request', chat_request)
+    with use_session(create_session()):
+        result, error = bulk._run_step('titles', 'system', 'user prompt', 100)
+
+    assert result is None and error == "API call failed: boom"
+    assert len(made) == calls
+
+
+def test_run_step_does_not_retry_budget_errors(monkeypatch, fake_api):
+    def over_budget():
+        raise APIError("Listing budget exceeded", error_code='budget_exceeded')
+
+    monkeypatch.setattr(api_client, 'check_listing_budget', over_budget)
+    with use_session(create_session()):
+        result, error = bulk._run_step('titles', 'system', 'user prompt', 100)
+
+    assert (result, error) == (None, "Listing budget exceeded")
+    assert fake_api == []
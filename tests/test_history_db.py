@@ -0,0 +1,31 @@
+"""
+SQLite history store: per-user keys and FTS consistency
+"""
+from utils.history_db import SQLiteHistoryStore
+from utils.records import HistoryEntry
+
+
+def _entry(entry_id, content, timestamp=1.0):
+    return HistoryEntry(id=entry_id, content_type='titles', content=content, timestamp=timestamp)
+
+
+def test_same_id_for_two_users_keeps_both(tmp_path):
+    db_path = str(tmp_path / 'history.db')
+    alice, bob = SQLiteHistoryStore(db_path, 'alice'), SQLiteHistoryStore(db_path, 'bob')
+    alice.add(_entry('titles_1', 'retro cat shirt'))
+    bob.add(_entry('titles_1', 'coffee mug'))
+
+    assert alice.get('titles_1')['content'] == 'retro cat shirt'
+    assert bob.get('titles_1')['content'] == 'coffee mug'
+    assert [entry['id'] for entry in bob.search('mug')] == ['titles_1']
+    assert alice.search('mug') == []
+
+
+def test_re_adding_an_entry_updates_the_search_index(tmp_path):
+    store = SQLiteHistoryStore(str(tmp_path / 'history.db'), 'alice')
+    store.add(_entry('titles_1', 'banana shirt'))
+    store.add(_entry('titles_1', 'apple mug', timestamp=2.0))
+
+    assert len(store) == 1
+    assert store.search('banana') == []
+    assert [entry['content'] for entry in store.search('apple')] == ['apple mug']
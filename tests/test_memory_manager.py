@@ -0,0 +1,62 @@
+"""
+Memory budget enforcement against idle sessions
+"""
+import time
+import pytest
+import utils.cache_utils as cache_utils
+import utils.memory_manager as memory_manager
+from utils import (
+    create_session, use_session, save_to_cache, get_from_cache, get_cached_usage,
+    track_session_memory, session_memory_lock, enforce_memory_budget
+)
+
+
+@pytest.fixture(autouse=True)
+def spill_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache_utils, 'SPILL_DB_PATH', str(tmp_path / 'spill.db'))
+    monkeypatch.setattr(memory_manager, 'MEMORY_IDLE_SECONDS', 60)
+
+
+def _idle_session_with_cache(entries=50):
+    session = create_session()
+    with use_session(session):
+        for index in range(entries):
+            save_to_cache(f"key{index}", "response " * 200 + str(index), {'model': 'gpt-3.5-turbo', 'cost': 0.01})
+        track_session_memory()
+    handle = session['_memory_handle']
+    handle.measure()
+    handle.last_active = time.time() - 3600
+    return session, handle
+
+
+def test_idle_session_is_trimmed_without_rerunning():
+    idle, handle = _idle_session_with_cache()
+    active = create_session()
+    with use_session(active):
+        track_session_memory()
+    before = handle.size_bytes
+
+    freed = enforce_memory_budget(budget_bytes=before // 2, exclude=active.session_id)
+
+    assert freed > 0
+    assert handle.size_bytes < before // 2
+    assert idle['api_cache'] == {}
+    # Spilled entries come back with their usage for the same user only
+    with use_session(active):
+        assert get_from_cache('key3') is None
+    with use_session(idle):
+        assert get_from_cache('key3').endswith('3')
+        assert get_cached_usage('key3') == {'model': 'gpt-3.5-turbo', 'cost': 0.01}
+
+
+def test_session_is_not_trimmed_during_its_rerun():
+    idle, handle = _idle_session_with_cache()
+    with use_session(idle):
+        with session_memory_lock():
+            # The accountant runs on another session's thread
+            result = []
+            thread = memory_manager.threading.Thread(target=lambda: result.append(enforce_memory_budget(budget_bytes=0)))
+            thread.start()
+            thread.join()
+    assert result == [0]
+    assert len(idle['api_cache']) == 50
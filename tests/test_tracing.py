@@ -0,0 +1,19 @@
+"""
+Recent traces are kept per session
+"""
+from utils import MemorySession, use_session, span, trace_session, get_recent_traces, clear_traces
+
+
+def test_recent_traces_filter_by_session():
+    clear_traces()
+    first, second = MemorySession(), MemorySession()
+    with use_session(first), span("first_rerun"):
+        pass
+    with use_session(second), span("second_rerun"):
+        pass
+    with use_session(second), trace_session(first.session_id), span("first_job"):
+        pass
+
+    assert [t['name'] for t in get_recent_traces(session_id=first.session_id)] == ['first_job', 'first_rerun']
+    assert [t['name'] for t in get_recent_traces(session_id=second.session_id)] == ['second_rerun']
+    assert len(get_recent_traces()) == 3
@@ -0,0 +1,18 @@
+"""
+Cost estimates from the price table
+"""
+from config.settings import DALLE_IMAGE_SIZES, MODEL_PRICES
+from utils import create_session, use_session, calculate_cost
+from utils.api_client import get_image_model
+
+
+def test_every_offered_image_size_is_priced_for_its_model():
+    for size in DALLE_IMAGE_SIZES:
+        assert size in MODEL_PRICES[get_image_model(size)]
+
+
+def test_unpriced_size_is_logged():
+    session = create_session()
+    with use_session(session):
+        assert calculate_cost('dall-e-2', images=1, size='1792x1024') == 0
+    assert session['error_log'][0].message == "No price for dall-e-2 size 1792x1024"
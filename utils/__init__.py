@@ -4,24 +4,38 @@ Centralized utility functions and helpers
 """
 
 # Import all utility modules
+from .context import (
+    Session,
+    MemorySession,
+    StreamlitSession,
+    get_session,
+    use_session,
+    with_session,
+    mark_dirty
+)
+
 from .cache_utils import (
     generate_cache_key,
     get_from_cache,
     save_to_cache,
+    get_cached_usage,
     clear_cache,
     get_cache_stats
 )
 
 from .rate_limiter import (
     RateLimiter,
+    SharedRateLimiter,
     rate_limiter,
     throttled_api_call,
+    acquire_request_slot,
     get_rate_limit_status
 )
 
 from .error_handler import (
     EtsyAIError,
     APIError,
+    TransientAPIError,
     ValidationError,
     CacheError,
     log_error,
@@ -39,54 +53,205 @@ from .analytics import (
     export_analytics_report,
     get_session_duration,
     get_feature_usage_stats,
-    get_recent_api_calls
+    get_current_step,
+    get_recent_api_calls,
+    set_current_step,
+    record_latency,
+    get_latency_percentiles
 )
 
 from .session_helpers import (
     init_session_state,
+    create_session,
     get_form_data,
     set_form_data,
+    set_form_values,
+    get_form_fingerprint,
     save_generated_content,
     get_generated_content,
+    delete_generated_content,
     should_regenerate,
+    get_user_id,
+    get_history_store,
+    get_history,
+    get_history_page,
     add_to_history,
     search_history,
     toggle_favorite,
     add_tag_to_entry,
+    delete_history_entry,
     get_content_types_from_history,
     format_timestamp,
     clear_session_data
 )
 
+from .session_store import (
+    SQLiteSession,
+    get_client_token,
+    restore_session_state,
+    persist_session_state,
+    load_deferred_key,
+    clear_persisted_session
+)
+
+from .memory_manager import (
+    estimate_size,
+    track_session_memory,
+    session_memory_lock,
+    enforce_memory_budget,
+    get_memory_report
+)
+
+from .metrics import (
+    registry,
+    start_metrics_server,
+    write_metrics_file,
+    start_metrics_exporter
+)
+
+from .usage import (
+    calculate_cost,
+    track_usage,
+    track_cache_savings,
+    get_listing_cost,
+    check_listing_budget,
+    get_usage_summary,
+    get_daily_usage
+)
+
+from .navigation import (
+    get_active_step,
+    set_active_step,
+    keep_widget_state
+)
+
+from .profiler import (
+    profile_rerun,
+    get_span_breakdown,
+    get_rerun_report,
+    reset_rerun_report
+)
+
+from .tracing import (
+    Span,
+    span,
+    traced,
+    get_current_span,
+    export_trace,
+    get_recent_traces,
+    clear_traces,
+    trace_session
+)
+
+from .jobs import (
+    Job,
+    JobManager,
+    get_job_manager,
+    submit_job,
+    get_pending_job,
+    get_session_jobs,
+    has_finished_jobs,
+    deliver_finished_jobs
+)
+
 from .api_client import (
     get_openai_client,
     call_openai,
+    submit_openai,
     generate_image,
+    submit_image,
     enhance_image
 )
 
+from .listing import (
+    parse_listing_core,
+    parse_titles,
+    parse_tags,
+    format_titles,
+    format_tags,
+    split_listing_core,
+    truncate_at_word,
+    listing_keywords,
+    is_valid_title,
+    repair_title,
+    normalize_tag,
+    repair_tags,
+    review_titles,
+    review_tags
+)
+
+from .image_utils import (
+    get_thumbnail,
+    get_full_image,
+    generate_thumbnails,
+    render_image_preview,
+    render_image_grid
+)
+
 # Export all for easy imports
 __all__ = [
+    # Session context
+    'Session', 'MemorySession', 'StreamlitSession', 'SQLiteSession', 'get_session', 'use_session', 'with_session',
+    'mark_dirty', 'create_session',
+    
     # Cache utils
-    'generate_cache_key', 'get_from_cache', 'save_to_cache', 'clear_cache', 'get_cache_stats',
+    'generate_cache_key', 'get_from_cache', 'save_to_cache', 'get_cached_usage', 'clear_cache', 'get_cache_stats',
     
     # Rate limiter
-    'RateLimiter', 'rate_limiter', 'throttled_api_call', 'get_rate_limit_status',
+    'RateLimiter', 'SharedRateLimiter', 'rate_limiter', 'throttled_api_call', 'acquire_request_slot', 'get_rate_limit_status',
     
     # Error handling
-    'EtsyAIError', 'APIError', 'ValidationError', 'CacheError',
+    'EtsyAIError', 'APIError', 'TransientAPIError', 'ValidationError', 'CacheError',
     'log_error', 'display_error', 'validate_input', 'handle_api_response', 'create_error_report',
     
     # Analytics
     'init_analytics', 'track_api_call', 'track_feature_usage', 'get_analytics_summary',
+    'set_current_step', 'get_current_step', 'record_latency', 'get_latency_percentiles',
     'export_analytics_report', 'get_session_duration', 'get_feature_usage_stats', 'get_recent_api_calls',
     
     # Session helpers
-    'init_session_state', 'get_form_data', 'set_form_data', 'save_generated_content',
-    'get_generated_content', 'should_regenerate', 'add_to_history', 'search_history',
-    'toggle_favorite', 'add_tag_to_entry', 'get_content_types_from_history', 'format_timestamp',
+    'init_session_state', 'get_form_data', 'set_form_data', 'set_form_values', 'get_form_fingerprint', 'save_generated_content',
+    'get_generated_content', 'delete_generated_content', 'should_regenerate', 'get_user_id', 'get_history_store', 'get_history',
+    'get_history_page',
+    'add_to_history', 'search_history', 'toggle_favorite', 'add_tag_to_entry', 'delete_history_entry', 'get_content_types_from_history', 'format_timestamp',
     'clear_session_data',
     
+    # Session persistence
+    'get_client_token', 'restore_session_state', 'persist_session_state', 'load_deferred_key',
+    'clear_persisted_session',
+    
+    # Memory accounting
+    'estimate_size', 'track_session_memory', 'session_memory_lock', 'enforce_memory_budget', 'get_memory_report',
+    
+    # Process metrics
+    'registry', 'start_metrics_server', 'write_metrics_file', 'start_metrics_exporter',
+    
+    # Token usage and cost
+    'calculate_cost', 'track_usage', 'track_cache_savings', 'get_listing_cost', 'check_listing_budget',
+    'get_usage_summary', 'get_daily_usage',
+    
+    # Step navigation
+    'get_active_step', 'set_active_step', 'keep_widget_state',
+    
+    # Rerun profiler
+    'profile_rerun', 'get_span_breakdown', 'get_rerun_report', 'reset_rerun_report',
+    
+    # Tracing
+    'Span', 'span', 'traced', 'get_current_span', 'export_trace', 'get_recent_traces', 'clear_traces',
+    'trace_session',
+    
+    # Background jobs
+    'Job', 'JobManager', 'get_job_manager', 'submit_job', 'get_pending_job', 'get_session_jobs',
+    'has_finished_jobs', 'deliver_finished_jobs',
+    
     # API client
-    'get_openai_client', 'call_openai', 'generate_image', 'enhance_image'
+    'get_openai_client', 'call_openai', 'submit_openai', 'generate_image', 'submit_image', 'enhance_image',
+    
+    # Listing content
+    'parse_listing_core', 'parse_titles', 'parse_tags', 'format_titles', 'format_tags', 'split_listing_core',
+    'truncate_at_word', 'listing_keywords', 'is_valid_title', 'repair_title', 'normalize_tag', 'repair_tags',
+    'review_titles', 'review_tags',
+    
+    # Image previews
+    'get_thumbnail', 'get_full_image', 'generate_thumbnails', 'render_image_preview', 'render_image_grid'
 ] 
\ No newline at end of file
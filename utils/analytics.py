@@ -1,59 +1,118 @@
 """
 Analytics and logging utilities for Etsy AI Assistant
 """
-import streamlit as st
 import time
 import json
+from collections import deque
+from contextvars import ContextVar
+from itertools import islice
+from config.settings import MAX_API_CALL_HISTORY
+from .context import get_session, mark_dirty
+from .histogram import LatencyHistogram
+from .metrics import API_CALLS, API_LATENCY, FEATURE_USAGE
+from .records import ApiCallRecord
+
+
+_current_step = ContextVar('current_step', default=None)
 
 
 def init_analytics():
     """Initialize analytics system"""
-    if 'analytics' not in st.session_state:
-        st.session_state['analytics'] = {
+    session = get_session()
+    if 'analytics' not in session:
+        session['analytics'] = {
             'session_start': time.time(),
             'page_views': 0,
-            'api_calls': [],
+            'api_calls': deque(maxlen=MAX_API_CALL_HISTORY),
             'feature_usage': {},
-            'performance_metrics': []
+            'performance_metrics': [],
+            'latency': {},
+            'totals': {'calls': 0, 'successful': 0, 'successful_duration': 0.0}
         }
+        mark_dirty('analytics')
 
 
-def track_api_call(endpoint, duration, success=True):
-    """Track API call performance"""
-    if 'analytics' not in st.session_state:
+def _get_analytics():
+    """Get the analytics dict, filling in keys missing from older sessions"""
+    session = get_session()
+    if 'analytics' not in session:
         init_analytics()
+    analytics_data = session['analytics']
+    analytics_data.setdefault('latency', {})
+    analytics_data.setdefault('totals', {'calls': 0, 'successful': 0, 'successful_duration': 0.0})
+    return analytics_data
+
+
+def set_current_step(step):
+    """Attribute latencies recorded from now on to a workflow step (None to stop)"""
+    _current_step.set(step)
+
+
+def get_current_step():
+    """Get the workflow step latencies and usage are currently attributed to"""
+    return _current_step.get()
+
+
+def record_latency(endpoint, duration, outcome=None):
+    """Record a duration in the session histograms (endpoint and step) and the process metrics"""
+    latency = _get_analytics()['latency']
+    names = [f"{endpoint}:{outcome}" if outcome else endpoint]
+    step = _current_step.get()
+    if step is not None:
+        names.append(f"step_{step}")
     
-    call_data = {
-        'timestamp': time.time(),
-        'endpoint': endpoint,
-        'duration': duration,
-        'success': success
-    }
-    st.session_state['analytics']['api_calls'].append(call_data)
+    metric_labels = {'endpoint': endpoint, 'step': step or 'none', 'outcome': outcome or 'ok'}
+    API_CALLS.inc(**metric_labels)
+    API_LATENCY.observe(duration, **metric_labels)
     
-    # Keep only last 50 API calls
-    if len(st.session_state['analytics']['api_calls']) > 50:
-        st.session_state['analytics']['api_calls'] = st.session_state['analytics']['api_calls'][-50:]
+    for histogram_name in names:
+        histogram = latency.get(histogram_name)
+        if histogram is None:
+            histogram = latency[histogram_name] = LatencyHistogram()
+        histogram.record(duration)
+    mark_dirty('analytics')
+
+
+def track_api_call(endpoint, duration, success=True, outcome=None):
+    """Track API call performance"""
+    analytics_data = _get_analytics()
+    
+    # Ring buffer drops the oldest call past MAX_API_CALL_HISTORY
+    analytics_data['api_calls'].append(
+        ApiCallRecord(time.time(), endpoint, duration, success)
+    )
+    
+    totals = analytics_data['totals']
+    totals['calls'] += 1
+    if success:
+        totals['successful'] += 1
+        totals['successful_duration'] += duration
+    
+    record_latency(endpoint, duration, outcome if success else 'error')
 
 
 def track_feature_usage(feature_name):
     """Track feature usage"""
-    if 'analytics' not in st.session_state:
+    session = get_session()
+    if 'analytics' not in session:
         init_analytics()
     
-    current_count = st.session_state['analytics']['feature_usage'].get(feature_name, 0)
-    st.session_state['analytics']['feature_usage'][feature_name] = current_count + 1
+    FEATURE_USAGE.inc(feature=feature_name)
+    current_count = session['analytics']['feature_usage'].get(feature_name, 0)
+    session['analytics']['feature_usage'][feature_name] = current_count + 1
+    mark_dirty('analytics')
 
 
 def get_analytics_summary():
     """Get analytics summary"""
-    if 'analytics' not in st.session_state:
+    if 'analytics' not in get_session():
         return None
     
-    analytics_data = st.session_state['analytics']
-    api_calls = analytics_data['api_calls']
+    analytics_data = _get_analytics()
+    totals = analytics_data['totals']
     
-    if not api_calls:
+    # Running totals cover the whole session, not just the calls still in the ring buffer
+    if not totals['calls']:
         return {
             'session_duration': (time.time() - analytics_data['session_start']) / 60,
             'total_api_calls': 0,
@@ -62,27 +121,47 @@ def get_analytics_summary():
             'most_used_feature': 'None'
         }
     
-    successful_calls = [call for call in api_calls if call['success']]
-    durations = [call['duration'] for call in successful_calls]
-    
     feature_usage = analytics_data['feature_usage']
     most_used = max(feature_usage.items(), key=lambda x: x[1]) if feature_usage else ('None', 0)
     
     return {
         'session_duration': (time.time() - analytics_data['session_start']) / 60,
-        'total_api_calls': len(api_calls),
-        'avg_response_time': sum(durations) / len(durations) if durations else 0,
-        'success_rate': (len(successful_calls) / len(api_calls)) * 100,
+        'total_api_calls': totals['calls'],
+        'avg_response_time': totals['successful_duration'] / totals['successful'] if totals['successful'] else 0,
+        'success_rate': (totals['successful'] / totals['calls']) * 100,
         'most_used_feature': most_used[0]
     }
 
 
+def get_latency_percentiles(*names, percents=(50, 95, 99)):
+    """Get percentiles across the named histograms merged together, None if nothing recorded"""
+    latency = _get_analytics()['latency']
+    histograms = [latency[name] for name in names if name in latency]
+    if not histograms:
+        return None
+    
+    merged = histograms[0]
+    if len(histograms) > 1:
+        merged = LatencyHistogram()
+        for histogram in histograms:
+            merged.merge(histogram)
+    
+    result = merged.percentiles(percents)
+    result['count'] = merged.count
+    return result
+
+
 def export_analytics_report():
     """Export analytics data as JSON"""
-    if 'analytics' not in st.session_state:
+    session = get_session()
+    if 'analytics' not in session:
         return "{}"
     
-    analytics_data = st.session_state['analytics'].copy()
+    analytics_data = session['analytics'].copy()
+    analytics_data['api_calls'] = [call.to_dict() for call in analytics_data['api_calls']]
+    analytics_data['latency'] = {
+        name: histogram.to_dict() for name, histogram in analytics_data.get('latency', {}).items()
+    }
     analytics_data['exported_at'] = time.time()
     summary = get_analytics_summary()
     if summary:
@@ -93,23 +172,27 @@ def export_analytics_report():
 
 def get_session_duration():
     """Get current session duration in minutes"""
-    if 'analytics' not in st.session_state:
+    session = get_session()
+    if 'analytics' not in session:
         return 0
-    return (time.time() - st.session_state['analytics']['session_start']) / 60
+    return (time.time() - session['analytics']['session_start']) / 60
 
 
 def get_feature_usage_stats():
     """Get feature usage statistics"""
-    if 'analytics' not in st.session_state:
+    session = get_session()
+    if 'analytics' not in session:
         return {}
     
-    return st.session_state['analytics']['feature_usage']
+    return session['analytics']['feature_usage']
 
 
 def get_recent_api_calls(limit=10):
     """Get recent API calls"""
-    if 'analytics' not in st.session_state:
+    session = get_session()
+    if 'analytics' not in session:
         return []
     
-    api_calls = st.session_state['analytics']['api_calls']
-    return api_calls[-limit:] if api_calls else [] 
\ No newline at end of file
+    api_calls = session['analytics']['api_calls']
+    recent_calls = islice(api_calls, max(0, len(api_calls) - limit), None)
+    return [call.to_dict() for call in recent_calls] 
\ No newline at end of file
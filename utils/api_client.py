@@ -5,11 +5,23 @@ import streamlit as st
 from openai import OpenAI
 import os
 import time
-from .error_handler import ValidationError, APIError, validate_input, handle_api_response, log_error, display_error
-from .cache_utils import generate_cache_key, get_from_cache, save_to_cache
-from .rate_limiter import throttled_api_call
-from .analytics import track_api_call
+from config.settings import DALLE_MODEL, DALLE_SIZE_MODELS
+from .error_handler import ValidationError, APIError, TransientAPIError, validate_input, handle_api_response, log_error, display_error
+from .context import with_session
+from .cache_utils import generate_cache_key, get_from_cache, save_to_cache, get_cached_usage
+from .rate_limiter import throttled_api_call, acquire_request_slot
+from .analytics import track_api_call, record_latency
 from .session_helpers import add_to_history
+from .tracing import span, traced
+from .usage import extract_usage, track_usage, track_cache_savings, check_listing_budget
+from .jobs import submit_job
+
+
+# Exception types from the OpenAI client a retry may get past (5xx status codes count too)
+TRANSIENT_ERROR_TYPES = {
+    'RateLimitError', 'APITimeoutError', 'APIConnectionError', 'InternalServerError',
+    'Timeout', 'TimeoutError', 'ConnectionError'
+}
 
 
 # Initialize OpenAI client
@@ -19,129 +31,279 @@ def get_openai_client():
     return OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
 
-def call_openai(system_prompt, user_prompt, max_tokens=800, use_cache=True):
-    """Enhanced OpenAI API call with comprehensive error handling"""
-    try:
-        # Input validation
+def _prepare_chat_call(system_prompt, user_prompt, max_tokens, use_cache):
+    """Validate a chat call and look it up in the cache; returns (cache_key, cached_response)"""
+    # Input validation
+    with span("validation"):
         validate_input(system_prompt, 'required', 'System prompt')
         validate_input(user_prompt, 'required', 'User prompt')
         validate_input(system_prompt, 'max_length', 'System prompt')
         validate_input(user_prompt, 'max_length', 'User prompt')
-        
-        client = get_openai_client()
-        
-        if use_cache:
+    
+    cache_key = None
+    if use_cache:
+        with span("cache_lookup") as lookup:
             cache_key = generate_cache_key(system_prompt, user_prompt, max_tokens)
             cached_response = get_from_cache(cache_key)
-            if cached_response:
-                return cached_response
-        
-        # API call with retry logic
-        def _make_api_call():
-            response = client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                max_tokens=max_tokens,
-                temperature=0.7
-            )
-            return handle_api_response(response, 'text')
+            lookup.set_attribute("hit", bool(cached_response))
+        if cached_response:
+            record_latency("openai_chat", lookup.duration, "cache_hit")
+            track_cache_savings(get_cached_usage(cache_key))
+            return cache_key, cached_response
+    
+    check_listing_budget()
+    return cache_key, None
+
+
+def _chat_request(client, system_prompt, user_prompt, max_tokens):
+    """Send a chat completion request; touches no session state, so it can run on a job thread"""
+    with span("network", model="gpt-3.5-turbo", max_tokens=max_tokens):
+        return client.chat.completions.create(
+            model="gpt-3.5-turbo",
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            max_tokens=max_tokens,
+            temperature=0.7
+        )
+
+
+def _finish_chat_call(system_prompt, user_prompt, max_tokens, response, duration, cache_key, validate=None,
+                      content_type='ai_generation'):
+    """Account, parse, validate, cache and record a chat completion response"""
+    # Billed even if the response turns out to be unusable
+    usage = track_usage("gpt-3.5-turbo", *extract_usage(response))
+    with span("parse"):
+        result = handle_api_response(response, 'text')
+    
+    # A response failing validation counts as a failed call and is never cached
+    validation_error = None
+    if result and validate:
+        try:
+            validate(result)
+        except ValidationError as e:
+            validation_error, result = e, None
+    
+    # Track API call analytics
+    track_api_call("openai_chat", duration, success=bool(result),
+                   outcome="cache_miss" if cache_key else "uncached")
+    
+    if cache_key and result:
+        with span("cache_store"):
+            save_to_cache(cache_key, result, usage)
+    
+    if validation_error:
+        raise validation_error
+    
+    # Add to history
+    add_to_history(
+        content_type=content_type,
+        content=result,
+        prompt_used=f"System: {system_prompt[:100]}...\nUser: {user_prompt[:100]}...",
+        metadata={'max_tokens': max_tokens, 'model': 'gpt-3.5-turbo', 'usage': usage}
+    )
+    
+    return result
+
+
+def _to_api_error(e):
+    """Convert a client exception to TransientAPIError if a retry may get past it, otherwise APIError"""
+    status_code = getattr(e, 'status_code', None)
+    transient = type(e).__name__ in TRANSIENT_ERROR_TYPES or bool(status_code and status_code >= 500)
+    return (TransientAPIError if transient else APIError)(
+        f"API call failed: {str(e)}",
+        context={'original_error': str(e), 'error_type': type(e).__name__, 'status_code': status_code}
+    )
+
+
+def _handle_chat_error(e, system_prompt, user_prompt, max_tokens):
+    """Log and display a failed chat call; returns it as an EtsyAIError"""
+    if isinstance(e, ValidationError):
+        log_error(e, {'system_prompt_length': len(system_prompt), 'user_prompt_length': len(user_prompt)})
+        display_error(e)
+    elif isinstance(e, APIError):
+        log_error(e, {'model': 'gpt-3.5-turbo', 'max_tokens': max_tokens, 'error_code': e.error_code})
+        display_error(e, show_details=True)
+    else:
+        # Convert generic errors to APIError
+        e = _to_api_error(e)
+        log_error(e, e.context)
+        display_error(e, show_details=True)
+    return e
+
+
+@with_session
+@traced()
+def call_openai(system_prompt, user_prompt, max_tokens=800, use_cache=True, validate=None, content_type='ai_generation',
+                raise_errors=False):
+    """Enhanced OpenAI API call with comprehensive error handling; validate(result) may raise ValidationError
+
+    Failures are logged and return None, or with raise_errors are raised as an EtsyAIError
+    (TransientAPIError when a retry may get past them).
+    """
+    try:
+        cache_key, cached_response = _prepare_chat_call(system_prompt, user_prompt, max_tokens, use_cache)
+        if cached_response:
+            return cached_response
         
         # Use throttled API call with rate limiting and track performance
         start_time = time.time()
-        result = throttled_api_call(_make_api_call)
+        response = throttled_api_call(_chat_request, get_openai_client(), system_prompt, user_prompt, max_tokens)
         duration = time.time() - start_time
         
-        # Track API call analytics
-        track_api_call("openai_chat", duration, success=bool(result))
-        
-        if use_cache and result:
-            save_to_cache(cache_key, result)
-        
-        # Add to history
-        add_to_history(
-            content_type="ai_generation",
-            content=result,
-            prompt_used=f"System: {system_prompt[:100]}...\nUser: {user_prompt[:100]}...",
-            metadata={'max_tokens': max_tokens, 'model': 'gpt-3.5-turbo'}
-        )
-        
+        result = _finish_chat_call(system_prompt, user_prompt, max_tokens, response, duration, cache_key, validate,
+                                   content_type)
+        if not result and raise_errors:
+            raise TransientAPIError("Empty response from API")
         return result
         
-    except ValidationError as e:
-        log_error(e, {'system_prompt_length': len(system_prompt), 'user_prompt_length': len(user_prompt)})
-        display_error(e)
-        return None
-        
-    except APIError as e:
-        log_error(e, {'model': 'gpt-3.5-turbo', 'max_tokens': max_tokens})
-        display_error(e, show_details=True)
+    except Exception as e:
+        error = _handle_chat_error(e, system_prompt, user_prompt, max_tokens)
+        if raise_errors:
+            raise error
         return None
+
+
+@with_session
+@traced()
+def submit_openai(content_type, system_prompt, user_prompt, max_tokens=800, metadata=None, use_cache=True, validate=None):
+    """Start call_openai as a background job; returns a cached result right away, otherwise None"""
+    try:
+        cache_key, cached_response = _prepare_chat_call(system_prompt, user_prompt, max_tokens, use_cache)
+        if cached_response:
+            return cached_response
         
+        client = get_openai_client()
+        acquire_request_slot()
     except Exception as e:
-        # Convert generic errors to APIError
-        api_error = APIError(f"API call failed: {str(e)}")
-        log_error(api_error, {'original_error': str(e), 'error_type': type(e).__name__})
-        display_error(api_error, show_details=True)
+        _handle_chat_error(e, system_prompt, user_prompt, max_tokens)
         return None
+    
+    def finish(job):
+        try:
+            if job.error is not None:
+                raise job.error
+            return _finish_chat_call(system_prompt, user_prompt, max_tokens, job.response, job.duration, cache_key,
+                                     validate, content_type)
+        except Exception as e:
+            _handle_chat_error(e, system_prompt, user_prompt, max_tokens)
+            return None
+    
+    submit_job(content_type, lambda: _chat_request(client, system_prompt, user_prompt, max_tokens), finish, metadata)
+    return None
+
+
+def get_image_model(size):
+    """Get the image model that generates a size (DALLE_MODEL unless it does not offer the size)"""
+    return DALLE_SIZE_MODELS.get(size, DALLE_MODEL)
+
+
+def _image_request(client, prompt, size):
+    """Send an image generation request; touches no session state, so it can run on a job thread"""
+    model = get_image_model(size)
+    with span("network", model=model, size=size):
+        return client.images.generate(
+            model=model,
+            prompt=prompt,
+            size=size,
+            n=1
+        )
+
+
+def _finish_image_call(response, duration, size):
+    """Parse and account an image generation response"""
+    with span("parse"):
+        result = handle_api_response(response, 'image')
+    
+    track_api_call("dalle_image", duration, success=bool(result))
+    track_usage(get_image_model(size), images=1, size=size)
+    
+    return result
+
 
+def _handle_image_error(e, prompt, size):
+    """Log and display a failed image generation"""
+    api_error = APIError(f"Image generation failed: {str(e)}", error_code=getattr(e, 'error_code', None))
+    log_error(api_error, {'prompt': prompt[:100], 'size': size})
+    display_error(api_error, show_details=True)
 
+
+@with_session
+@traced()
 def generate_image(prompt, size="1024x1024"):
     """Generate image using DALL-E 2"""
     try:
         client = get_openai_client()
-        
-        def _make_image_call():
-            response = client.images.generate(
-                model="dall-e-2",
-                prompt=prompt,
-                size=size,
-                n=1
-            )
-            return handle_api_response(response, 'image')
+        check_listing_budget()
         
         start_time = time.time()
-        result = throttled_api_call(_make_image_call)
+        response = throttled_api_call(_image_request, client, prompt, size)
         duration = time.time() - start_time
         
-        track_api_call("dalle_image", duration, success=bool(result))
-        
-        return result
+        return _finish_image_call(response, duration, size)
         
     except Exception as e:
-        api_error = APIError(f"Image generation failed: {str(e)}")
-        log_error(api_error, {'prompt': prompt[:100], 'size': size})
-        display_error(api_error, show_details=True)
+        _handle_image_error(e, prompt, size)
+        return None
+
+
+@with_session
+@traced()
+def submit_image(content_type, prompt, size="1024x1024", metadata=None):
+    """Start generate_image as a background job; always returns None, the image arrives on delivery"""
+    try:
+        client = get_openai_client()
+        check_listing_budget()
+        acquire_request_slot()
+    except Exception as e:
+        _handle_image_error(e, prompt, size)
         return None
+    
+    def finish(job):
+        try:
+            if job.error is not None:
+                raise job.error
+            return _finish_image_call(job.response, job.duration, size)
+        except Exception as e:
+            _handle_image_error(e, prompt, size)
+            return None
+    
+    submit_job(content_type, lambda: _image_request(client, prompt, size), finish, metadata)
+    return None
 
 
+@with_session
+@traced()
 def enhance_image(image_buffer, enhancement_prompt):
     """Enhance image using DALL-E 2 edit"""
     try:
         client = get_openai_client()
+        check_listing_budget()
         
         def _make_edit_call():
-            response = client.images.edit(
-                model="dall-e-2",
-                image=image_buffer,
-                prompt=enhancement_prompt,
-                size="1024x1024",
-                n=1
-            )
-            return handle_api_response(response, 'image')
+            with span("network", model="dall-e-2"):
+                response = client.images.edit(
+                    model="dall-e-2",
+                    image=image_buffer,
+                    prompt=enhancement_prompt,
+                    size="1024x1024",
+                    n=1
+                )
+            with span("parse"):
+                return handle_api_response(response, 'image')
         
         start_time = time.time()
         result = throttled_api_call(_make_edit_call)
         duration = time.time() - start_time
         
         track_api_call("dalle_edit", duration, success=bool(result))
+        track_usage("dall-e-2", images=1, size="1024x1024")
         
         return result
         
     except Exception as e:
-        api_error = APIError(f"Image enhancement failed: {str(e)}")
+        api_error = APIError(f"Image enhancement failed: {str(e)}", error_code=getattr(e, 'error_code', None))
         log_error(api_error, {'prompt': enhancement_prompt[:100]})
         display_error(api_error, show_details=True)
         return None 
\ No newline at end of file
@@ -0,0 +1,177 @@
+"""
+Background removal utilities for Etsy AI Assistant
+Prepares transparent-background PNGs for DTG print files
+"""
+import argparse
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+from PIL import Image
+from config.settings import (
+    BG_REMOVAL_TOLERANCE, BG_REMOVAL_SOFTNESS, BG_REMOVAL_FEATHER,
+    BG_REMOVAL_CORNER_PATCH, SUPPORTED_IMAGE_FORMATS
+)
+
+
+def estimate_background_color(rgb, patch=BG_REMOVAL_CORNER_PATCH):
+    """Estimate background color from the median of the four corner patches"""
+    height, width = rgb.shape[:2]
+    patch = max(1, min(patch, height // 2, width // 2))
+    corners = np.concatenate([
+        rgb[:patch, :patch].reshape(-1, 3),
+        rgb[:patch, -patch:].reshape(-1, 3),
+        rgb[-patch:, :patch].reshape(-1, 3),
+        rgb[-patch:, -patch:].reshape(-1, 3)
+    ])
+    return np.median(corners, axis=0)
+
+
+def color_distance(rgb, color):
+    """Euclidean RGB distance of every pixel to a color"""
+    diff = rgb - color.astype(np.float32)
+    return np.sqrt(np.einsum('ijk,ijk->ij', diff, diff))
+
+
+def _propagate_along_rows(reached, candidate):
+    """Spread reached pixels across each horizontal run of candidate pixels"""
+    width = candidate.shape[1]
+    flat_candidate = candidate.ravel()
+
+    # Label every horizontal run of candidate pixels, runs never cross rows
+    run_starts = flat_candidate.copy()
+    run_starts[1:] &= ~flat_candidate[:-1]
+    run_starts[::width] = flat_candidate[::width]
+    labels = np.cumsum(run_starts) * flat_candidate
+
+    hits = np.bincount(labels, weights=(reached.ravel() & flat_candidate), minlength=labels.max() + 1) > 0
+    hits[0] = False
+    return hits[labels].reshape(candidate.shape)
+
+
+def flood_fill_mask(candidate, seeds):
+    """Geodesic flood fill of seeds through candidate pixels (4-connected)"""
+    reached = seeds & candidate
+    candidate_t = np.ascontiguousarray(candidate.T)
+
+    # Alternate row and column run propagation; converges in one pass per path turn
+    while True:
+        expanded = _propagate_along_rows(reached, candidate)
+        expanded = _propagate_along_rows(np.ascontiguousarray(expanded.T), candidate_t).T
+        if np.array_equal(expanded, reached):
+            return reached
+        reached = expanded
+
+
+def _dilate(mask, radius):
+    """Square binary dilation using an integral image"""
+    if radius <= 0:
+        return mask
+    padded = np.pad(mask.astype(np.int32), radius + 1)
+    integral = padded.cumsum(axis=0).cumsum(axis=1)
+    size = 2 * radius + 1
+    window = (integral[size:, size:] - integral[:-size, size:]
+              - integral[size:, :-size] + integral[:-size, :-size])
+    return window[:mask.shape[0], :mask.shape[1]] > 0
+
+
+def remove_background(image, tolerance=BG_REMOVAL_TOLERANCE, softness=BG_REMOVAL_SOFTNESS,
+                      feather=BG_REMOVAL_FEATHER, patch=BG_REMOVAL_CORNER_PATCH):
+    """Remove a solid background connected to the image corners"""
+    rgba = np.asarray(image.convert('RGBA'), dtype=np.float32)
+    rgb = rgba[..., :3]
+    height, width = rgb.shape[:2]
+
+    background_color = estimate_background_color(rgb, patch)
+    distance = color_distance(rgb, background_color)
+    candidate = distance <= tolerance
+
+    seeds = np.zeros_like(candidate)
+    corner = max(1, min(patch, height // 2, width // 2))
+    seeds[:corner, :corner] = seeds[:corner, -corner:] = True
+    seeds[-corner:, :corner] = seeds[-corner:, -corner:] = True
+
+    background = flood_fill_mask(candidate, seeds)
+
+    # Feather: foreground pixels near the background get alpha from color distance
+    edge_band = _dilate(background, feather) & ~background
+    ramp = np.clip((distance - tolerance) / max(softness, 1), 0.0, 1.0)
+    alpha = np.where(background, 0.0, np.where(edge_band, ramp, 1.0)).astype(np.float32)
+
+    # Un-mix the background color from semi-transparent edge pixels to avoid halos
+    blend = alpha[..., None]
+    safe_blend = np.where(blend > 0, blend, 1.0)
+    unmixed = (rgb - (1.0 - blend) * background_color) / safe_blend
+    rgb_out = np.where(edge_band[..., None], unmixed, rgb)
+
+    output = np.empty((height, width, 4), dtype=np.uint8)
+    output[..., :3] = np.clip(rgb_out, 0, 255).astype(np.uint8)
+    output[..., 3] = np.clip(alpha * rgba[..., 3], 0, 255).astype(np.uint8)
+    return Image.fromarray(output, 'RGBA')
+
+
+def remove_background_bytes(image_bytes, **options):
+    """Remove background from encoded image bytes and return PNG bytes"""
+    result = remove_background(Image.open(io.BytesIO(image_bytes)), **options)
+    buffer = io.BytesIO()
+    result.save(buffer, format='PNG', optimize=True)
+    return buffer.getvalue()
+
+
+def remove_background_file(input_path, output_path, **options):
+    """Remove background from an image file and save a transparent PNG"""
+    with Image.open(input_path) as image:
+        result = remove_background(image, **options)
+    result.save(output_path, format='PNG', optimize=True)
+    return output_path
+
+
+def remove_background_batch(input_dir, output_dir, max_workers=None, **options):
+    """Process a folder of designs in parallel, returning (input, output, error) tuples"""
+    os.makedirs(output_dir, exist_ok=True)
+    extensions = tuple(f".{ext}" for ext in SUPPORTED_IMAGE_FORMATS)
+    input_files = sorted(
+        name for name in os.listdir(input_dir)
+        if name.lower().endswith(extensions)
+    )
+
+    results = []
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {}
+        for name in input_files:
+            input_path = os.path.join(input_dir, name)
+            output_path = os.path.join(output_dir, f"{os.path.splitext(name)[0]}.png")
+            futures[executor.submit(remove_background_file, input_path, output_path, **options)] = (input_path, output_path)
+
+        for future in as_completed(futures):
+            input_path, output_path = futures[future]
+            try:
+                future.result()
+                results.append((input_path, output_path, None))
+            except Exception as e:
+                results.append((input_path, None, str(e)))
+
+    return sorted(results)
+
+
+def main():
+    """Command line entry point for batch background removal"""
+    parser = argparse.ArgumentParser(description="Remove solid backgrounds from a folder of designs")
+    parser.add_argument('input_dir', help="Folder with PNG/JPEG designs")
+    parser.add_argument('output_dir', help="Folder for transparent PNG output")
+    parser.add_argument('--tolerance', type=float, default=BG_REMOVAL_TOLERANCE)
+    parser.add_argument('--softness', type=float, default=BG_REMOVAL_SOFTNESS)
+    parser.add_argument('--feather', type=int, default=BG_REMOVAL_FEATHER)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    results = remove_background_batch(
+        args.input_dir, args.output_dir, max_workers=args.workers,
+        tolerance=args.tolerance, softness=args.softness, feather=args.feather
+    )
+    for input_path, output_path, error in results:
+        print(f"❌ {input_path}: {error}" if error else f"✅ {input_path} -> {output_path}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
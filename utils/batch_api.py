@@ -0,0 +1,234 @@
+"""
+Batch API utilities for Etsy AI Assistant
+Packs chat requests into Batch API files, submits and polls them, and serves a local stand-in for offline runs
+"""
+import argparse
+import email
+import json
+import re
+import secrets
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from config.settings import (
+    OPENAI_MODEL, OPENAI_TEMPERATURE, BATCH_COMPLETION_WINDOW, BATCH_POLL_SECONDS, BATCH_STANDIN_PORT
+)
+from .api_client import get_openai_client
+
+
+BATCH_ENDPOINT = '/v1/chat/completions'
+FINISHED_BATCH_STATUSES = ('completed', 'failed', 'expired', 'cancelled')
+
+
+def build_batch_file(requests):
+    """Pack (custom_id, system_prompt, user_prompt, max_tokens) tuples into Batch API JSONL bytes"""
+    lines = []
+    for custom_id, system_prompt, user_prompt, max_tokens in requests:
+        lines.append(json.dumps({
+            'custom_id': custom_id,
+            'method': 'POST',
+            'url': BATCH_ENDPOINT,
+            'body': {
+                'model': OPENAI_MODEL,
+                'messages': [
+                    {'role': 'system', 'content': system_prompt},
+                    {'role': 'user', 'content': user_prompt}
+                ],
+                'max_tokens': max_tokens,
+                'temperature': OPENAI_TEMPERATURE
+            }
+        }, ensure_ascii=False))
+    return ('\n'.join(lines) + '\n').encode('utf-8')
+
+
+def submit_batch(requests, metadata=None, client=None):
+    """Upload a batch file of chat requests and start the batch; returns the batch id"""
+    client = client or get_openai_client()
+    batch_file = client.files.create(file=('batch.jsonl', build_batch_file(requests)), purpose='batch')
+    batch = client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint=BATCH_ENDPOINT,
+        completion_window=BATCH_COMPLETION_WINDOW,
+        metadata=metadata
+    )
+    return batch.id
+
+
+def wait_for_batch(batch_id, poll_seconds=BATCH_POLL_SECONDS, progress=None, client=None):
+    """Poll a batch until it finishes, calling progress(batch) after each check; returns the batch"""
+    client = client or get_openai_client()
+    while True:
+        batch = client.batches.retrieve(batch_id)
+        if progress:
+            progress(batch)
+        if batch.status in FINISHED_BATCH_STATUSES:
+            return batch
+        time.sleep(poll_seconds)
+
+
+def get_batch_results(batch, client=None):
+    """Map each custom id of a finished batch to (response body, error message)
+
+    Requests missing from the result (an expired or cancelled batch) are simply absent.
+    """
+    client = client or get_openai_client()
+    results = {}
+    for file_id in (batch.output_file_id, batch.error_file_id):
+        if not file_id:
+            continue
+        for line in client.files.content(file_id).text.splitlines():
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            response = item.get('response') or {}
+            body = response.get('body') or {}
+            if response.get('status_code') == 200:
+                results[item['custom_id']] = (body, None)
+            else:
+                error = item.get('error') or body.get('error') or {}
+                results[item['custom_id']] = (None, error.get('message') or f"batch request failed ({batch.status})")
+    return results
+
+
+def parse_batch_response(body):
+    """Get (content, prompt_tokens, completion_tokens) from a chat completion response body"""
+    content = body['choices'][0]['message']['content']
+    usage = body.get('usage') or {}
+    return content.strip() if content else None, usage.get('prompt_tokens', 0), usage.get('completion_tokens', 0)
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    """Offline stand-in for the Files and Batches endpoints; batches complete on their first status check"""
+    files = {}    # file id -> (metadata, content bytes)
+    batches = {}  # batch id -> batch object
+    lock = threading.Lock()
+
+    def _send_json(self, payload, status=200):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_body(self):
+        return self.rfile.read(int(self.headers.get('Content-Length', 0)))
+
+    def _store_file(self, content, filename, purpose):
+        file_id = f"file-{secrets.token_hex(12)}"
+        metadata = {
+            'id': file_id, 'object': 'file', 'bytes': len(content), 'created_at': int(time.time()),
+            'filename': filename, 'purpose': purpose, 'status': 'processed'
+        }
+        with self.lock:
+            self.files[file_id] = (metadata, content)
+        return metadata
+
+    def do_POST(self):
+        path = self.path.split('?')[0]
+        if path == '/v1/files':
+            message = email.message_from_bytes(
+                f"Content-Type: {self.headers['Content-Type']}\r\n\r\n".encode('utf-8') + self._read_body()
+            )
+            fields = {part.get_param('name', header='content-disposition'): part for part in message.get_payload()}
+            if 'file' not in fields:
+                self._send_json({'error': {'message': "missing file"}}, 400)
+                return
+            purpose = fields['purpose'].get_payload(decode=True).decode('utf-8') if 'purpose' in fields else 'batch'
+            self._send_json(self._store_file(
+                fields['file'].get_payload(decode=True), fields['file'].get_filename() or 'batch.jsonl', purpose
+            ))
+        elif path == '/v1/batches':
+            request = json.loads(self._read_body())
+            if request.get('input_file_id') not in self.files:
+                self._send_json({'error': {'message': "unknown input_file_id"}}, 404)
+                return
+            batch = {
+                'id': f"batch_{secrets.token_hex(12)}", 'object': 'batch', 'endpoint': request['endpoint'],
+                'input_file_id': request['input_file_id'], 'completion_window': request['completion_window'],
+                'status': 'validating', 'created_at': int(time.time()), 'output_file_id': None,
+                'error_file_id': None, 'metadata': request.get('metadata'),
+                'request_counts': {'total': 0, 'completed': 0, 'failed': 0}
+            }
+            with self.lock:
+                self.batches[batch['id']] = batch
+            self._send_json(batch)
+        else:
+            self.send_error(404)
+
+    def do_GET(self):
+        path = self.path.split('?')[0]
+        batch_match = re.fullmatch(r'/v1/batches/([\w-]+)', path)
+        content_match = re.fullmatch(r'/v1/files/([\w-]+)/content', path)
+        if batch_match and batch_match.group(1) in self.batches:
+            batch = self.batches[batch_match.group(1)]
+            if batch['status'] == 'validating':
+                self._complete(batch)
+            self._send_json(batch)
+        elif content_match and content_match.group(1) in self.files:
+            content = self.files[content_match.group(1)][1]
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/octet-stream')
+            self.send_header('Content-Length', str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+        else:
+            self.send_error(404)
+
+    def _complete(self, batch):
+        """Answer every request of a batch with a canned completion"""
+        lines = []
+        for line in self.files[batch['input_file_id']][1].decode('utf-8').splitlines():
+            if not line.strip():
+                continue
+            request = json.loads(line)
+            user_prompt = request['body']['messages'][-1]['content']
+            prompt_tokens = sum(len(message['content'].split()) for message in request['body']['messages'])
+            content = f"Stand-in response: {' '.join(user_prompt.split())[:200]}"
+            lines.append(json.dumps({
+                'id': f"batch_req_{secrets.token_hex(8)}",
+                'custom_id': request['custom_id'],
+                'response': {'status_code': 200, 'body': {
+                    'object': 'chat.completion',
+                    'model': request['body']['model'],
+                    'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': content}, 'finish_reason': 'stop'}],
+                    'usage': {'prompt_tokens': prompt_tokens, 'completion_tokens': len(content.split()),
+                              'total_tokens': prompt_tokens + len(content.split())}
+                }},
+                'error': None
+            }))
+        output = self._store_file(('\n'.join(lines) + '\n').encode('utf-8'), 'output.jsonl', 'batch_output')
+        batch.update(
+            status='completed', output_file_id=output['id'], completed_at=int(time.time()),
+            request_counts={'total': len(lines), 'completed': len(lines), 'failed': 0}
+        )
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_standin_server(port=BATCH_STANDIN_PORT, host='127.0.0.1'):
+    """Serve the Batch API stand-in from a daemon thread; point OPENAI_BASE_URL at http://host:port/v1"""
+    server = ThreadingHTTPServer((host, port), _StandInHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='batch-standin', daemon=True).start()
+    return server
+
+
+def main():
+    """Command line entry point for the offline Batch API stand-in"""
+    parser = argparse.ArgumentParser(description="Serve an offline stand-in for the OpenAI Files and Batches API")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=BATCH_STANDIN_PORT)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer((args.host, args.port), _StandInHandler)
+    print(f"✅ Batch API stand-in on http://{args.host}:{args.port}/v1 (set OPENAI_BASE_URL to use it)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
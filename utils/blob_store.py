@@ -0,0 +1,77 @@
+"""
+Blob storage utilities for Etsy AI Assistant
+Content-addressed, reference counted storage shared by cache, history and generated content
+"""
+import hashlib
+from .context import get_session, mark_dirty
+from .session_store import load_deferred_key
+
+
+def content_digest(content):
+    """Get the content address of a text or bytes blob"""
+    data = content.encode() if isinstance(content, str) else content
+    return hashlib.sha256(data).hexdigest()
+
+
+class BlobStore:
+    """Stores each distinct blob once; holders keep digests and references"""
+
+    def __init__(self):
+        self.blobs = {}  # digest -> [content, reference count]
+
+    def __len__(self):
+        return len(self.blobs)
+
+    def __contains__(self, digest):
+        return digest in self.blobs
+
+    def put(self, content):
+        """Store content (or add a reference to an identical blob) and return its digest"""
+        digest = content_digest(content)
+        blob = self.blobs.get(digest)
+        if blob is None:
+            self.blobs[digest] = [content, 1]
+        else:
+            blob[1] += 1
+        return digest
+
+    def get(self, digest, default=None):
+        """Get content by digest"""
+        blob = self.blobs.get(digest)
+        return blob[0] if blob is not None else default
+
+    def release(self, digest):
+        """Drop one reference, deleting the blob when none are left"""
+        blob = self.blobs.get(digest)
+        if blob is None:
+            return
+        blob[1] -= 1
+        if blob[1] <= 0:
+            del self.blobs[digest]
+
+    def get_reference_count(self, digest):
+        """Get number of holders referencing a blob"""
+        blob = self.blobs.get(digest)
+        return blob[1] if blob is not None else 0
+
+    def get_total_bytes(self):
+        """Get approximate size of stored content"""
+        return sum(len(blob[0]) for blob in self.blobs.values())
+
+    def clear(self):
+        """Remove all blobs"""
+        self.blobs.clear()
+
+
+def get_blob_store():
+    """Get the session blob store"""
+    session = get_session()
+    if 'blob_store' not in session and not load_deferred_key('blob_store'):
+        session['blob_store'] = BlobStore()
+        mark_dirty('blob_store')
+    return session['blob_store']
+
+
+def is_blob_content(content):
+    """Check whether content can be stored in the blob store"""
+    return isinstance(content, (str, bytes))
\ No newline at end of file
@@ -0,0 +1,432 @@
+"""
+Bulk generation utilities for Etsy AI Assistant
+Runs the step prompts for a CSV/JSONL catalog concurrently or through the Batch API, journaling each step so interrupted runs resume
+"""
+import argparse
+import csv
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from config.env_config import load_environment
+from config.prompts import PROMPTS, build_prompt, get_max_tokens
+from config.settings import (
+    BULK_CONCURRENCY, BULK_DEFAULT_STEPS, BULK_DEFAULT_OPTIONS,
+    BULK_MAX_RETRIES, BULK_RETRY_BACKOFF_SECONDS, BULK_JOURNAL_DB_PATH,
+    BATCH_MAX_REQUESTS, BATCH_POLL_SECONDS, OPENAI_MODEL, DEFAULT_LANGUAGE, SUPPORTED_LANGUAGES, PRODUCT_FORM_FIELDS
+)
+from .api_client import call_openai
+from .batch_api import submit_batch, wait_for_batch, get_batch_results, parse_batch_response
+from .cache_utils import generate_cache_key
+from .context import use_session
+from .error_handler import EtsyAIError, TransientAPIError
+from .history_db import get_database
+from .rate_limiter import SharedRateLimiter
+from .session_helpers import create_session
+from .usage import get_usage_summary, track_usage
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS bulk_steps (
+    run_id TEXT NOT NULL,
+    item_id TEXT NOT NULL,
+    step TEXT NOT NULL,
+    prompt_key TEXT NOT NULL,
+    status TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    cost REAL NOT NULL DEFAULT 0,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (run_id, item_id, step)
+);
+CREATE TABLE IF NOT EXISTS bulk_batches (
+    run_id TEXT NOT NULL,
+    batch_id TEXT NOT NULL,
+    submitted_at REAL NOT NULL,
+    PRIMARY KEY (run_id, batch_id)
+);
+"""
+
+
+class BulkJournal:
+    """Durable per-product, per-step progress of one bulk run, identified by its output path"""
+
+    def __init__(self, run_id, db_path=BULK_JOURNAL_DB_PATH):
+        self.run_id = run_id
+        self.db_path = db_path
+        self._entries = {}  # (item id, step) -> entry, loaded once so lookups cost no queries
+        for item_id, step, prompt_key, status, result, error, attempts, cost in self.db.execute(
+            "SELECT item_id, step, prompt_key, status, result, error, attempts, cost "
+            "FROM bulk_steps WHERE run_id = ?",
+            (run_id,)
+        ):
+            self._entries[(item_id, step)] = {
+                'prompt_key': prompt_key, 'status': status, 'result': result,
+                'error': error, 'attempts': attempts, 'cost': cost
+            }
+
+    @property
+    def db(self):
+        return get_database(self.db_path, SCHEMA)
+
+    def get_done(self, item_id, step, prompt_key):
+        """Get a finished step's entry, or None if it has to run (again)"""
+        entry = self._entries.get((item_id, step))
+        if entry and entry['status'] == 'done' and entry['prompt_key'] == prompt_key:
+            return entry
+        return None
+
+    def record(self, item_id, step, prompt_key, result=None, error=None, cost=0.0):
+        """Record the outcome of one step attempt; cost adds up across attempts"""
+        status = 'done' if result else 'failed'
+        previous = self._entries.get((item_id, step), {'attempts': 0, 'cost': 0.0})
+        self.db.execute(
+            "INSERT INTO bulk_steps (run_id, item_id, step, prompt_key, status, result, error, attempts, cost, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, 1, ?, ?) "
+            "ON CONFLICT (run_id, item_id, step) DO UPDATE SET "
+            "prompt_key = excluded.prompt_key, status = excluded.status, result = excluded.result, "
+            "error = excluded.error, attempts = attempts + 1, cost = cost + excluded.cost, updated_at = excluded.updated_at",
+            (self.run_id, item_id, step, prompt_key, status, result, error, cost, time.time())
+        )
+        self._entries[(item_id, step)] = {
+            'prompt_key': prompt_key, 'status': status, 'result': result, 'error': error,
+            'attempts': previous['attempts'] + 1, 'cost': previous['cost'] + cost
+        }
+
+    def get_entry(self, item_id, step):
+        """Get the latest entry of a step, or None if it never ran"""
+        return self._entries.get((item_id, step))
+
+    def get_open_batches(self):
+        """Get the ids of submitted batches whose results have not been applied yet"""
+        rows = self.db.execute(
+            "SELECT batch_id FROM bulk_batches WHERE run_id = ? ORDER BY submitted_at",
+            (self.run_id,)
+        )
+        return [row[0] for row in rows]
+
+    def add_batch(self, batch_id):
+        self.db.execute(
+            "INSERT OR IGNORE INTO bulk_batches (run_id, batch_id, submitted_at) VALUES (?, ?, ?)",
+            (self.run_id, batch_id, time.time())
+        )
+
+    def close_batch(self, batch_id):
+        self.db.execute("DELETE FROM bulk_batches WHERE run_id = ? AND batch_id = ?", (self.run_id, batch_id))
+
+    def clear(self):
+        """Forget this run's progress so it starts over"""
+        self.db.execute_many([
+            ("DELETE FROM bulk_steps WHERE run_id = ?", (self.run_id,)),
+            ("DELETE FROM bulk_batches WHERE run_id = ?", (self.run_id,))
+        ])
+        self._entries.clear()
+
+
+def read_products(path):
+    """Read product rows from a .csv or .jsonl file; each row needs at least product_description"""
+    with open(path, newline='', encoding='utf-8') as f:
+        if path.lower().endswith('.csv'):
+            rows = list(csv.DictReader(f))
+        else:
+            rows = [json.loads(line) for line in f if line.strip()]
+
+    products = []
+    for index, row in enumerate(rows, 1):
+        if not str(row.get('product_description') or '').strip():
+            raise ValueError(f"{path}: row {index} has no product_description")
+        row = dict(row)
+        row['id'] = str(row.get('id') or index)
+        products.append(row)
+    return products
+
+
+def _run_step(content_type, system_prompt, user_prompt, max_tokens):
+    """Call the API for one step, retrying transient failures with exponential backoff; returns (result, error)
+
+    Validation failures and the app's own APIErrors (such as budget_exceeded) are final at once.
+    """
+    for attempt in range(BULK_MAX_RETRIES + 1):
+        if attempt:
+            time.sleep(BULK_RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1) * random.uniform(0.8, 1.2))
+        try:
+            return call_openai(system_prompt, user_prompt, max_tokens=max_tokens, content_type=content_type,
+                               raise_errors=True), None
+        except TransientAPIError as e:
+            error = e
+        except EtsyAIError as e:
+            return None, e.message
+
+    return None, error.message
+
+
+def prepare_product(product, steps, language=DEFAULT_LANGUAGE):
+    """Build a product's step prompts; returns (form_data, {step: (system, user, max_tokens, prompt_key)}, errors)"""
+    form_data = {field: str(product.get(field) or '').strip() for field in PRODUCT_FORM_FIELDS}
+
+    # Columns other than the form fields fill step options such as num_titles or budget
+    options = dict(BULK_DEFAULT_OPTIONS)
+    options.update((key, value) for key, value in product.items() if key not in PRODUCT_FORM_FIELDS and key != 'id')
+
+    prompts, errors = {}, {}
+    for content_type in steps:
+        try:
+            system_prompt, user_prompt = build_prompt(content_type, language, form_data, **options)
+        except KeyError as e:
+            errors[content_type] = f"missing column {e.args[0]}"
+            continue
+        max_tokens = get_max_tokens(content_type)
+        prompts[content_type] = (system_prompt, user_prompt, max_tokens,
+                                 generate_cache_key(system_prompt, user_prompt, max_tokens))
+    return form_data, prompts, errors
+
+
+def generate_product(product, steps, language=DEFAULT_LANGUAGE, limiter=None, journal=None):
+    """Run the given steps for one product in its own headless session; returns its output record
+
+    Steps the journal already has a result for, with the same prompt, are reused instead of called again.
+    """
+    form_data, prompts, errors = prepare_product(product, steps, language)
+    # Bulk sessions are thrown away, so their history must not land in the shared history database
+    session = create_session(history_backend='memory')
+    session['language'] = language
+    session['form_data'] = form_data
+    if limiter is not None:
+        session['shared_rate_limiter'] = limiter
+
+    record = {'id': product['id'], **form_data, 'results': {}, 'errors': errors, 'cost_usd': 0.0, 'resumed': 0}
+    start = time.perf_counter()
+    with use_session(session):
+        for content_type, (system_prompt, user_prompt, max_tokens, prompt_key) in prompts.items():
+            entry = journal.get_done(product['id'], content_type, prompt_key) if journal else None
+            if entry:
+                record['results'][content_type] = entry['result']
+                record['cost_usd'] += entry['cost']
+                record['resumed'] += 1
+                continue
+
+            cost_before = get_usage_summary()['total']['cost']
+            result, error = _run_step(content_type, system_prompt, user_prompt, max_tokens)
+            cost = get_usage_summary()['total']['cost'] - cost_before
+            record['cost_usd'] += cost
+            if result:
+                record['results'][content_type] = result
+            else:
+                record['errors'][content_type] = error
+            if journal:
+                journal.record(product['id'], content_type, prompt_key, result, error, cost)
+
+    record['cost_usd'] = round(record['cost_usd'], 6)
+    record['duration'] = round(time.perf_counter() - start, 3)
+    return record
+
+
+class BulkWriter:
+    """Appends output records to a .jsonl or .csv file, flushing after each one"""
+
+    def __init__(self, path, steps):
+        self.steps = steps
+        self.is_csv = path.lower().endswith('.csv')
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, 'w', newline='', encoding='utf-8')
+        if self.is_csv:
+            self._csv = csv.writer(self._file)
+            self._csv.writerow(['id', *PRODUCT_FORM_FIELDS, *steps, 'cost_usd', 'errors'])
+
+    def write(self, record):
+        if self.is_csv:
+            self._csv.writerow([
+                record['id'],
+                *(record[field] for field in PRODUCT_FORM_FIELDS),
+                *(record['results'].get(step, '') for step in self.steps),
+                record['cost_usd'],
+                json.dumps(record['errors'], ensure_ascii=False) if record['errors'] else ''
+            ])
+        else:
+            self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+def run_bulk(products, steps, output_path, concurrency=BULK_CONCURRENCY, language=DEFAULT_LANGUAGE,
+             progress=None, resume=True):
+    """Generate all products with `concurrency` workers under one shared rate limit; returns a summary
+
+    Progress is journaled per product and step under the output path, so running again after an
+    interruption only pays for the steps that had not finished. The output file is rewritten in full,
+    finished products coming straight from the journal.
+    """
+    limiter = SharedRateLimiter()
+    journal = BulkJournal(os.path.abspath(output_path))
+    if not resume:
+        journal.clear()
+    writer = BulkWriter(output_path, steps)
+    summary = {'products': len(products), 'succeeded': 0, 'failed': 0, 'resumed_steps': 0, 'cost_usd': 0.0}
+    start = time.perf_counter()
+
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='bulk') as executor:
+            futures = [executor.submit(generate_product, product, steps, language, limiter, journal) for product in products]
+            for done, future in enumerate(as_completed(futures), 1):
+                record = future.result()
+                writer.write(record)
+                summary['failed' if record['errors'] else 'succeeded'] += 1
+                summary['resumed_steps'] += record['resumed']
+                summary['cost_usd'] += record['cost_usd']
+                if progress:
+                    progress(done, len(products), record, time.perf_counter() - start)
+    finally:
+        writer.close()
+
+    summary['duration'] = time.perf_counter() - start
+    return summary
+
+
+def _apply_batch(batch_id, prepared, journal, poll_seconds, batch_progress):
+    """Wait for a batch and journal its results against the prepared prompts"""
+    batch = wait_for_batch(batch_id, poll_seconds, progress=batch_progress)
+    for custom_id, (body, error) in get_batch_results(batch).items():
+        item_id, content_type = custom_id.rsplit('/', 1)
+        prompts = prepared[item_id][1] if item_id in prepared else {}
+        if content_type not in prompts:
+            continue
+        result, cost = None, 0.0
+        if body:
+            result, prompt_tokens, completion_tokens = parse_batch_response(body)
+            cost = track_usage(OPENAI_MODEL, prompt_tokens, completion_tokens, batch=True)['cost']
+            error = None if result else "empty response"
+        journal.record(item_id, content_type, prompts[content_type][3], result, error, cost)
+    journal.close_batch(batch_id)
+
+
+def run_bulk_batch(products, steps, output_path, language=DEFAULT_LANGUAGE, progress=None, resume=True,
+                   poll_seconds=BATCH_POLL_SECONDS, batch_progress=None):
+    """Generate all products through the Batch API at batch prices, outside the interactive rate limit
+
+    Unfinished steps are packed into batches of up to BATCH_MAX_REQUESTS requests, submitted and polled;
+    results are mapped back to products and steps through the journal. Batches submitted before an
+    interruption are collected instead of resubmitted, and failed steps are resubmitted on the next run.
+    """
+    journal = BulkJournal(os.path.abspath(output_path))
+    if not resume:
+        journal.clear()
+    start = time.perf_counter()
+
+    prepared = {}
+    for product in products:
+        form_data, prompts, errors = prepare_product(product, steps, language)
+        resumed = sum(1 for content_type, prompt in prompts.items()
+                      if journal.get_done(product['id'], content_type, prompt[3]))
+        prepared[product['id']] = (form_data, prompts, errors, resumed)
+
+    # Batch usage is accounted like interactive usage, at the batch price
+    with use_session(create_session(history_backend='memory')):
+        for batch_id in journal.get_open_batches():
+            _apply_batch(batch_id, prepared, journal, poll_seconds, batch_progress)
+
+        pending = [
+            (f"{item_id}/{content_type}", system_prompt, user_prompt, max_tokens)
+            for item_id, (_, prompts, _, _) in prepared.items()
+            for content_type, (system_prompt, user_prompt, max_tokens, prompt_key) in prompts.items()
+            if not journal.get_done(item_id, content_type, prompt_key)
+        ]
+        batch_ids = []
+        for offset in range(0, len(pending), BATCH_MAX_REQUESTS):
+            batch_id = submit_batch(pending[offset:offset + BATCH_MAX_REQUESTS],
+                                    metadata={'output': os.path.basename(output_path)})
+            journal.add_batch(batch_id)
+            batch_ids.append(batch_id)
+        for batch_id in batch_ids:
+            _apply_batch(batch_id, prepared, journal, poll_seconds, batch_progress)
+
+    writer = BulkWriter(output_path, steps)
+    summary = {'products': len(products), 'succeeded': 0, 'failed': 0, 'resumed_steps': 0, 'cost_usd': 0.0}
+    try:
+        for done, product in enumerate(products, 1):
+            form_data, prompts, errors, resumed = prepared[product['id']]
+            record = {'id': product['id'], **form_data, 'results': {}, 'errors': errors, 'cost_usd': 0.0,
+                      'resumed': resumed, 'duration': 0.0}
+            for content_type, (_, _, _, prompt_key) in prompts.items():
+                entry = journal.get_done(product['id'], content_type, prompt_key)
+                if entry:
+                    record['results'][content_type] = entry['result']
+                    record['cost_usd'] += entry['cost']
+                else:
+                    entry = journal.get_entry(product['id'], content_type)
+                    record['errors'][content_type] = entry['error'] if entry else "not completed by the batch"
+            record['cost_usd'] = round(record['cost_usd'], 6)
+            writer.write(record)
+            summary['failed' if record['errors'] else 'succeeded'] += 1
+            summary['resumed_steps'] += resumed
+            summary['cost_usd'] += record['cost_usd']
+            if progress:
+                progress(done, len(products), record, time.perf_counter() - start)
+    finally:
+        writer.close()
+
+    summary['duration'] = time.perf_counter() - start
+    return summary
+
+
+def _print_batch_progress(batch):
+    counts = batch.request_counts
+    done = f" {counts.completed + counts.failed}/{counts.total}" if counts and counts.total else ""
+    print(f"⏳ {batch.id}: {batch.status}{done}", file=sys.stderr)
+
+
+def _print_progress(done, total, record, elapsed):
+    status = f"❌ {', '.join(record['errors'])}" if record['errors'] else "✅"
+    if record['resumed']:
+        status += f" ({record['resumed']} resumed)"
+    eta = elapsed / done * (total - done)
+    print(f"[{done}/{total}] {record['id']} {status} · ${record['cost_usd']:.4f} · "
+          f"{record['duration']:.1f}s · ETA {eta:.0f}s", file=sys.stderr)
+
+
+def main():
+    """Command line entry point for bulk catalog generation"""
+    parser = argparse.ArgumentParser(description="Generate listing content for a catalog of products")
+    parser.add_argument('input', help="CSV or JSONL with product_description, product_category, target_audience, design_theme")
+    parser.add_argument('output', help="Output .jsonl or .csv, written as each product completes")
+    parser.add_argument('--steps', default=','.join(BULK_DEFAULT_STEPS),
+                        help=f"Comma-separated content types: {', '.join(PROMPTS)}")
+    parser.add_argument('--concurrency', type=int, default=BULK_CONCURRENCY)
+    parser.add_argument('--backend', choices=('api', 'batch'), default='api',
+                        help="'batch' submits through the Batch API: about half the cost, results within 24h")
+    parser.add_argument('--language', choices=SUPPORTED_LANGUAGES, default=DEFAULT_LANGUAGE)
+    parser.add_argument('--restart', action='store_true',
+                        help="Discard the progress of an earlier run with this output instead of resuming it")
+    args = parser.parse_args()
+
+    steps = [step.strip() for step in args.steps.split(',') if step.strip()]
+    unknown = [step for step in steps if step not in PROMPTS]
+    if unknown:
+        parser.error(f"unknown steps: {', '.join(unknown)}")
+
+    load_environment()
+    products = read_products(args.input)
+    if args.backend == 'batch':
+        summary = run_bulk_batch(
+            products, steps, args.output, language=args.language, progress=_print_progress,
+            resume=not args.restart, batch_progress=_print_batch_progress
+        )
+    else:
+        summary = run_bulk(
+            products, steps, args.output,
+            concurrency=args.concurrency, language=args.language, progress=_print_progress,
+            resume=not args.restart
+        )
+    print(f"✅ {summary['succeeded']} succeeded, ❌ {summary['failed']} failed, "
+          f"{summary['resumed_steps']} steps resumed, ${summary['cost_usd']:.4f} in {summary['duration']:.1f}s "
+          f"-> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,31 @@
 """
 Cache utility functions for Etsy AI Assistant
 """
-import streamlit as st
 import hashlib
+import json
 import time
+from config.settings import SPILL_DB_PATH
+from .blob_store import get_blob_store
+from .context import get_session, mark_dirty
+from .history_db import get_database
+from .metrics import CACHE_REQUESTS
+from .session_helpers import get_user_id
+from .session_store import load_deferred_key
+
+
+SPILL_SCHEMA = """
+CREATE TABLE IF NOT EXISTS spilled_responses (
+    user_id TEXT NOT NULL,
+    cache_key TEXT NOT NULL,
+    response TEXT NOT NULL,
+    usage TEXT,
+    timestamp REAL NOT NULL,
+    PRIMARY KEY (user_id, cache_key)
+);
+CREATE INDEX IF NOT EXISTS idx_spilled_responses_time ON spilled_responses (timestamp);
+"""
+
+CACHE_TTL_SECONDS = 86400  # 24 hours
 
 
 def generate_cache_key(system_prompt, user_prompt, max_tokens, temperature=0.7):
@@ -12,39 +34,126 @@ def generate_cache_key(system_prompt, user_prompt, max_tokens, temperature=0.7):
     return hashlib.md5(content.encode()).hexdigest()
 
 
+def _get_api_cache():
+    """Get the session response cache, loading a deferred snapshot on first use"""
+    session = get_session()
+    if 'api_cache' not in session and not load_deferred_key('api_cache'):
+        session['api_cache'] = {}
+    return session['api_cache']
+
+
 def get_from_cache(cache_key):
     """Get response from cache if exists and not expired (24 hours)"""
-    if cache_key in st.session_state['api_cache']:
-        cached_data = st.session_state['api_cache'][cache_key]
+    session = get_session()
+    api_cache = _get_api_cache()
+    if cache_key in api_cache:
+        cached_data = api_cache[cache_key]
         # Check if cache is still valid (24 hours)
-        if time.time() - cached_data['timestamp'] < 86400:  # 24 hours
-            st.session_state['cache_stats']['hits'] += 1
-            return cached_data['response']
+        if time.time() - cached_data['timestamp'] < CACHE_TTL_SECONDS:
+            session['cache_stats']['hits'] += 1
+            mark_dirty('cache_stats')
+            CACHE_REQUESTS.inc(result='hit')
+            return get_blob_store().get(cached_data['response_ref'])
         else:
             # Remove expired cache
-            del st.session_state['api_cache'][cache_key]
+            get_blob_store().release(cached_data['response_ref'])
+            del api_cache[cache_key]
+            mark_dirty('api_cache', 'blob_store')
+        CACHE_REQUESTS.inc(result='expired')
+        return None
+    
+    # Entries evicted under memory pressure are re-read from the disk spill tier
+    spilled = _load_spilled_entry(cache_key)
+    if spilled:
+        response, usage, timestamp = spilled
+        api_cache[cache_key] = {
+            'response_ref': get_blob_store().put(response),
+            'timestamp': timestamp,
+            'usage': json.loads(usage) if usage else None
+        }
+        session['cache_stats']['hits'] += 1
+        mark_dirty('api_cache', 'blob_store', 'cache_stats')
+        CACHE_REQUESTS.inc(result='spill_hit')
+        return response
+    
+    CACHE_REQUESTS.inc(result='miss')
     return None
 
 
-def save_to_cache(cache_key, response):
-    """Save response to cache with timestamp"""
-    st.session_state['api_cache'][cache_key] = {
-        'response': response,
-        'timestamp': time.time()
+def _get_spill_db():
+    """Get the disk spill tier database"""
+    return get_database(SPILL_DB_PATH, SPILL_SCHEMA)
+
+
+def _load_spilled_entry(cache_key):
+    """Get (response, usage JSON, timestamp) of this user's spilled, unexpired cache entry"""
+    rows = _get_spill_db().execute(
+        "SELECT response, usage, timestamp FROM spilled_responses "
+        "WHERE user_id = ? AND cache_key = ? AND timestamp > ?",
+        (get_user_id(), cache_key, time.time() - CACHE_TTL_SECONDS)
+    )
+    return rows[0] if rows else None
+
+
+def spill_cache_entries(api_cache, blob_store, user_id):
+    """Move all entries of a user's session cache to disk, with their usage, and release their memory"""
+    statements = [("DELETE FROM spilled_responses WHERE timestamp <= ?", (time.time() - CACHE_TTL_SECONDS,))]
+    for cache_key, cached_data in list(api_cache.items()):
+        response = blob_store.get(cached_data['response_ref']) if blob_store is not None else None
+        if response is not None:
+            usage = cached_data.get('usage')
+            statements.append((
+                "INSERT OR REPLACE INTO spilled_responses (user_id, cache_key, response, usage, timestamp) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (user_id, cache_key, response, json.dumps(usage) if usage else None, cached_data['timestamp'])
+            ))
+            blob_store.release(cached_data['response_ref'])
+    
+    _get_spill_db().execute_many(statements)
+    api_cache.clear()
+    return len(statements) - 1
+
+
+def get_cached_usage(cache_key):
+    """Get the token usage recorded when a cached response was generated"""
+    cached_data = _get_api_cache().get(cache_key)
+    return cached_data.get('usage') if cached_data else None
+
+
+def save_to_cache(cache_key, response, usage=None):
+    """Save response to cache with timestamp (content lives in the blob store)"""
+    session = get_session()
+    blob_store = get_blob_store()
+    api_cache = _get_api_cache()
+    previous = api_cache.get(cache_key)
+    if previous:
+        blob_store.release(previous['response_ref'])
+    
+    api_cache[cache_key] = {
+        'response_ref': blob_store.put(response),
+        'timestamp': time.time(),
+        'usage': usage
     }
-    st.session_state['cache_stats']['misses'] += 1
+    session['cache_stats']['misses'] += 1
+    mark_dirty('api_cache', 'blob_store', 'cache_stats')
 
 
 def clear_cache():
     """Clear all cached data"""
-    st.session_state['api_cache'] = {}
-    st.session_state['cache_stats'] = {'hits': 0, 'misses': 0}
+    session = get_session()
+    blob_store = get_blob_store()
+    for cached_data in _get_api_cache().values():
+        blob_store.release(cached_data['response_ref'])
+    session['api_cache'] = {}
+    session['cache_stats'] = {'hits': 0, 'misses': 0}
+    mark_dirty('api_cache', 'blob_store', 'cache_stats')
 
 
 def get_cache_stats():
     """Get cache statistics"""
-    cache_hits = st.session_state['cache_stats']['hits']
-    cache_misses = st.session_state['cache_stats']['misses']
+    session = get_session()
+    cache_hits = session['cache_stats']['hits']
+    cache_misses = session['cache_stats']['misses']
     total_calls = cache_hits + cache_misses
     
     if total_calls > 0:
@@ -53,7 +162,7 @@ def get_cache_stats():
             'hit_rate': hit_rate,
             'hits': cache_hits,
             'total_calls': total_calls,
-            'cache_size': len(st.session_state['api_cache'])
+            'cache_size': len(_get_api_cache())
         }
     
     return {
@@ -0,0 +1,126 @@
+"""
+Session context utilities for Etsy AI Assistant
+State backends so cache, analytics, usage and history run with or without a Streamlit session
+"""
+import streamlit as st
+import functools
+import uuid
+from collections.abc import MutableMapping
+from contextlib import contextmanager
+from contextvars import ContextVar
+from config.settings import SESSION_PERSISTENCE_ENABLED
+
+
+class Session(MutableMapping):
+    """Session state backend: a mutable mapping of state keys with an id"""
+    persistent = False   # restored from / snapshotted to the session database
+    interactive = False  # errors and warnings are rendered in a Streamlit page
+
+    @property
+    def session_id(self):
+        raise NotImplementedError
+
+
+class MemorySession(Session):
+    """Plain in-process state, for CLI runs, worker processes and benchmarks"""
+
+    def __init__(self, values=None):
+        self._state = dict(values or {})
+        self._session_id = uuid.uuid4().hex
+
+    @property
+    def session_id(self):
+        return self._session_id
+
+    def __getitem__(self, key):
+        return self._state[key]
+
+    def __setitem__(self, key, value):
+        self._state[key] = value
+
+    def __delitem__(self, key):
+        del self._state[key]
+
+    def __contains__(self, key):
+        return key in self._state
+
+    def __iter__(self):
+        return iter(self._state)
+
+    def __len__(self):
+        return len(self._state)
+
+    def get(self, key, default=None):
+        return self._state.get(key, default)
+
+
+class StreamlitSession(Session):
+    """The current Streamlit session's st.session_state"""
+    persistent = SESSION_PERSISTENCE_ENABLED
+    interactive = True
+
+    @property
+    def session_id(self):
+        ctx = st.runtime.scriptrunner.get_script_run_ctx(suppress_warning=True)
+        if ctx is not None:
+            return ctx.session_id
+        return st.session_state.get('user_id', 'local')
+
+    def __getitem__(self, key):
+        return st.session_state[key]
+
+    def __setitem__(self, key, value):
+        st.session_state[key] = value
+
+    def __delitem__(self, key):
+        del st.session_state[key]
+
+    def __contains__(self, key):
+        return key in st.session_state
+
+    def __iter__(self):
+        return iter(list(st.session_state.keys()))
+
+    def __len__(self):
+        return len(st.session_state)
+
+    def get(self, key, default=None):
+        return st.session_state.get(key, default)
+
+
+_streamlit_session = StreamlitSession()
+_current_session = ContextVar('current_session', default=None)
+
+
+def get_session():
+    """Get the session the current code runs against (the Streamlit session unless one is in use)"""
+    session = _current_session.get()
+    return session if session is not None else _streamlit_session
+
+
+@contextmanager
+def use_session(session):
+    """Run a block against the given session instead of st.session_state"""
+    token = _current_session.set(session)
+    try:
+        yield session
+    finally:
+        _current_session.reset(token)
+
+
+def mark_dirty(*keys):
+    """Flag session keys changed in place so the next snapshot of a persistent session writes them"""
+    session = get_session()
+    if session.persistent:
+        session.setdefault('_dirty_keys', set()).update(keys)
+
+
+def with_session(func):
+    """Decorator adding an optional session= argument the function and everything it calls run against"""
+    @functools.wraps(func)
+    def wrapper(*args, session=None, **kwargs):
+        if session is None:
+            return func(*args, **kwargs)
+        with use_session(session):
+            return func(*args, **kwargs)
+    return wrapper
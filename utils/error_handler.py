@@ -3,6 +3,12 @@ Error handling utilities for Etsy AI Assistant
 """
 import streamlit as st
 import time
+from collections import deque
+from itertools import islice
+from config.settings import MAX_ERROR_LOG_ENTRIES
+from .context import get_session, mark_dirty
+from .metrics import ERRORS
+from .records import ErrorRecord
 
 
 class EtsyAIError(Exception):
@@ -19,6 +25,11 @@ class APIError(EtsyAIError):
     pass
 
 
+class TransientAPIError(APIError):
+    """API errors a retry may get past: rate limit, timeout, connection or 5xx"""
+    pass
+
+
 class ValidationError(EtsyAIError):
     """Input validation errors"""
     pass
@@ -31,21 +42,17 @@ class CacheError(EtsyAIError):
 
 def log_error(error, context=None):
     """Log error with context for debugging"""
-    if 'error_log' not in st.session_state:
-        st.session_state['error_log'] = []
-    
-    error_entry = {
-        'timestamp': time.time(),
-        'error_type': type(error).__name__,
-        'message': str(error),
-        'context': context or {},
-        'stack_trace': None
-    }
+    session = get_session()
+    if 'error_log' not in session:
+        session['error_log'] = deque(maxlen=MAX_ERROR_LOG_ENTRIES)
     
-    # Add to error log (keep last 50 errors)
-    st.session_state['error_log'].insert(0, error_entry)
-    if len(st.session_state['error_log']) > 50:
-        st.session_state['error_log'] = st.session_state['error_log'][:50]
+    ERRORS.inc(error_type=type(error).__name__)
+    
+    # Newest first; the ring buffer drops the oldest error past MAX_ERROR_LOG_ENTRIES
+    session['error_log'].appendleft(
+        ErrorRecord(time.time(), type(error).__name__, str(error), context or {})
+    )
+    mark_dirty('error_log')
 
 
 def display_error(error, show_details=False):
@@ -71,6 +78,11 @@ def display_error(error, show_details=False):
             'message': 'OpenAI API key is missing or invalid.',
             'action': 'Please check your .env file and ensure OPENAI_API_KEY is set correctly.'
         },
+        'budget': {
+            'title': '💰 Listing Budget Reached',
+            'message': 'This listing has used up its API cost budget for this session.',
+            'action': 'Reuse the results already generated, or raise LISTING_COST_BUDGET_USD in config/settings.py.'
+        },
         'generic': {
             'title': '❌ Error Occurred',
             'message': 'An unexpected error occurred.',
@@ -82,7 +94,9 @@ def display_error(error, show_details=False):
     error_type = 'generic'
     error_str = str(error).lower()
     
-    if 'quota' in error_str or 'billing' in error_str:
+    if getattr(error, 'error_code', None) == 'budget_exceeded':
+        error_type = 'budget'
+    elif 'quota' in error_str or 'billing' in error_str:
         error_type = 'quota'
     elif 'connection' in error_str or 'network' in error_str:
         error_type = 'network'
@@ -93,6 +107,10 @@ def display_error(error, show_details=False):
     
     error_info = error_messages[error_type]
     
+    # Headless sessions (CLI, workers) only keep the error log
+    if not get_session().interactive:
+        return
+    
     st.error(f"{error_info['title']}\n\n{error_info['message']}")
     st.info(f"💡 **Action:** {error_info['action']}")
     
@@ -149,23 +167,24 @@ def handle_api_response(response, expected_format='text'):
 
 def create_error_report():
     """Create detailed error report for debugging"""
-    if 'error_log' not in st.session_state or not st.session_state['error_log']:
+    session = get_session()
+    if 'error_log' not in session or not session['error_log']:
         return "No errors recorded"
     
-    recent_errors = st.session_state['error_log'][:10]
+    recent_errors = islice(session['error_log'], 10)
     
     report = f"# Error Report\n\n"
     report += f"**Generated:** {time.strftime('%Y-%m-%d %H:%M:%S')}\n"
-    report += f"**Total Errors:** {len(st.session_state['error_log'])}\n\n"
+    report += f"**Total Errors:** {len(session['error_log'])}\n\n"
     
     for i, error in enumerate(recent_errors):
-        timestamp = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(error['timestamp']))
+        timestamp = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(error.timestamp))
         report += f"## Error {i+1}\n"
         report += f"**Time:** {timestamp}\n"
-        report += f"**Type:** {error['error_type']}\n"
-        report += f"**Message:** {error['message']}\n"
-        if error['context']:
-            report += f"**Context:** {error['context']}\n"
+        report += f"**Type:** {error.error_type}\n"
+        report += f"**Message:** {error.message}\n"
+        if error.context:
+            report += f"**Context:** {error.context}\n"
         report += "\n---\n\n"
     
     return report 
\ No newline at end of file
@@ -0,0 +1,91 @@
+"""
+Latency histogram utilities for Etsy AI Assistant
+Fixed-memory, log-bucketed streaming histograms with percentile queries
+"""
+import math
+from array import array
+from config.settings import HISTOGRAM_MIN_SECONDS, HISTOGRAM_MAX_SECONDS, HISTOGRAM_GROWTH_FACTOR
+
+
+class LatencyHistogram:
+    """Log-bucketed histogram: O(1) record, O(buckets) percentile, ~growth/2 relative error"""
+
+    __slots__ = ('min_value', 'growth', 'log_growth', 'counts', 'count', 'total', 'min_seen', 'max_seen')
+
+    def __init__(self, min_value=HISTOGRAM_MIN_SECONDS, max_value=HISTOGRAM_MAX_SECONDS,
+                 growth=HISTOGRAM_GROWTH_FACTOR):
+        self.min_value = min_value
+        self.growth = growth
+        self.log_growth = math.log(growth)
+        bucket_count = int(math.ceil(math.log(max_value / min_value) / self.log_growth)) + 2
+        self.counts = array('L', [0]) * bucket_count
+        self.count = 0
+        self.total = 0.0
+        self.min_seen = math.inf
+        self.max_seen = 0.0
+
+    def _bucket_index(self, value):
+        """Bucket 0 holds values below min_value, the last bucket everything past max_value"""
+        if value < self.min_value:
+            return 0
+        index = int(math.log(value / self.min_value) / self.log_growth) + 1
+        return min(index, len(self.counts) - 1)
+
+    def _bucket_value(self, index):
+        """Representative value of a bucket (geometric midpoint)"""
+        if index == 0:
+            return self.min_value
+        lower = self.min_value * self.growth ** (index - 1)
+        return lower * math.sqrt(self.growth)
+
+    def record(self, value):
+        """Record one observation"""
+        self.counts[self._bucket_index(value)] += 1
+        self.count += 1
+        self.total += value
+        if value < self.min_seen:
+            self.min_seen = value
+        if value > self.max_seen:
+            self.max_seen = value
+
+    def percentile(self, percent):
+        """Get the value below which `percent` of observations fall"""
+        if not self.count:
+            return 0.0
+        target = max(1, math.ceil(self.count * percent / 100))
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= target:
+                # Never report outside the observed range
+                return min(max(self._bucket_value(index), self.min_seen), self.max_seen)
+        return self.max_seen
+
+    def percentiles(self, percents=(50, 95, 99)):
+        """Get several percentiles as {percent: value}"""
+        return {percent: self.percentile(percent) for percent in percents}
+
+    def mean(self):
+        """Get the mean of all observations"""
+        return self.total / self.count if self.count else 0.0
+
+    def merge(self, other):
+        """Add another histogram with the same bucket layout into this one"""
+        for index, bucket_count in enumerate(other.counts):
+            self.counts[index] += bucket_count
+        self.count += other.count
+        self.total += other.total
+        self.min_seen = min(self.min_seen, other.min_seen)
+        self.max_seen = max(self.max_seen, other.max_seen)
+
+    def to_dict(self):
+        """Export summary figures"""
+        p = self.percentiles()
+        return {
+            'count': self.count,
+            'mean': self.mean(),
+            'p50': p[50],
+            'p95': p[95],
+            'p99': p[99],
+            'max': self.max_seen
+        }
\ No newline at end of file
@@ -0,0 +1,269 @@
+"""
+SQLite history storage for Etsy AI Assistant
+Persistent per-user content history with FTS5 search and keyset pagination
+"""
+import json
+import os
+import sqlite3
+import threading
+from .search_index import tokenize
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS history (
+    id TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    content_type TEXT NOT NULL,
+    content TEXT,
+    prompt_used TEXT,
+    timestamp REAL NOT NULL,
+    metadata TEXT NOT NULL DEFAULT '{}',
+    favorited INTEGER NOT NULL DEFAULT 0,
+    tags TEXT NOT NULL DEFAULT '[]',
+    PRIMARY KEY (user_id, id)
+);
+CREATE INDEX IF NOT EXISTS idx_history_user_time
+    ON history (user_id, timestamp DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_history_user_type_time
+    ON history (user_id, content_type, timestamp DESC, id DESC);
+CREATE VIRTUAL TABLE IF NOT EXISTS history_fts USING fts5(
+    content, content_type, tags,
+    content='history', content_rowid='rowid',
+    tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+);
+CREATE TRIGGER IF NOT EXISTS history_ai AFTER INSERT ON history BEGIN
+    INSERT INTO history_fts (rowid, content, content_type, tags)
+    VALUES (new.rowid, new.content, new.content_type, new.tags);
+END;
+CREATE TRIGGER IF NOT EXISTS history_ad AFTER DELETE ON history BEGIN
+    INSERT INTO history_fts (history_fts, rowid, content, content_type, tags)
+    VALUES ('delete', old.rowid, old.content, old.content_type, old.tags);
+END;
+CREATE TRIGGER IF NOT EXISTS history_au AFTER UPDATE OF content, content_type, tags ON history BEGIN
+    INSERT INTO history_fts (history_fts, rowid, content, content_type, tags)
+    VALUES ('delete', old.rowid, old.content, old.content_type, old.tags);
+    INSERT INTO history_fts (rowid, content, content_type, tags)
+    VALUES (new.rowid, new.content, new.content_type, new.tags);
+END;
+"""
+
+COLUMNS = "id, content_type, content, prompt_used, timestamp, metadata, favorited, tags"
+
+_connections = {}
+_connections_lock = threading.Lock()
+
+
+class _Database:
+    """Shared SQLite connection guarded by a lock"""
+
+    def __init__(self, db_path, schema):
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.connection = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(schema)
+        self.lock = threading.Lock()
+
+    def execute(self, sql, params=()):
+        """Execute a statement and return all rows"""
+        with self.lock:
+            return self.connection.execute(sql, params).fetchall()
+
+    def execute_many(self, statements):
+        """Execute (sql, params) pairs in a single transaction"""
+        with self.lock:
+            self.connection.execute("BEGIN")
+            try:
+                for sql, params in statements:
+                    self.connection.execute(sql, params)
+            except Exception:
+                self.connection.execute("ROLLBACK")
+                raise
+            self.connection.execute("COMMIT")
+
+
+def get_database(db_path, schema=SCHEMA):
+    """Get the process-wide database for a path, creating its schema on first use"""
+    with _connections_lock:
+        if db_path not in _connections:
+            _connections[db_path] = _Database(db_path, schema)
+        return _connections[db_path]
+
+
+def _row_to_entry(row):
+    """Convert a history row to the entry dict used across the app"""
+    return {
+        'id': row[0],
+        'content_type': row[1],
+        'content': row[2],
+        'prompt_used': row[3],
+        'timestamp': row[4],
+        'metadata': json.loads(row[5]),
+        'favorited': bool(row[6]),
+        'tags': json.loads(row[7])
+    }
+
+
+def build_fts_query(query):
+    """Build an FTS5 query: every term must match, each as a prefix"""
+    terms = list(dict.fromkeys(tokenize(query)))
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+class SQLiteHistoryStore:
+    """Content history for one user, stored in SQLite"""
+
+    def __init__(self, db_path, user_id):
+        self.db_path = db_path
+        self.user_id = user_id
+        get_database(db_path)  # Fail early if SQLite/FTS5 is unusable
+
+    @property
+    def db(self):
+        return get_database(self.db_path)
+
+    def __len__(self):
+        return self.db.execute("SELECT COUNT(*) FROM history WHERE user_id = ?", (self.user_id,))[0][0]
+
+    def __iter__(self):
+        cursor = None
+        while True:
+            entries, cursor = self.page(limit=200, before=cursor)
+            yield from entries
+            if cursor is None:
+                return
+
+    def __contains__(self, entry_id):
+        return self.get(entry_id) is not None
+
+    def add(self, entry):
+        """Add a HistoryEntry, or update it in place (through the FTS update trigger) if this user has its id"""
+        self.db.execute(
+            f"""
+            INSERT INTO history (user_id, {COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (user_id, id) DO UPDATE SET
+                content_type = excluded.content_type, content = excluded.content,
+                prompt_used = excluded.prompt_used, timestamp = excluded.timestamp,
+                metadata = excluded.metadata, favorited = excluded.favorited, tags = excluded.tags
+            """,
+            (
+                self.user_id, entry.id, entry.content_type, entry.content,
+                entry.prompt_used, entry.timestamp,
+                json.dumps(entry.metadata or {}, ensure_ascii=False),
+                int(entry.favorited),
+                json.dumps(entry.tags or [], ensure_ascii=False)
+            )
+        )
+
+    def get(self, entry_id):
+        """Get an entry by id"""
+        rows = self.db.execute(
+            f"SELECT {COLUMNS} FROM history WHERE user_id = ? AND id = ?",
+            (self.user_id, entry_id)
+        )
+        return _row_to_entry(rows[0]) if rows else None
+
+    def delete(self, entry_id):
+        """Delete an entry by id"""
+        if entry_id not in self:
+            return False
+        self.db.execute("DELETE FROM history WHERE user_id = ? AND id = ?", (self.user_id, entry_id))
+        return True
+
+    def toggle_favorite(self, entry_id):
+        """Toggle favorite status of an entry"""
+        if entry_id not in self:
+            return False
+        self.db.execute(
+            "UPDATE history SET favorited = 1 - favorited WHERE user_id = ? AND id = ?",
+            (self.user_id, entry_id)
+        )
+        return True
+
+    def add_tag(self, entry_id, tag):
+        """Add a tag to an entry"""
+        entry = self.get(entry_id)
+        if entry is None:
+            return False
+        if tag not in entry['tags']:
+            entry['tags'].append(tag)
+            self.db.execute(
+                "UPDATE history SET tags = ? WHERE user_id = ? AND id = ?",
+                (json.dumps(entry['tags'], ensure_ascii=False), self.user_id, entry_id)
+            )
+        return True
+
+    def search(self, query, limit=100):
+        """Full-text search, all terms must match and results are BM25 ranked"""
+        fts_query = build_fts_query(query)
+        if not fts_query:
+            return self.newest(limit)
+
+        rows = self.db.execute(
+            f"""
+            SELECT {', '.join('h.' + column.strip() for column in COLUMNS.split(','))}
+            FROM history_fts
+            JOIN history h ON h.rowid = history_fts.rowid
+            WHERE history_fts MATCH ? AND h.user_id = ?
+            ORDER BY bm25(history_fts)
+            LIMIT ?
+            """,
+            (fts_query, self.user_id, limit)
+        )
+        return [_row_to_entry(row) for row in rows]
+
+    def page(self, limit=20, before=None, content_type=None, favorited=None, since=None, until=None):
+        """Get one page of entries newest first, returns (entries, next_cursor)"""
+        conditions = ["user_id = ?"]
+        params = [self.user_id]
+
+        if content_type:
+            conditions.append("content_type = ?")
+            params.append(content_type)
+        if favorited is not None:
+            conditions.append("favorited = ?")
+            params.append(int(favorited))
+        if since is not None:
+            conditions.append("timestamp >= ?")
+            params.append(since)
+        if until is not None:
+            conditions.append("timestamp < ?")
+            params.append(until)
+        if before is not None:
+            # Keyset pagination: continue strictly after the last (timestamp, id) seen
+            conditions.append("(timestamp, id) < (?, ?)")
+            params.extend(before)
+
+        rows = self.db.execute(
+            f"""
+            SELECT {COLUMNS} FROM history
+            WHERE {' AND '.join(conditions)}
+            ORDER BY timestamp DESC, id DESC
+            LIMIT ?
+            """,
+            (*params, limit + 1)
+        )
+
+        entries = [_row_to_entry(row) for row in rows[:limit]]
+        next_cursor = (entries[-1]['timestamp'], entries[-1]['id']) if len(rows) > limit else None
+        return entries, next_cursor
+
+    def newest(self, limit=None):
+        """Get newest entries first"""
+        if limit is None:
+            return list(self)
+        return self.page(limit=limit)[0]
+
+    def get_content_types(self):
+        """Get all content types used by this user"""
+        rows = self.db.execute(
+            "SELECT DISTINCT content_type FROM history WHERE user_id = ? ORDER BY content_type",
+            (self.user_id,)
+        )
+        return [row[0] for row in rows]
+
+    def clear(self):
+        """Delete all entries of this user"""
+        self.db.execute("DELETE FROM history WHERE user_id = ?", (self.user_id,))
\ No newline at end of file
@@ -0,0 +1,172 @@
+"""
+History store utilities for Etsy AI Assistant
+Newest-first content history with O(1) lookup by entry id
+"""
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from config.settings import MAX_CONTENT_HISTORY
+from .blob_store import is_blob_content
+from .search_index import HistorySearchIndex
+
+
+_id_lock = threading.Lock()
+_last_id_millis = 0
+_id_random = 0
+
+ID_RANDOM_BITS = 80
+
+
+def generate_entry_id(content_type):
+    """Generate a globally unique, lexically time-ordered history entry id (ULID-style)
+
+    Millis plus 80 random bits, so processes sharing one history database never mint the same id;
+    within one millisecond the random part is incremented, keeping ids from this process ordered.
+    """
+    global _last_id_millis, _id_random
+    with _id_lock:
+        now_millis = int(time.time() * 1000)
+        if now_millis <= _last_id_millis:
+            # Same millisecond (or clock went backwards): increment instead of drawing again
+            _id_random = (_id_random + 1) % (1 << ID_RANDOM_BITS)
+        else:
+            _last_id_millis = now_millis
+            _id_random = secrets.randbits(ID_RANDOM_BITS)
+        return f"{content_type}_{_last_id_millis:013d}_{_id_random:020x}"
+
+
+def get_searchable_text(entry):
+    """Get the text indexed for a history entry"""
+    return ' '.join([entry.content or '', entry.content_type, ' '.join(entry.tags)])
+
+
+class HistoryStore:
+    """Content history keyed by id, iterated newest first"""
+
+    def __init__(self, max_entries=MAX_CONTENT_HISTORY, blob_store=None):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()  # entry id -> HistoryEntry, oldest first
+        self.index = HistorySearchIndex()
+        self.blob_store = blob_store  # when set, entries hold a content_ref instead of content
+
+    def __getstate__(self):
+        # The blob store is persisted on its own and re-attached after a restore
+        state = self.__dict__.copy()
+        state['blob_store'] = None
+        return state
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __iter__(self):
+        return (self._resolve(entry) for entry in reversed(self.entries.values()))
+
+    def __contains__(self, entry_id):
+        return entry_id in self.entries
+
+    def _resolve(self, entry):
+        """Export an entry as a dict with its content loaded from the blob store"""
+        if entry.content_ref is None:
+            return entry.to_dict()
+        return entry.to_dict(content=self.blob_store.get(entry.content_ref))
+
+    def _release(self, entry):
+        """Drop the blob reference held by an entry"""
+        if entry.content_ref is not None:
+            self.blob_store.release(entry.content_ref)
+
+    def add(self, entry):
+        """Add a HistoryEntry and evict the oldest ones past max_entries"""
+        self.index.add(entry.id, get_searchable_text(entry))
+
+        if self.blob_store is not None and is_blob_content(entry.content):
+            entry.content_ref = self.blob_store.put(entry.content)
+            entry.content = None
+
+        previous = self.entries.get(entry.id)
+        if previous is not None:
+            self._release(previous)
+        self.entries[entry.id] = entry
+
+        while len(self.entries) > self.max_entries:
+            evicted_id, evicted = self.entries.popitem(last=False)
+            self.index.remove(evicted_id)
+            self._release(evicted)
+
+    def get(self, entry_id):
+        """Get an entry by id"""
+        entry = self.entries.get(entry_id)
+        return self._resolve(entry) if entry is not None else None
+
+    def delete(self, entry_id):
+        """Delete an entry by id"""
+        entry = self.entries.pop(entry_id, None)
+        if entry is None:
+            return False
+        self.index.remove(entry_id)
+        self._release(entry)
+        return True
+
+    def toggle_favorite(self, entry_id):
+        """Toggle favorite status of an entry"""
+        entry = self.entries.get(entry_id)
+        if entry is None:
+            return False
+        entry.favorited = not entry.favorited
+        return True
+
+    def add_tag(self, entry_id, tag):
+        """Add a tag to an entry"""
+        entry = self.entries.get(entry_id)
+        if entry is None:
+            return False
+        if tag not in entry.tags:
+            entry.tags.append(tag)
+            self.index.add_terms(entry_id, tag)
+        return True
+
+    def search(self, query, limit=None):
+        """Search entries, all terms must match and results are BM25 ranked"""
+        if not query.strip():
+            return self.newest(limit)
+        return [self._resolve(self.entries[entry_id]) for entry_id in self.index.search(query, limit=limit)]
+
+    def page(self, limit=20, before=None, content_type=None, favorited=None, since=None, until=None):
+        """Get one page of entries newest first, returns (entries, next_cursor)"""
+        entries = []
+        for entry in reversed(self.entries.values()):
+            if before is not None and (entry.timestamp, entry.id) >= tuple(before):
+                continue
+            if content_type and entry.content_type != content_type:
+                continue
+            if favorited is not None and entry.favorited != favorited:
+                continue
+            if since is not None and entry.timestamp < since:
+                continue
+            if until is not None and entry.timestamp >= until:
+                continue
+            if len(entries) == limit:
+                return entries, (entries[-1]['timestamp'], entries[-1]['id'])
+            entries.append(self._resolve(entry))
+        return entries, None
+
+    def get_content_types(self):
+        """Get all content types in the store"""
+        return sorted({entry.content_type for entry in self.entries.values()})
+
+    def newest(self, limit=None):
+        """Get newest entries first"""
+        entries = []
+        for entry in reversed(self.entries.values()):
+            if limit is not None and len(entries) >= limit:
+                break
+            entries.append(self._resolve(entry))
+        return entries
+
+    def clear(self):
+        """Remove all entries"""
+        for entry in self.entries.values():
+            self._release(entry)
+        self.entries.clear()
+        self.index.clear()
\ No newline at end of file
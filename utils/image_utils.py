@@ -0,0 +1,167 @@
+"""
+Image preview utilities for Etsy AI Assistant
+Generates WebP/JPEG thumbnails once per asset and serves them from a disk cache
+"""
+import streamlit as st
+import hashlib
+import io
+import os
+import requests
+from PIL import Image, features
+from config.settings import (
+    THUMBNAIL_SIZES, THUMBNAIL_FORMAT, THUMBNAIL_FALLBACK_FORMAT,
+    THUMBNAIL_QUALITY, THUMBNAIL_CACHE_DIR, IMAGE_DOWNLOAD_TIMEOUT
+)
+from .error_handler import APIError, log_error
+
+
+def get_thumbnail_format():
+    """Get the preview format supported by the installed Pillow build"""
+    if THUMBNAIL_FORMAT == 'WEBP' and not features.check('webp'):
+        return THUMBNAIL_FALLBACK_FORMAT
+    return THUMBNAIL_FORMAT
+
+
+def get_asset_id(source):
+    """Generate a stable id for an image URL, path or raw bytes"""
+    if isinstance(source, bytes):
+        return hashlib.sha1(source).hexdigest()
+    return hashlib.sha1(str(source).encode()).hexdigest()
+
+
+def _get_asset_dir(asset_id):
+    """Get cache directory for a single asset"""
+    return os.path.join(THUMBNAIL_CACHE_DIR, asset_id[:2], asset_id)
+
+
+def _get_preview_path(asset_id, size_name):
+    """Get path of a cached preview file"""
+    extension = 'webp' if get_thumbnail_format() == 'WEBP' else 'jpg'
+    return os.path.join(_get_asset_dir(asset_id), f"{size_name}.{extension}")
+
+
+def _get_original_path(asset_id):
+    """Get path of the cached full-size original"""
+    return os.path.join(_get_asset_dir(asset_id), "original.png")
+
+
+def _read_source_bytes(source):
+    """Read raw image bytes from a URL, local path, bytes or file-like object"""
+    if isinstance(source, bytes):
+        return source
+    if hasattr(source, 'getvalue'):
+        return source.getvalue()
+    if isinstance(source, str) and source.startswith(('http://', 'https://')):
+        response = requests.get(source, timeout=IMAGE_DOWNLOAD_TIMEOUT)
+        if response.status_code != 200:
+            raise APIError(f"Image download failed with status {response.status_code}")
+        return response.content
+    with open(source, 'rb') as image_file:
+        return image_file.read()
+
+
+def _encode_preview(image, max_side):
+    """Resize image to fit max_side and encode it in the preview format"""
+    preview = image.copy()
+    preview.thumbnail((max_side, max_side), Image.LANCZOS)
+
+    preview_format = get_thumbnail_format()
+    if preview_format == 'JPEG' and preview.mode in ('RGBA', 'LA', 'P'):
+        # JPEG has no alpha channel, flatten onto white like Etsy renders it
+        preview = preview.convert('RGBA')
+        background = Image.new('RGB', preview.size, (255, 255, 255))
+        background.paste(preview, mask=preview.split()[-1])
+        preview = background
+
+    buffer = io.BytesIO()
+    if preview_format == 'WEBP':
+        preview.save(buffer, format=preview_format, quality=THUMBNAIL_QUALITY, method=4)
+    else:
+        preview.save(buffer, format=preview_format, quality=THUMBNAIL_QUALITY, optimize=True)
+    return buffer.getvalue()
+
+
+def _write_file(path, data):
+    """Write file atomically so concurrent sessions never read partial previews"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as tmp_file:
+        tmp_file.write(data)
+    os.replace(tmp_path, path)
+
+
+def generate_thumbnails(source, asset_id=None):
+    """Generate all preview sizes for an asset once and cache them on disk"""
+    asset_id = asset_id or get_asset_id(source)
+    paths = {size_name: _get_preview_path(asset_id, size_name) for size_name in THUMBNAIL_SIZES}
+    original_path = _get_original_path(asset_id)
+
+    if os.path.exists(original_path) and all(os.path.exists(path) for path in paths.values()):
+        return paths
+
+    os.makedirs(_get_asset_dir(asset_id), exist_ok=True)
+    raw_bytes = _read_source_bytes(source)
+    image = Image.open(io.BytesIO(raw_bytes))
+    image.load()
+
+    # Keep the original so the full-size view survives expiring DALL-E URLs
+    if not os.path.exists(original_path):
+        if image.format == 'PNG':
+            _write_file(original_path, raw_bytes)
+        else:
+            buffer = io.BytesIO()
+            image.save(buffer, format='PNG')
+            _write_file(original_path, buffer.getvalue())
+
+    for size_name, max_side in THUMBNAIL_SIZES.items():
+        if not os.path.exists(paths[size_name]):
+            _write_file(paths[size_name], _encode_preview(image, max_side))
+
+    return paths
+
+
+def get_thumbnail(source, size='small'):
+    """Get cached preview path for an image, generating previews on first use"""
+    if size not in THUMBNAIL_SIZES:
+        raise ValueError(f"Unknown thumbnail size: {size}")
+
+    asset_id = get_asset_id(source)
+    path = _get_preview_path(asset_id, size)
+    if os.path.exists(path):
+        return path
+    return generate_thumbnails(source, asset_id)[size]
+
+
+def get_full_image(source):
+    """Get cached full-size original for an image"""
+    asset_id = get_asset_id(source)
+    path = _get_original_path(asset_id)
+    if not os.path.exists(path):
+        generate_thumbnails(source, asset_id)
+    return path
+
+
+def render_image_preview(source, caption=None, size='medium', key=None):
+    """Display a cached preview with the full-size image loaded on demand"""
+    try:
+        preview_path = get_thumbnail(source, size)
+    except Exception as e:
+        # Fall back to the original image rather than showing nothing
+        log_error(e, {'operation': 'thumbnail_generation', 'size': size})
+        st.image(source, caption=caption)
+        return
+
+    st.image(preview_path, caption=caption)
+
+    toggle_key = key or f"full_image_{get_asset_id(source)}"
+    if st.toggle("🔍 Full size", key=toggle_key):
+        st.image(get_full_image(source), caption=caption)
+
+
+def render_image_grid(sources, captions=None, columns=4, size='small'):
+    """Display images as a grid of small previews"""
+    captions = captions or [None] * len(sources)
+    grid_columns = st.columns(columns)
+
+    for index, (source, caption) in enumerate(zip(sources, captions)):
+        with grid_columns[index % columns]:
+            render_image_preview(source, caption=caption, size=size, key=f"grid_full_{index}_{get_asset_id(source)}")
\ No newline at end of file
@@ -0,0 +1,180 @@
+"""
+Background job utilities for Etsy AI Assistant
+Runs generation network calls on a shared thread pool; results are applied on the session's next rerun
+"""
+import streamlit as st
+import secrets
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from config.settings import JOB_WORKERS, JOB_RESULT_TTL_SECONDS
+from .analytics import get_current_step, set_current_step
+from .context import get_session
+from .metrics import registry
+from .session_helpers import save_generated_content
+from .tracing import span, trace_session
+
+
+JOBS = registry.counter('etsy_ai_jobs_total', 'Background generation jobs by final status', ('status',))
+JOBS_IN_FLIGHT = registry.gauge('etsy_ai_jobs_in_flight', 'Background generation jobs queued or running')
+
+FINISHED_STATUSES = ('done', 'failed')
+
+
+class Job:
+    """One background generation; only `request` runs on the pool, `finish` runs in the session on delivery"""
+    __slots__ = ('job_id', 'session_id', 'content_type', 'metadata', 'step', 'request', 'finish',
+                 'status', 'submitted', 'finished', 'duration', 'response', 'error')
+
+    def __init__(self, content_type, request, finish, metadata=None, step=None):
+        self.job_id = secrets.token_hex(8)
+        self.session_id = get_session().session_id
+        self.content_type = content_type
+        self.metadata = metadata or {}
+        self.step = step
+        self.request = request
+        self.finish = finish
+        self.status = 'queued'
+        self.submitted = time.time()
+        self.finished = None
+        self.duration = 0.0
+        self.response = None
+        self.error = None
+
+    def to_dict(self):
+        return {
+            'job_id': self.job_id,
+            'content_type': self.content_type,
+            'step': self.step,
+            'status': self.status,
+            'elapsed': (self.finished or time.time()) - self.submitted
+        }
+
+
+class JobManager:
+    """Process-wide thread pool and registry of background jobs"""
+
+    def __init__(self, max_workers=JOB_WORKERS):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='generation')
+        self._jobs = {}  # job id -> Job
+        self._lock = threading.Lock()
+
+    def submit(self, job):
+        """Queue a job's request on the pool"""
+        self._prune()
+        with self._lock:
+            self._jobs[job.job_id] = job
+        JOBS_IN_FLIGHT.inc()
+        self._executor.submit(self._run, job)
+        return job
+
+    def _run(self, job):
+        """Pool worker: run only the request, never touching session state"""
+        job.status = 'running'
+        start = time.perf_counter()
+        try:
+            with trace_session(job.session_id), span("job", content_type=job.content_type):
+                job.response = job.request()
+            job.status = 'done'
+        except Exception as e:
+            job.error = e
+            job.status = 'failed'
+        finally:
+            job.duration = time.perf_counter() - start
+            job.finished = time.time()
+            JOBS_IN_FLIGHT.dec()
+            JOBS.inc(status=job.status)
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def pop(self, job_id):
+        with self._lock:
+            return self._jobs.pop(job_id, None)
+
+    def _prune(self):
+        """Drop finished jobs whose session never came back for them"""
+        cutoff = time.time() - JOB_RESULT_TTL_SECONDS
+        with self._lock:
+            for job_id in [job_id for job_id, job in self._jobs.items() if job.finished and job.finished < cutoff]:
+                del self._jobs[job_id]
+
+    def get_stats(self):
+        """Get job counts by status"""
+        with self._lock:
+            jobs = list(self._jobs.values())
+        stats = dict.fromkeys(('queued', 'running') + FINISHED_STATUSES, 0)
+        for job in jobs:
+            stats[job.status] += 1
+        return stats
+
+
+@st.cache_resource
+def get_job_manager():
+    """Get the job manager shared by all sessions"""
+    return JobManager()
+
+
+def _get_session_jobs():
+    """Get this session's job ids by content type"""
+    session = get_session()
+    if 'jobs' not in session:
+        session['jobs'] = {}
+    return session['jobs']
+
+
+def submit_job(content_type, request, finish, metadata=None):
+    """Run request() in the background; finish(job) turns the finished job into a result on delivery"""
+    job = get_job_manager().submit(Job(content_type, request, finish, metadata, step=get_current_step()))
+    _get_session_jobs()[content_type] = job.job_id
+    return job
+
+
+def get_pending_job(content_type):
+    """Get this session's undelivered job for a content type, or None"""
+    job_id = _get_session_jobs().get(content_type)
+    return get_job_manager().get(job_id) if job_id else None
+
+
+def get_session_jobs():
+    """Get this session's undelivered jobs"""
+    manager = get_job_manager()
+    return [job for job in map(manager.get, _get_session_jobs().values()) if job is not None]
+
+
+def has_finished_jobs():
+    """Check whether any of this session's jobs is waiting to be delivered"""
+    return any(job.status in FINISHED_STATUSES for job in get_session_jobs())
+
+
+def deliver_finished_jobs():
+    """Finish this session's completed jobs in the script thread and store their results; returns the delivered jobs"""
+    session_jobs = _get_session_jobs()
+    manager = get_job_manager()
+    delivered = []
+
+    for content_type, job_id in list(session_jobs.items()):
+        job = manager.get(job_id)
+        if job is not None and job.status not in FINISHED_STATUSES:
+            continue
+        del session_jobs[content_type]
+        if job is None:
+            continue
+        manager.pop(job_id)
+
+        # Usage and latency belong to the step the job was started from
+        previous_step = get_current_step()
+        set_current_step(job.step)
+        try:
+            result = job.finish(job)
+        finally:
+            set_current_step(previous_step)
+
+        if result:
+            save_generated_content(content_type, result, job.metadata)
+        else:
+            job.status = 'failed'
+        delivered.append(job)
+
+    return delivered
@@ -0,0 +1,190 @@
+"""
+Listing content utilities for Etsy AI Assistant
+Parses generated titles, tags and listing core responses, checks them against Etsy limits and repairs near-misses
+"""
+import json
+import re
+from config.settings import (
+    ETSY_TITLE_MIN_CHARS, ETSY_TITLE_MAX_CHARS, ETSY_MAX_TAGS, ETSY_TAG_MAX_CHARS,
+    ETSY_TITLE_MAX_PAD_CHARS, ETSY_TAG_MAX_PAD
+)
+from .error_handler import ValidationError
+from .search_index import tokenize
+
+
+_CODE_FENCE = re.compile(r'^```(?:json)?\s*|\s*```$')
+_LIST_ITEM = re.compile(r'^\s*(?:[-*•]|\d+[.)])\s+')
+# Count suffixes only: "(134)", "[134 chars]", "(134 characters)", "- 134 karakter"
+_COUNT_UNIT = r'(?:characters?|chars?|karakter)'
+_CHARACTER_COUNT = re.compile(
+    rf'\s*(?:[-–—]\s*)?(?:[(\[]\s*\d{{2,3}}(?:\s*{_COUNT_UNIT})?\s*[)\]]|\d{{2,3}}\s*{_COUNT_UNIT})\s*$', re.IGNORECASE
+)
+_TAG_EXPLANATION = re.compile(r'\s+[-–—]\s+|:\s+')
+_TAG_INVALID_CHARS = re.compile(r"[^\w\s'&-]")
+_TRAILING_SEPARATORS = ' ,;:|-–—'
+_KEYWORD_STOPWORDS = {'with', 'from', 'this', 'that', 'your', 'their', 'have', 'made', 'için', 'olan', 'gibi', 'veya'}
+
+
+def parse_listing_core(text):
+    """Parse and check a listing core response; returns {'titles': [...], 'tags': [...], 'description': str}"""
+    text = _CODE_FENCE.sub('', (text or '').strip())
+    start, end = text.find('{'), text.rfind('}')
+    if start == -1 or end < start:
+        raise ValidationError("Listing response contains no JSON object", 'listing_core_json')
+    try:
+        data = json.loads(text[start:end + 1])
+    except json.JSONDecodeError as e:
+        raise ValidationError(f"Listing response is not valid JSON: {e}", 'listing_core_json')
+
+    core = {}
+    for part in ('titles', 'tags'):
+        values = data.get(part)
+        if not isinstance(values, list):
+            raise ValidationError(f"Listing response has no {part} list", 'listing_core_fields')
+        core[part] = [value.strip() for value in values if isinstance(value, str) and value.strip()]
+        if not core[part]:
+            raise ValidationError(f"Listing response has no {part}", 'listing_core_fields')
+
+    description = data.get('description')
+    if not isinstance(description, str) or not description.strip():
+        raise ValidationError("Listing response has no description", 'listing_core_fields')
+    core['description'] = description.strip()
+    return core
+
+
+def format_titles(titles):
+    """Format titles as the numbered list shown in the title step, with character counts"""
+    return '\n'.join(f"{index}. {title} ({len(title)})" for index, title in enumerate(titles, 1))
+
+
+def format_tags(tags):
+    """Format tags as one comma-separated line, ready to paste into Etsy"""
+    return ', '.join(tags)
+
+
+def split_listing_core(core):
+    """Get the step panel text of each listing core part"""
+    return {
+        'titles': format_titles(core['titles']),
+        'tags': format_tags(core['tags']),
+        'description': core['description']
+    }
+
+
+def _list_items(text):
+    """Get the items of a generated list: its bulleted/numbered lines, or every line if there are none"""
+    lines = [line for line in (text or '').splitlines() if line.strip()]
+    items = [_LIST_ITEM.sub('', line) for line in lines if _LIST_ITEM.match(line)]
+    return items or lines
+
+
+def _clean(text):
+    return ' '.join(text.replace('**', '').strip().strip('"\'“”').split())
+
+
+def parse_titles(text):
+    """Get the titles of a generated title list, without numbering or character counts"""
+    return [title for title in (_clean(_CHARACTER_COUNT.sub('', _clean(item))) for item in _list_items(text)) if title]
+
+
+def parse_tags(text):
+    """Get the tags of a generated tag list (numbered lines with explanations or comma-separated)"""
+    items = _list_items(text)
+    if len(items) == 1 or not any(_LIST_ITEM.match(line) for line in (text or '').splitlines()):
+        items = [tag for item in items for tag in item.split(',')]
+    return [tag for tag in (_clean(_TAG_EXPLANATION.split(_clean(item), 1)[0]).lstrip('#') for item in items) if tag]
+
+
+def truncate_at_word(text, max_chars):
+    """Shorten text to at most max_chars, cutting at the last word boundary that fits"""
+    if len(text) <= max_chars:
+        return text
+    cut = text[:max_chars + 1].rfind(' ')
+    return (text[:cut] if cut > 0 else text[:max_chars]).rstrip(_TRAILING_SEPARATORS)
+
+
+def listing_keywords(form_data):
+    """Get keyword phrases from the product inputs, most specific first, for padding titles and tags"""
+    category = (form_data.get('product_category') or '').strip()
+    theme = (form_data.get('design_theme') or '').strip()
+    audience = (form_data.get('target_audience') or '').strip()
+
+    phrases = []
+    if theme and category:
+        phrases.append(f"{theme} {category}")
+    if category and audience:
+        phrases.append(f"{category} for {audience}")
+    if audience:
+        phrases.append(f"gift for {audience}")
+    if category:
+        phrases.append(f"{category} gift")
+    phrases += [category, theme, audience]
+    phrases += [token for token in tokenize(form_data.get('product_description'))
+                if len(token) > 3 and not token.isdigit() and token not in _KEYWORD_STOPWORDS]
+
+    keywords, seen = [], set()
+    for phrase in phrases:
+        if phrase and phrase.lower() not in seen:
+            seen.add(phrase.lower())
+            keywords.append(phrase)
+    return keywords
+
+
+def is_valid_title(title):
+    return ETSY_TITLE_MIN_CHARS <= len(title) <= ETSY_TITLE_MAX_CHARS
+
+
+def repair_title(title, keywords):
+    """Truncate a long title at a word boundary, or pad a slightly short one with keywords whose words it lacks"""
+    title = truncate_at_word(_clean(title), ETSY_TITLE_MAX_CHARS)
+    if ETSY_TITLE_MIN_CHARS - len(title) > ETSY_TITLE_MAX_PAD_CHARS:
+        return title  # too far off to pad sensibly; regenerated instead
+
+    title_tokens = set(tokenize(title))
+    for keyword in keywords:
+        if len(title) >= ETSY_TITLE_MIN_CHARS:
+            break
+        keyword_tokens = set(tokenize(keyword))
+        if keyword_tokens <= title_tokens or len(title) + len(keyword) + 2 > ETSY_TITLE_MAX_CHARS:
+            continue
+        title = f"{title}, {keyword}"
+        title_tokens |= keyword_tokens
+    return title
+
+
+def normalize_tag(tag):
+    """Lowercase a tag, drop characters Etsy rejects and shorten it to the tag limit at a word boundary"""
+    tag = ' '.join(_TAG_INVALID_CHARS.sub(' ', tag.lower()).split())
+    return truncate_at_word(tag, ETSY_TAG_MAX_CHARS)
+
+
+def repair_tags(tags, keywords):
+    """Normalize and dedupe tags, keep at most ETSY_MAX_TAGS, and fill a small shortfall with keywords"""
+    repaired = []
+    for tag in map(normalize_tag, tags):
+        if tag and tag not in repaired:
+            repaired.append(tag)
+    repaired = repaired[:ETSY_MAX_TAGS]
+
+    if ETSY_MAX_TAGS - len(repaired) <= ETSY_TAG_MAX_PAD:
+        for keyword in keywords:
+            if len(repaired) >= ETSY_MAX_TAGS:
+                break
+            tag = normalize_tag(keyword)
+            # Only whole keywords; a truncated phrase makes a poor tag
+            if tag and tag == ' '.join(keyword.lower().split()) and tag not in repaired:
+                repaired.append(tag)
+    return repaired
+
+
+def review_titles(text, form_data):
+    """Parse and repair generated titles; returns (titles, indices of titles still outside the length limits)"""
+    keywords = listing_keywords(form_data)
+    titles = [repair_title(title, keywords) for title in parse_titles(text)]
+    return titles, [index for index, title in enumerate(titles) if not is_valid_title(title)]
+
+
+def review_tags(text, form_data):
+    """Parse and repair generated tags; returns (tags, number of tags still missing)"""
+    tags = repair_tags(parse_tags(text), listing_keywords(form_data))
+    return tags, ETSY_MAX_TAGS - len(tags)
@@ -0,0 +1,216 @@
+"""
+Memory accounting utilities for Etsy AI Assistant
+Estimates per-session footprint and enforces a process-wide memory budget
+"""
+import sys
+import threading
+import time
+import weakref
+from collections import deque
+from contextlib import contextmanager
+from config.settings import (
+    MEMORY_BUDGET_MB, MEMORY_IDLE_SECONDS, MEMORY_ACCOUNTING_INTERVAL,
+    MEMORY_TRACKED_KEYS, MEMORY_MIN_HISTORY_ENTRIES
+)
+from .cache_utils import spill_cache_entries
+from .context import get_session, mark_dirty
+from .history_store import HistoryStore
+from .metrics import ACTIVE_SESSIONS, SESSION_MEMORY_BYTES
+
+
+_sessions = weakref.WeakValueDictionary()  # session id -> SessionMemoryHandle
+_sessions_lock = threading.Lock()
+
+MAX_SIZE_WALK_OBJECTS = 200000
+
+
+def estimate_size(*objects):
+    """Estimate deep size in bytes of objects, counting shared objects once"""
+    seen = set()
+    stack = list(objects)
+    total = 0
+
+    while stack and len(seen) < MAX_SIZE_WALK_OBJECTS:
+        obj = stack.pop()
+        if id(obj) in seen or obj is None or isinstance(obj, type):
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj, 0)
+
+        if isinstance(obj, (str, bytes, int, float, bool)):
+            continue
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+            stack.extend(obj)
+        else:
+            if hasattr(obj, '__dict__'):
+                stack.append(obj.__dict__)
+            for slot in getattr(type(obj), '__slots__', ()):
+                stack.append(getattr(obj, slot, None))
+
+    return total
+
+
+class SessionMemoryHandle:
+    """Lives in a session's state; lets the accountant measure and trim that session"""
+
+    def __init__(self, session_id):
+        self.session_id = session_id
+        self.lock = threading.RLock()  # held by the session's reruns and by the accountant while evicting
+        self.containers = {}
+        self.user_id = None
+        self.dirty_keys = set()  # keys evicted by the accountant, marked dirty on the session's next run
+        self.last_active = time.time()
+        self.last_measured = 0
+        self.size_bytes = 0
+        self.key_sizes = {}
+        self.evictions = 0
+
+    def refresh(self, session_state):
+        """Capture the session's current containers and mark it active"""
+        self.containers = {key: session_state[key] for key in MEMORY_TRACKED_KEYS if key in session_state}
+        self.user_id = session_state.get('user_id')
+        self.last_active = time.time()
+
+    def measure(self):
+        """Re-estimate this session's footprint"""
+        self.key_sizes = {key: estimate_size(value) for key, value in self.containers.items()}
+        self.size_bytes = estimate_size(*self.containers.values())
+        self.last_measured = time.time()
+        return self.size_bytes
+
+    def evict_cold_data(self):
+        """Evict or spill the coldest data, cheapest to lose first; returns bytes freed
+
+        Mutates the session's containers: hold self.lock, which the session's reruns also take.
+        """
+        before = self.size_bytes
+        api_cache = self.containers.get('api_cache')
+        blob_store = self.containers.get('blob_store')
+
+        # 1. Cached responses are spilled to disk and re-read on the next cache miss
+        if api_cache:
+            spill_cache_entries(api_cache, blob_store, self.user_id)
+            self.dirty_keys.update(('api_cache', 'blob_store'))
+
+        # 2. Telemetry ring buffers
+        analytics = self.containers.get('analytics')
+        if analytics and analytics.get('api_calls'):
+            analytics['api_calls'].clear()
+            self.dirty_keys.add('analytics')
+        error_log = self.containers.get('error_log')
+        if error_log:
+            error_log.clear()
+            self.dirty_keys.add('error_log')
+
+        # 3. Oldest in-memory history entries (the SQLite backend keeps nothing in memory)
+        history = self.containers.get('content_history')
+        if isinstance(history, HistoryStore):
+            while len(history) > MEMORY_MIN_HISTORY_ENTRIES:
+                history.delete(next(iter(history.entries)))
+            self.dirty_keys.update(('content_history', 'blob_store'))
+
+        self.evictions += 1
+        return before - self.measure()
+
+
+def _get_handle():
+    """Get the current session's memory handle, creating it on first use"""
+    session = get_session()
+    handle = session.get('_memory_handle')
+    if handle is None:
+        handle = SessionMemoryHandle(session.session_id)
+        session['_memory_handle'] = handle
+    return handle
+
+
+@contextmanager
+def session_memory_lock():
+    """Hold the current session's memory lock for a rerun, so the accountant never evicts mid-run"""
+    handle = _get_handle()
+    with handle.lock:
+        if handle.dirty_keys:
+            # Data the accountant evicted since the last run goes into the next snapshot
+            mark_dirty(*handle.dirty_keys)
+            handle.dirty_keys.clear()
+        yield handle
+
+
+def track_session_memory():
+    """Register the current session, measure it periodically and enforce the budget"""
+    session = get_session()
+    handle = _get_handle()
+
+    handle.refresh(session)
+    with _sessions_lock:
+        _sessions[handle.session_id] = handle
+
+    if time.time() - handle.last_measured >= MEMORY_ACCOUNTING_INTERVAL:
+        handle.measure()
+        enforce_memory_budget(exclude=handle.session_id)
+
+    return handle.size_bytes
+
+
+def enforce_memory_budget(budget_bytes=None, exclude=None):
+    """Evict cold data from idle sessions, least recently active first, until under budget
+
+    A session is only trimmed while its lock is free, i.e. not during one of its reruns; returns bytes freed.
+    """
+    budget_bytes = budget_bytes if budget_bytes is not None else MEMORY_BUDGET_MB * 1024 * 1024
+    with _sessions_lock:
+        handles = list(_sessions.values())
+
+    total = sum(handle.size_bytes for handle in handles)
+    ACTIVE_SESSIONS.set(len(handles))
+    SESSION_MEMORY_BYTES.set(total)
+    if total <= budget_bytes:
+        return 0
+
+    now = time.time()
+    idle_handles = sorted(
+        (handle for handle in handles
+         if handle.session_id != exclude and now - handle.last_active >= MEMORY_IDLE_SECONDS),
+        key=lambda handle: handle.last_active
+    )
+
+    freed = 0
+    for handle in idle_handles:
+        if not handle.lock.acquire(blocking=False):
+            continue  # rerunning right now, so not idle after all
+        try:
+            freed += handle.evict_cold_data()
+        finally:
+            handle.lock.release()
+        if total - freed <= budget_bytes:
+            break
+    return freed
+
+
+def get_memory_report():
+    """Get per-session and total memory figures for the admin view"""
+    with _sessions_lock:
+        handles = list(_sessions.values())
+
+    now = time.time()
+    sessions = sorted((
+        {
+            'session': handle.session_id[:8],
+            'size_mb': handle.size_bytes / (1024 * 1024),
+            'idle_seconds': now - handle.last_active,
+            'evictions': handle.evictions,
+            'largest_key': max(handle.key_sizes, key=handle.key_sizes.get) if handle.key_sizes else '-'
+        }
+        for handle in handles
+    ), key=lambda row: row['size_mb'], reverse=True)
+
+    total_mb = sum(row['size_mb'] for row in sessions)
+    return {
+        'total_mb': total_mb,
+        'budget_mb': MEMORY_BUDGET_MB,
+        'budget_used': (total_mb / MEMORY_BUDGET_MB) * 100 if MEMORY_BUDGET_MB else 0,
+        'session_count': len(sessions),
+        'sessions': sessions
+    }
\ No newline at end of file
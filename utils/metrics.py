@@ -0,0 +1,264 @@
+"""
+Process-wide metrics for Etsy AI Assistant
+Thread-safe counters, gauges and histograms shared by all sessions, exposed in Prometheus text format
+"""
+import os
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from config.settings import METRICS_HOST, METRICS_FILE_INTERVAL, METRICS_LATENCY_BUCKETS
+from config.env_config import get_metrics_port, get_metrics_file
+
+
+def _escape_label_value(value):
+    """Escape a label value for the text exposition format"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labelnames, labelvalues, extra=()):
+    """Format {name="value",...} for one sample"""
+    pairs = list(zip(labelnames, labelvalues)) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape_label_value(value)}"' for name, value in pairs) + '}'
+
+
+def _format_value(value):
+    """Format a sample value"""
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    """Base for labeled metrics; each label combination is a separate series"""
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        if len(labels) != len(self.labelnames) or any(name not in labels for name in self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _samples(self):
+        """Yield (suffix, labelvalues, extra_labels, value) for every series"""
+        raise NotImplementedError
+
+    def render(self):
+        """Render HELP, TYPE and sample lines"""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            samples = list(self._samples())
+        for suffix, labelvalues, extra, value in samples:
+            lines.append(f"{self.name}{suffix}{_format_labels(self.labelnames, labelvalues, extra)} {_format_value(value)}")
+        return '\n'.join(lines)
+
+
+class Counter(_Metric):
+    """Monotonically increasing count"""
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = self._series.get(key, 0) + amount
+
+    def get(self, **labels):
+        return self._series.get(self._key(labels), 0)
+
+    def _samples(self):
+        for key, value in self._series.items():
+            yield '', key, (), value
+
+
+class Gauge(_Metric):
+    """Value that can go up and down"""
+    kind = 'gauge'
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = value
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = self._series.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def get(self, **labels):
+        return self._series.get(self._key(labels), 0)
+
+    def _samples(self):
+        for key, value in self._series.items():
+            yield '', key, (), value
+
+
+class Histogram(_Metric):
+    """Cumulative bucketed observations, scrapable as a Prometheus histogram"""
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=METRICS_LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                # [per-bucket counts (last one is +Inf), sum, count]
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def _samples(self):
+        for key, (counts, total, count) in self._series.items():
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                yield '_bucket', key, (('le', _format_value(float(bound))),), cumulative
+            yield '_sum', key, (), total
+            yield '_count', key, (), count
+
+
+class MetricsRegistry:
+    """Thread-safe collection of metrics, get-or-create by name"""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric_class, name, documentation, labelnames, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = metric_class(name, documentation, labelnames, **kwargs)
+            elif not isinstance(metric, metric_class) or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"Metric {name} is already registered with a different type or labels")
+            return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter, name, documentation, labelnames)
+
+    def gauge(self, name, documentation, labelnames=()):
+        return self._register(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name, documentation, labelnames=(), buckets=METRICS_LATENCY_BUCKETS):
+        return self._register(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def render(self):
+        """Render all metrics in the Prometheus text exposition format"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return '\n'.join(metric.render() for metric in metrics) + '\n'
+
+
+# Global registry shared by every session in this process
+registry = MetricsRegistry()
+
+API_CALLS = registry.counter(
+    'etsy_ai_api_calls_total', 'API calls by endpoint, step and outcome', ('endpoint', 'step', 'outcome'))
+API_LATENCY = registry.histogram(
+    'etsy_ai_api_latency_seconds', 'API call latency in seconds', ('endpoint', 'step', 'outcome'))
+CACHE_REQUESTS = registry.counter(
+    'etsy_ai_cache_requests_total', 'Response cache lookups by result', ('result',))
+RATE_LIMIT_WAITS = registry.counter(
+    'etsy_ai_rate_limit_waits_total', 'Requests delayed or rejected by the rate limiter', ('action',))
+RATE_LIMIT_WAIT_SECONDS = registry.histogram(
+    'etsy_ai_rate_limit_wait_seconds', 'Time spent sleeping on the rate limiter')
+ERRORS = registry.counter(
+    'etsy_ai_errors_total', 'Logged errors by type', ('error_type',))
+FEATURE_USAGE = registry.counter(
+    'etsy_ai_feature_usage_total', 'Feature usage by feature', ('feature',))
+ACTIVE_SESSIONS = registry.gauge(
+    'etsy_ai_active_sessions', 'Sessions registered with the memory accountant')
+SESSION_MEMORY_BYTES = registry.gauge(
+    'etsy_ai_session_memory_bytes', 'Estimated memory held by all sessions')
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    """Serves the registry at /metrics"""
+
+    def do_GET(self):
+        if self.path.split('?')[0] not in ('/', '/metrics'):
+            self.send_error(404)
+            return
+        body = registry.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_metrics_server(port, host=METRICS_HOST):
+    """Serve metrics over HTTP from a daemon thread"""
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='metrics-server', daemon=True).start()
+    return server
+
+
+def write_metrics_file(path):
+    """Atomically write the current metrics to a file (for node_exporter's textfile collector)"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        f.write(registry.render())
+    os.replace(temp_path, path)
+
+
+def _write_metrics_file_forever(path, interval):
+    while True:
+        try:
+            write_metrics_file(path)
+        except OSError:
+            pass
+        time.sleep(interval)
+
+
+_exporter_started = False
+_exporter_lock = threading.Lock()
+
+
+def start_metrics_exporter():
+    """Start the HTTP endpoint and/or file writer configured in the environment (once per process)"""
+    global _exporter_started
+    with _exporter_lock:
+        if _exporter_started:
+            return
+        _exporter_started = True
+
+        port = get_metrics_port()
+        if port:
+            try:
+                start_metrics_server(port)
+            except OSError:
+                # Another process (e.g. a second app instance) already owns the port
+                pass
+
+        path = get_metrics_file()
+        if path:
+            threading.Thread(
+                target=_write_metrics_file_forever, args=(path, METRICS_FILE_INTERVAL),
+                name='metrics-file-writer', daemon=True
+            ).start()
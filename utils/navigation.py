@@ -0,0 +1,46 @@
+"""
+Step navigation utilities for Etsy AI Assistant
+Query-param step router: only the active step renders on each rerun
+"""
+import streamlit as st
+from config.settings import TOTAL_STEPS, STEP_QUERY_PARAM, STEP_WIDGET_PREFIX
+from .context import mark_dirty
+
+
+def _parse_step(value):
+    """Get a valid 1-based step number from a query param value, or None"""
+    try:
+        step = int(value)
+    except (TypeError, ValueError):
+        return None
+    return step if 1 <= step <= TOTAL_STEPS else None
+
+
+def get_active_step():
+    """Get the active step from the URL, falling back to the one last shown in this session"""
+    if st.runtime.exists():
+        step = _parse_step(st.query_params.get(STEP_QUERY_PARAM))
+        if step is not None:
+            if st.session_state['ui_state'].get('active_tab') != step - 1:
+                st.session_state['ui_state']['active_tab'] = step - 1
+                mark_dirty('ui_state')
+            return step
+    return st.session_state['ui_state'].get('active_tab', 0) + 1
+
+
+def set_active_step(step):
+    """Make a step active and record it in the URL so reloads and links open it"""
+    step = min(max(int(step), 1), TOTAL_STEPS)
+    st.session_state['ui_state']['active_tab'] = step - 1
+    mark_dirty('ui_state')
+    if st.runtime.exists():
+        st.query_params[STEP_QUERY_PARAM] = str(step)
+    return step
+
+
+def keep_widget_state(active_step, prefix=STEP_WIDGET_PREFIX):
+    """Re-assign widget values of hidden steps (keys like 'step9_...') so Streamlit does not drop them"""
+    active_prefix = f"{prefix}{active_step}_"
+    for key in list(st.session_state.keys()):
+        if isinstance(key, str) and key.startswith(prefix) and not key.startswith(active_prefix):
+            st.session_state[key] = st.session_state[key]
@@ -0,0 +1,130 @@
+"""
+Rerun profiling utilities for Etsy AI Assistant
+Times each script rerun, breaks it down by traced function and keeps the slowest reruns
+"""
+import cProfile
+import os
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+from config.settings import PROFILER_REPORT_SIZE, PROFILER_TOP_FUNCTIONS, PROFILE_DIR
+from config.env_config import get_profiler_backend
+from .histogram import LatencyHistogram
+from .records import RerunRecord
+from .tracing import span
+
+try:
+    import pyinstrument
+except ImportError:
+    pyinstrument = None
+
+
+_slowest_reruns = []  # RerunRecord, slowest first
+_rerun_histogram = LatencyHistogram()
+_report_lock = threading.Lock()
+
+
+def get_span_breakdown(root):
+    """Get self time in ms per span name for a finished trace, largest first"""
+    child_time = {}
+    for s in root.trace.spans:
+        if s.parent is not None:
+            child_time[id(s.parent)] = child_time.get(id(s.parent), 0) + s.duration
+
+    breakdown = {}
+    for s in root.trace.spans:
+        self_time = max(s.duration - child_time.get(id(s), 0), 0)
+        breakdown[s.name] = breakdown.get(s.name, 0) + self_time * 1000
+    return dict(sorted(breakdown.items(), key=lambda item: item[1], reverse=True))
+
+
+def _profile_path(session_id, extension):
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    return os.path.join(PROFILE_DIR, f"rerun_{time.strftime('%Y%m%d_%H%M%S')}_{int(time.time() * 1000) % 1000:03d}_{session_id[:8]}.{extension}")
+
+
+def _top_functions(profile, limit=PROFILER_TOP_FUNCTIONS):
+    """Get the functions with the most cumulative time from a cProfile run"""
+    stats = pstats.Stats(profile)
+    rows = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:limit]
+    return [
+        {'function': f"{os.path.basename(filename)}:{line}({name})", 'calls': calls, 'cumulative_ms': cumulative * 1000}
+        for (filename, line, name), (_, calls, _, cumulative, _) in rows
+    ]
+
+
+@contextmanager
+def profile_rerun(session_id='local', enabled=True, name="rerun"):
+    """Run one script (or fragment) rerun as a traced span; when enabled, time and record it in the report"""
+    backend = get_profiler_backend() if enabled else None
+    profiler = None
+    if backend == 'cprofile':
+        profiler = cProfile.Profile()
+    elif backend == 'pyinstrument' and pyinstrument is not None:
+        profiler = pyinstrument.Profiler()
+
+    with span(name) as root:
+        if backend == 'cprofile':
+            profiler.enable()
+        elif profiler is not None:
+            profiler.start()
+        try:
+            yield root
+        finally:
+            if backend == 'cprofile':
+                profiler.disable()
+            elif profiler is not None:
+                profiler.stop()
+
+    if not enabled:
+        return
+
+    record = RerunRecord(
+        timestamp=time.time(),
+        session_id=session_id,
+        name=name,
+        duration=root.duration,
+        breakdown=get_span_breakdown(root)
+    )
+    if backend == 'cprofile':
+        record.profile_path = _profile_path(session_id, 'prof')
+        profiler.dump_stats(record.profile_path)
+        record.top_functions = _top_functions(profiler)
+    elif profiler is not None:
+        record.profile_path = _profile_path(session_id, 'html')
+        with open(record.profile_path, 'w', encoding='utf-8') as f:
+            f.write(profiler.output_html())
+
+    _add_to_report(record)
+
+
+def _add_to_report(record):
+    """Keep the record if it is among the slowest PROFILER_REPORT_SIZE reruns"""
+    with _report_lock:
+        _rerun_histogram.record(record.duration)
+        if len(_slowest_reruns) < PROFILER_REPORT_SIZE or record.duration > _slowest_reruns[-1].duration:
+            _slowest_reruns.append(record)
+            _slowest_reruns.sort(key=lambda r: r.duration, reverse=True)
+            del _slowest_reruns[PROFILER_REPORT_SIZE:]
+
+
+def get_rerun_report():
+    """Get rerun percentiles and the slowest reruns with their breakdowns"""
+    with _report_lock:
+        percentiles = _rerun_histogram.percentiles()
+        return {
+            'count': _rerun_histogram.count,
+            'p50_ms': percentiles[50] * 1000,
+            'p95_ms': percentiles[95] * 1000,
+            'p99_ms': percentiles[99] * 1000,
+            'slowest': [record.to_dict() for record in _slowest_reruns]
+        }
+
+
+def reset_rerun_report():
+    """Forget all recorded reruns"""
+    global _rerun_histogram
+    with _report_lock:
+        _slowest_reruns.clear()
+        _rerun_histogram = LatencyHistogram()
@@ -2,73 +2,137 @@
 Rate limiting utilities for Etsy AI Assistant
 """
 import streamlit as st
+import threading
 import time
+from collections import deque
+from config.settings import RATE_LIMIT_REQUESTS, RATE_LIMIT_WINDOW
+from .context import get_session
+from .metrics import RATE_LIMIT_WAITS, RATE_LIMIT_WAIT_SECONDS
+from .tracing import span
 
 
 class RateLimiter:
     def __init__(self, max_requests=60, window_seconds=60):
+        session = get_session()
         self.max_requests = max_requests
         self.window_seconds = window_seconds
-        if 'rate_limit_requests' not in st.session_state:
-            st.session_state['rate_limit_requests'] = []
+        if 'rate_limit_requests' not in session:
+            session['rate_limit_requests'] = []
     
     def can_make_request(self):
         """Check if a request can be made within rate limits"""
+        session = get_session()
         now = time.time()
         # Remove old requests outside the window
-        st.session_state['rate_limit_requests'] = [
-            req_time for req_time in st.session_state['rate_limit_requests'] 
+        session['rate_limit_requests'] = [
+            req_time for req_time in session['rate_limit_requests'] 
             if now - req_time < self.window_seconds
         ]
         
-        return len(st.session_state['rate_limit_requests']) < self.max_requests
+        return len(session['rate_limit_requests']) < self.max_requests
     
     def record_request(self):
         """Record a new request"""
-        st.session_state['rate_limit_requests'].append(time.time())
+        get_session()['rate_limit_requests'].append(time.time())
     
     def get_wait_time(self):
         """Get how long to wait before next request"""
         if self.can_make_request():
             return 0
         
-        oldest_request = min(st.session_state['rate_limit_requests'])
+        oldest_request = min(get_session()['rate_limit_requests'])
         return self.window_seconds - (time.time() - oldest_request)
     
     def get_remaining_requests(self):
         """Get number of remaining requests in current window"""
         now = time.time()
         recent_requests = [
-            req_time for req_time in st.session_state['rate_limit_requests'] 
+            req_time for req_time in get_session()['rate_limit_requests'] 
             if now - req_time < self.window_seconds
         ]
         return max(0, self.max_requests - len(recent_requests))
 
 
+class SharedRateLimiter:
+    """Thread-safe sliding window shared by concurrent headless sessions; acquire() blocks for a slot"""
+    
+    def __init__(self, max_requests=RATE_LIMIT_REQUESTS, window_seconds=RATE_LIMIT_WINDOW):
+        self.max_requests = max_requests
+        self.window_seconds = window_seconds
+        self._requests = deque()
+        self._lock = threading.Lock()
+    
+    def _expire(self, now):
+        while self._requests and now - self._requests[0] >= self.window_seconds:
+            self._requests.popleft()
+    
+    def acquire(self):
+        """Wait until a request slot is free and take it; returns the seconds waited"""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.time()
+                self._expire(now)
+                if len(self._requests) < self.max_requests:
+                    self._requests.append(now)
+                    return waited
+                wait_time = self.window_seconds - (now - self._requests[0])
+            time.sleep(wait_time)
+            waited += wait_time
+    
+    def get_remaining_requests(self):
+        """Get number of remaining requests in current window"""
+        with self._lock:
+            self._expire(time.time())
+            return max(0, self.max_requests - len(self._requests))
+
+
 # Global rate limiter instance
 rate_limiter = RateLimiter(max_requests=30, window_seconds=60)  # 30 requests per minute
 
 
+def acquire_request_slot():
+    """Wait for (or reject) a request slot under the rate limit and record the request"""
+    # Headless sessions running side by side share one limiter and queue for it
+    shared_limiter = get_session().get('shared_rate_limiter')
+    if shared_limiter is not None:
+        with span("rate_limit") as rate_limit_span:
+            wait_time = shared_limiter.acquire()
+            if wait_time:
+                rate_limit_span.set_attribute("wait_seconds", round(wait_time, 3))
+                RATE_LIMIT_WAITS.inc(action='waited')
+                RATE_LIMIT_WAIT_SECONDS.observe(wait_time)
+        return
+    
+    with span("rate_limit") as rate_limit_span:
+        if not rate_limiter.can_make_request():
+            wait_time = rate_limiter.get_wait_time()
+            rate_limit_span.set_attribute("wait_seconds", round(wait_time, 3))
+            
+            # Show rate limit warning
+            if get_session().interactive:
+                st.warning(f"⏱️ Rate limit reached. Please wait {wait_time:.1f} seconds before next request.")
+            
+            # If wait time is reasonable, wait and proceed
+            if wait_time <= 5:  # Only wait if less than 5 seconds
+                RATE_LIMIT_WAITS.inc(action='waited')
+                RATE_LIMIT_WAIT_SECONDS.observe(wait_time)
+                time.sleep(wait_time)
+            else:
+                RATE_LIMIT_WAITS.inc(action='rejected')
+                # Import locally to avoid circular dependency
+                import importlib
+                error_module = importlib.import_module('utils.error_handler')
+                APIError = error_module.APIError
+                raise APIError(f"Rate limit exceeded. Please wait {wait_time:.1f} seconds.")
+        
+        # Record the request
+        rate_limiter.record_request()
+
+
 def throttled_api_call(func, *args, **kwargs):
     """Make API call with rate limiting"""
-    if not rate_limiter.can_make_request():
-        wait_time = rate_limiter.get_wait_time()
-        
-        # Show rate limit warning
-        st.warning(f"⏱️ Rate limit reached. Please wait {wait_time:.1f} seconds before next request.")
-        
-        # If wait time is reasonable, wait and proceed
-        if wait_time <= 5:  # Only wait if less than 5 seconds
-            time.sleep(wait_time)
-        else:
-            # Import locally to avoid circular dependency
-            import importlib
-            error_module = importlib.import_module('utils.error_handler')
-            APIError = error_module.APIError
-            raise APIError(f"Rate limit exceeded. Please wait {wait_time:.1f} seconds.")
-    
-    # Record the request
-    rate_limiter.record_request()
+    acquire_request_slot()
     
     # Make the actual API call
     return func(*args, **kwargs)
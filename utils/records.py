@@ -0,0 +1,72 @@
+"""
+Compact record types for Etsy AI Assistant
+Slotted dataclasses used for history, analytics and error log entries
+"""
+from dataclasses import dataclass, field, asdict
+
+
+@dataclass(slots=True)
+class ApiCallRecord:
+    """Single tracked API call"""
+    timestamp: float
+    endpoint: str
+    duration: float
+    success: bool = True
+
+    def to_dict(self):
+        return asdict(self)
+
+
+@dataclass(slots=True)
+class ErrorRecord:
+    """Single error log entry"""
+    timestamp: float
+    error_type: str
+    message: str
+    context: dict = field(default_factory=dict)
+    stack_trace: str = None
+
+    def to_dict(self):
+        return asdict(self)
+
+
+@dataclass(slots=True)
+class RerunRecord:
+    """Timing of one script rerun"""
+    timestamp: float
+    session_id: str
+    name: str
+    duration: float
+    breakdown: dict = field(default_factory=dict)  # span name -> self time in ms
+    profile_path: str = None
+    top_functions: list = field(default_factory=list)
+
+    def to_dict(self):
+        return asdict(self)
+
+
+@dataclass(slots=True)
+class HistoryEntry:
+    """Single content history entry; content may live in the blob store as content_ref"""
+    id: str
+    content_type: str
+    content: str = None
+    prompt_used: str = None
+    timestamp: float = 0.0
+    metadata: dict = field(default_factory=dict)
+    favorited: bool = False
+    tags: list = field(default_factory=list)
+    content_ref: str = None
+
+    def to_dict(self, content=None):
+        """Export in the history entry dict format, optionally with resolved content"""
+        return {
+            'id': self.id,
+            'content_type': self.content_type,
+            'content': content if content is not None else self.content,
+            'prompt_used': self.prompt_used,
+            'timestamp': self.timestamp,
+            'metadata': self.metadata,
+            'favorited': self.favorited,
+            'tags': self.tags
+        }
\ No newline at end of file
@@ -0,0 +1,136 @@
+"""
+Search index utilities for Etsy AI Assistant
+Incremental inverted index with prefix matching and BM25 ranking
+"""
+import bisect
+import math
+import re
+from collections import Counter
+
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+
+def tokenize(text):
+    """Split text into lowercase word tokens"""
+    if not text:
+        return []
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class HistorySearchIndex:
+    """Inverted index mapping tokens to history entry ids"""
+
+    def __init__(self, k1=1.5, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings = {}      # token -> {entry_id: term frequency}
+        self.doc_lengths = {}   # entry_id -> number of indexed tokens
+        self.doc_terms = {}     # entry_id -> set of distinct tokens, used for removal
+        self.vocabulary = []    # sorted tokens for prefix lookups
+        self.total_length = 0
+
+    def __len__(self):
+        return len(self.doc_lengths)
+
+    def __contains__(self, entry_id):
+        return entry_id in self.doc_lengths
+
+    def add(self, entry_id, text):
+        """Index a new entry, replacing any previous version with the same id"""
+        if entry_id in self.doc_lengths:
+            self.remove(entry_id)
+        self.doc_lengths[entry_id] = 0
+        self.doc_terms[entry_id] = set()
+        self.add_terms(entry_id, text)
+
+    def add_terms(self, entry_id, text):
+        """Add more text (e.g. a tag) to an already indexed entry"""
+        tokens = tokenize(text)
+        if not tokens:
+            return
+
+        if entry_id not in self.doc_lengths:
+            self.doc_lengths[entry_id] = 0
+            self.doc_terms[entry_id] = set()
+
+        for token, count in Counter(tokens).items():
+            posting = self.postings.get(token)
+            if posting is None:
+                posting = self.postings[token] = {}
+                bisect.insort(self.vocabulary, token)
+            posting[entry_id] = posting.get(entry_id, 0) + count
+            self.doc_terms[entry_id].add(token)
+
+        self.doc_lengths[entry_id] += len(tokens)
+        self.total_length += len(tokens)
+
+    def remove(self, entry_id):
+        """Remove an entry from the index"""
+        if entry_id not in self.doc_lengths:
+            return
+
+        for token in self.doc_terms.pop(entry_id):
+            posting = self.postings[token]
+            del posting[entry_id]
+            if not posting:
+                del self.postings[token]
+                index = bisect.bisect_left(self.vocabulary, token)
+                del self.vocabulary[index]
+
+        self.total_length -= self.doc_lengths.pop(entry_id)
+
+    def clear(self):
+        """Remove all entries"""
+        self.postings.clear()
+        self.doc_lengths.clear()
+        self.doc_terms.clear()
+        self.vocabulary.clear()
+        self.total_length = 0
+
+    def _expand_prefix(self, term):
+        """Get all indexed tokens starting with term"""
+        start = bisect.bisect_left(self.vocabulary, term)
+        matches = []
+        for token in self.vocabulary[start:]:
+            if not token.startswith(term):
+                break
+            matches.append(token)
+        return matches
+
+    def _term_scores(self, term, prefix):
+        """BM25 scores of every entry matching a single query term"""
+        tokens = self._expand_prefix(term) if prefix else ([term] if term in self.postings else [])
+        doc_count = len(self.doc_lengths)
+        avg_length = self.total_length / doc_count if doc_count else 0
+
+        scores = {}
+        for token in tokens:
+            posting = self.postings[token]
+            idf = math.log(1 + (doc_count - len(posting) + 0.5) / (len(posting) + 0.5))
+            for entry_id, frequency in posting.items():
+                length_norm = 1 - self.b + self.b * self.doc_lengths[entry_id] / (avg_length or 1)
+                score = idf * frequency * (self.k1 + 1) / (frequency + self.k1 * length_norm)
+                scores[entry_id] = scores.get(entry_id, 0.0) + score
+        return scores
+
+    def search(self, query, prefix=True, limit=None):
+        """Find entries containing all query terms, ranked by BM25"""
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+
+        term_scores = [self._term_scores(term, prefix) for term in terms]
+        if not all(term_scores):
+            return []
+
+        # AND semantics: intersect starting from the most selective term
+        term_scores.sort(key=len)
+        matches = set(term_scores[0])
+        for scores in term_scores[1:]:
+            matches.intersection_update(scores)
+            if not matches:
+                return []
+
+        ranked = sorted(matches, key=lambda entry_id: sum(scores[entry_id] for scores in term_scores), reverse=True)
+        return ranked[:limit] if limit else ranked
\ No newline at end of file
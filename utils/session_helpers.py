@@ -1,14 +1,38 @@
 """
 Session state helper functions for Etsy AI Assistant
 """
-import streamlit as st
+import hashlib
+import json
 import time
+import uuid
+from collections import deque
+from config.settings import (
+    HISTORY_BACKEND, HISTORY_DB_PATH, HISTORY_PAGE_SIZE,
+    MAX_API_CALL_HISTORY, MAX_ERROR_LOG_ENTRIES, PRODUCT_FORM_FIELDS
+)
+from .blob_store import BlobStore, get_blob_store, is_blob_content
+from .context import MemorySession, get_session, use_session, mark_dirty
+from .error_handler import log_error
+from .history_store import HistoryStore, generate_entry_id
+from .history_db import SQLiteHistoryStore
+from .records import HistoryEntry
+from .session_store import (
+    SQLiteSession, get_client_token, restore_session_state, load_deferred_key, clear_persisted_session
+)
+from .tracing import span
 
 
 def init_session_state():
     """Initialize all session state variables in one place"""
+    session = get_session()
+    if session.persistent:
+        # Restore the previous snapshot of this client before filling defaults
+        restore_session_state()
+    
     defaults = {
         'language': 'tr',
+        'user_id': get_client_token() if session.persistent else uuid.uuid4().hex,
+        'blob_store': BlobStore(),  # Shared content storage, holders keep digests
         'api_cache': {},
         'cache_stats': {'hits': 0, 'misses': 0},
         'generated_content': {},  # Store generated content by type
@@ -18,50 +42,117 @@ def init_session_state():
             'last_generation_time': None,
             'generation_in_progress': False
         },
-        'content_history': [],
         'saved_projects': {},
         'custom_templates': {},
         'analytics': {
             'session_start': time.time(),
             'page_views': 0,
-            'api_calls': [],
+            'api_calls': deque(maxlen=MAX_API_CALL_HISTORY),
             'feature_usage': {},
-            'performance_metrics': []
+            'performance_metrics': [],
+            'latency': {},
+            'totals': {'calls': 0, 'successful': 0, 'successful_duration': 0.0}
         },
-        'error_log': [],
+        'error_log': deque(maxlen=MAX_ERROR_LOG_ENTRIES),  # Newest first
         'rate_limit_requests': []
     }
     
+    deferred = session.get('_deferred_keys', ())
     for key, default_value in defaults.items():
-        if key not in st.session_state:
-            st.session_state[key] = default_value
+        if key not in session and key not in deferred:
+            session[key] = default_value
+            mark_dirty(key)
+
+
+def create_session(backend='memory', token=None, history_backend=None):
+    """Create an initialized headless session: 'memory', or 'sqlite' to persist under a client token
+
+    history_backend overrides HISTORY_BACKEND for this session, e.g. 'memory' for throwaway bulk sessions.
+    """
+    session = SQLiteSession(token) if backend == 'sqlite' else MemorySession()
+    with use_session(session):
+        init_session_state()
+        if history_backend is not None:
+            session['content_history'] = _create_history_store(history_backend)
+    return session
 
 
 def get_form_data(key, default=""):
     """Get form data with caching"""
-    return st.session_state['form_data'].get(key, default)
+    return get_session()['form_data'].get(key, default)
 
 
 def set_form_data(key, value):
     """Set form data with change detection"""
-    if st.session_state['form_data'].get(key) != value:
-        st.session_state['form_data'][key] = value
+    session = get_session()
+    if session['form_data'].get(key) != value:
+        session['form_data'][key] = value
+        session['form_data']['content_hash'] = get_form_fingerprint(session['form_data'])
+        mark_dirty('form_data')
         return True  # Value changed
     return False  # No change
 
 
+def set_form_values(values):
+    """Commit several form fields at once; the content hash changes only if a value really changed"""
+    form_data = get_session()['form_data']
+    changed = {key: value for key, value in values.items() if form_data.get(key) != value}
+    if changed:
+        form_data.update(changed)
+        form_data['content_hash'] = get_form_fingerprint(form_data)
+        mark_dirty('form_data')
+    return bool(changed)
+
+
+def get_form_fingerprint(form_data=None):
+    """Get a stable fingerprint of the product form, identifying the listing being worked on"""
+    if form_data is None:
+        form_data = get_session()['form_data']
+        if 'content_hash' in form_data:
+            return form_data['content_hash']
+    fields = {key: str(form_data.get(key) or '').strip() for key in PRODUCT_FORM_FIELDS}
+    payload = json.dumps(fields, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:16]
+
+
 def save_generated_content(content_type, content, metadata=None):
     """Save generated content with metadata"""
-    st.session_state['generated_content'][content_type] = {
-        'content': content,
+    session = get_session()
+    previous = session['generated_content'].get(content_type)
+    if previous and 'content_ref' in previous:
+        get_blob_store().release(previous['content_ref'])
+    
+    entry = {
         'timestamp': time.time(),
         'metadata': metadata or {}
     }
+    if is_blob_content(content):
+        entry['content_ref'] = get_blob_store().put(content)
+    else:
+        entry['content'] = content
+    session['generated_content'][content_type] = entry
+    mark_dirty('generated_content', 'blob_store')
 
 
 def get_generated_content(content_type):
     """Get previously generated content"""
-    return st.session_state['generated_content'].get(content_type)
+    entry = get_session()['generated_content'].get(content_type)
+    if entry and 'content_ref' in entry:
+        entry = dict(entry)
+        entry['content'] = get_blob_store().get(entry.pop('content_ref'))
+    return entry
+
+
+def delete_generated_content(content_type):
+    """Remove stored generated content and release its blob"""
+    session = get_session()
+    entry = session['generated_content'].pop(content_type, None)
+    if entry is None:
+        return False
+    if 'content_ref' in entry:
+        get_blob_store().release(entry['content_ref'])
+    mark_dirty('generated_content', 'blob_store')
+    return True
 
 
 def should_regenerate(content_type, max_age_minutes=30):
@@ -74,87 +165,97 @@ def should_regenerate(content_type, max_age_minutes=30):
     return age_minutes > max_age_minutes
 
 
+def get_user_id():
+    """Get the id that partitions this user's persistent data"""
+    session = get_session()
+    if 'user_id' not in session:
+        session['user_id'] = uuid.uuid4().hex
+        mark_dirty('user_id')
+    return session['user_id']
+
+
+def _create_history_store(backend=HISTORY_BACKEND):
+    """Create the configured history store, falling back to memory"""
+    if backend == 'sqlite':
+        try:
+            return SQLiteHistoryStore(HISTORY_DB_PATH, get_user_id())
+        except Exception as e:
+            log_error(e, {'operation': 'history_db_open', 'db_path': HISTORY_DB_PATH})
+    return HistoryStore(blob_store=get_blob_store())
+
+
+def get_history_store():
+    """Get the content history store"""
+    session = get_session()
+    if 'content_history' not in session and not load_deferred_key('content_history'):
+        session['content_history'] = _create_history_store()
+        mark_dirty('content_history')
+    
+    store = session['content_history']
+    if isinstance(store, HistoryStore) and store.blob_store is None:
+        store.blob_store = get_blob_store()
+    return store
+
+
+def get_history_page(limit=HISTORY_PAGE_SIZE, before=None, content_type=None, favorited=None, since=None, until=None):
+    """Get one page of history newest first, returns (entries, next_cursor)"""
+    return get_history_store().page(
+        limit=limit, before=before, content_type=content_type,
+        favorited=favorited, since=since, until=until
+    )
+
+
+def get_history(limit=None):
+    """Get history entries, newest first"""
+    return get_history_store().newest(limit)
+
+
 def add_to_history(content_type, content, prompt_used=None, metadata=None):
     """Add content to history with enhanced metadata"""
-    if 'content_history' not in st.session_state:
-        st.session_state['content_history'] = []
-    
-    history_entry = {
-        'id': f"{content_type}_{int(time.time())}",
-        'content_type': content_type,
-        'content': content,
-        'prompt_used': prompt_used,
-        'timestamp': time.time(),
-        'metadata': metadata or {},
-        'favorited': False,
-        'tags': []
-    }
+    history_entry = HistoryEntry(
+        id=generate_entry_id(content_type),
+        content_type=content_type,
+        content=content,
+        prompt_used=prompt_used,
+        timestamp=time.time(),
+        metadata=metadata or {}
+    )
     
-    # Add to beginning of list (newest first)
-    st.session_state['content_history'].insert(0, history_entry)
-    
-    # Keep only last 100 items to prevent memory issues
-    if len(st.session_state['content_history']) > 100:
-        st.session_state['content_history'] = st.session_state['content_history'][:100]
+    with span("add_to_history", content_type=content_type):
+        get_history_store().add(history_entry)
+    mark_dirty('content_history', 'blob_store')
+    return history_entry.id
 
 
 def search_history(query):
-    """Search through history"""
-    if 'content_history' not in st.session_state:
-        return []
-    
-    query = query.lower()
-    results = []
-    
-    for entry in st.session_state['content_history']:
-        # Search in content, content_type, and tags
-        if (query in entry.get('content', '').lower() or 
-            query in entry.get('content_type', '').lower() or
-            query in ' '.join(entry.get('tags', [])).lower()):
-            results.append(entry)
-    
-    return results
+    """Search through history (all terms must match, prefixes allowed, BM25 ranked)"""
+    return get_history_store().search(query)
 
 
 def toggle_favorite(entry_id):
     """Toggle favorite status of a history entry"""
-    if 'content_history' not in st.session_state:
-        return False
-    
-    for entry in st.session_state['content_history']:
-        if entry['id'] == entry_id:
-            entry['favorited'] = not entry.get('favorited', False)
-            return True
-    
-    return False
+    favorited = get_history_store().toggle_favorite(entry_id)
+    mark_dirty('content_history')
+    return favorited
 
 
 def add_tag_to_entry(entry_id, tag):
     """Add tag to history entry"""
-    if 'content_history' not in st.session_state:
-        return False
-    
-    for entry in st.session_state['content_history']:
-        if entry['id'] == entry_id:
-            if 'tags' not in entry:
-                entry['tags'] = []
-            if tag not in entry['tags']:
-                entry['tags'].append(tag)
-            return True
-    
-    return False
+    added = get_history_store().add_tag(entry_id, tag)
+    mark_dirty('content_history')
+    return added
+
+
+def delete_history_entry(entry_id):
+    """Delete a history entry"""
+    deleted = get_history_store().delete(entry_id)
+    mark_dirty('content_history', 'blob_store')
+    return deleted
 
 
 def get_content_types_from_history():
     """Get all unique content types from history"""
-    if 'content_history' not in st.session_state:
-        return []
-    
-    types = set()
-    for entry in st.session_state['content_history']:
-        types.add(entry.get('content_type', 'Unknown'))
-    
-    return sorted(list(types))
+    return get_history_store().get_content_types()
 
 
 def format_timestamp(timestamp):
@@ -164,11 +265,16 @@ def format_timestamp(timestamp):
 
 def clear_session_data():
     """Clear all session data (for logout/reset)"""
-    keys_to_keep = ['language']  # Keep language preference
+    session = get_session()
+    keys_to_keep = ['language', 'user_id', '_client_token']  # Keep language preference and client identity
+    
+    if session.persistent:
+        clear_persisted_session()
     
-    for key in list(st.session_state.keys()):
+    for key in list(session.keys()):
         if key not in keys_to_keep:
-            del st.session_state[key]
+            del session[key]
+            mark_dirty(key)
     
     # Reinitialize
     init_session_state() 
\ No newline at end of file
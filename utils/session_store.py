@@ -0,0 +1,208 @@
+"""
+Session persistence utilities for Etsy AI Assistant
+Snapshots session state server-side so a browser reload restores the previous state
+"""
+import streamlit as st
+import pickle
+import re
+import time
+import uuid
+from config.settings import (
+    SESSION_DB_PATH, SESSION_TOKEN_PARAM, PERSISTED_SESSION_KEYS, DEFERRED_SESSION_KEYS, SESSION_SNAPSHOT_TTL_DAYS
+)
+from .context import MemorySession, get_session, use_session, mark_dirty
+from .history_db import get_database
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS session_snapshots (
+    token TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value BLOB NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (token, key)
+);
+CREATE INDEX IF NOT EXISTS idx_session_snapshots_updated ON session_snapshots (updated_at);
+"""
+
+TOKEN_PATTERN = re.compile(r'^[0-9a-f]{32}$')
+
+_expired_sessions_purged = False
+
+
+def _get_db():
+    """Get the session snapshot database"""
+    return get_database(SESSION_DB_PATH, SCHEMA)
+
+
+def get_client_token():
+    """Get the persistent client token, stored in the page URL so reloads keep it"""
+    session = get_session()
+    if '_client_token' in session:
+        return session['_client_token']
+
+    token = None
+    if session.interactive and st.runtime.exists():
+        token = st.query_params.get(SESSION_TOKEN_PARAM)
+        if token and TOKEN_PATTERN.match(token):
+            session['_token_from_link'] = True
+        else:
+            token = uuid.uuid4().hex
+            st.query_params[SESSION_TOKEN_PARAM] = token
+    else:
+        token = uuid.uuid4().hex
+
+    session['_client_token'] = token
+    return token
+
+
+def _rotate_client_token(token):
+    """Move a snapshot restored from a link to a fresh token, so the old link stops opening this session"""
+    session = get_session()
+    new_token = uuid.uuid4().hex
+    _get_db().execute("UPDATE session_snapshots SET token = ? WHERE token = ?", (new_token, token))
+    session['_client_token'] = new_token
+    st.query_params[SESSION_TOKEN_PARAM] = new_token
+    return new_token
+
+
+def _load_value(key, data):
+    """Unpickle a snapshot value into the session; returns False if it cannot be read"""
+    try:
+        get_session()[key] = pickle.loads(data)
+    except Exception:
+        # Snapshot written by an incompatible version, start this key fresh
+        return False
+    return True
+
+
+def restore_session_state():
+    """Load the snapshot for this client into a new session (runs once per session)
+
+    Keys in DEFERRED_SESSION_KEYS are only noted here and loaded by load_deferred_key on first use.
+    """
+    session = get_session()
+    if session.get('_session_restored'):
+        return 0
+
+    global _expired_sessions_purged
+    if not _expired_sessions_purged:
+        purge_expired_sessions()
+        _expired_sessions_purged = True
+
+    token = get_client_token()
+    session['_session_restored'] = True
+    session['_dirty_keys'] = set()
+    session['_deferred_keys'] = set()
+
+    rows = _get_db().execute(
+        "SELECT key, CASE WHEN key IN ({}) THEN NULL ELSE value END FROM session_snapshots WHERE token = ?".format(
+            ', '.join('?' * len(DEFERRED_SESSION_KEYS))
+        ),
+        (*DEFERRED_SESSION_KEYS, token)
+    )
+
+    restored = 0
+    for key, data in rows:
+        if key in session or key not in PERSISTED_SESSION_KEYS:
+            continue
+        if key in DEFERRED_SESSION_KEYS:
+            session['_deferred_keys'].add(key)
+        elif _load_value(key, data):
+            restored += 1
+
+    if rows and session.get('_token_from_link'):
+        if 'user_id' not in session:
+            # Snapshots from before user ids were persisted partition their data by the link token
+            session['user_id'] = token
+            mark_dirty('user_id')
+        _rotate_client_token(token)
+
+    return restored
+
+
+def load_deferred_key(key):
+    """Load a large key whose restore was deferred; returns True if it was loaded from the snapshot"""
+    session = get_session()
+    deferred = session.get('_deferred_keys')
+    if not deferred or key not in deferred:
+        return False
+
+    deferred.discard(key)
+    rows = _get_db().execute(
+        "SELECT value FROM session_snapshots WHERE token = ? AND key = ?",
+        (get_client_token(), key)
+    )
+    return bool(rows) and key not in session and _load_value(key, rows[0][0])
+
+
+def persist_session_state():
+    """Write only the session keys marked dirty since the last snapshot"""
+    session = get_session()
+    dirty = session.get('_dirty_keys')
+    if not session.get('_session_restored') or not dirty:
+        return 0
+
+    token = get_client_token()
+    now = time.time()
+    statements = []
+
+    for key in dirty.intersection(PERSISTED_SESSION_KEYS):
+        if key not in session:
+            statements.append((
+                "DELETE FROM session_snapshots WHERE token = ? AND key = ?",
+                (token, key)
+            ))
+            continue
+        try:
+            data = pickle.dumps(session[key], protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            continue
+        statements.append((
+            "INSERT OR REPLACE INTO session_snapshots (token, key, value, updated_at) VALUES (?, ?, ?, ?)",
+            (token, key, data, now)
+        ))
+
+    dirty.clear()
+    if statements:
+        _get_db().execute_many(statements)
+    return len(statements)
+
+
+def clear_persisted_session(token=None):
+    """Delete the stored snapshot of a client"""
+    session = get_session()
+    token = token or get_client_token()
+    _get_db().execute("DELETE FROM session_snapshots WHERE token = ?", (token,))
+    for key in ('_dirty_keys', '_deferred_keys'):
+        if key in session:
+            session[key] = set()
+
+
+def purge_expired_sessions(max_age_days=SESSION_SNAPSHOT_TTL_DAYS):
+    """Delete snapshots of clients not seen for max_age_days"""
+    cutoff = time.time() - max_age_days * 86400
+    _get_db().execute(
+        "DELETE FROM session_snapshots WHERE token IN "
+        "(SELECT token FROM session_snapshots GROUP BY token HAVING MAX(updated_at) < ?)",
+        (cutoff,)
+    )
+
+
+class SQLiteSession(MemorySession):
+    """In-process state restored from and snapshotted to the session database under a client token"""
+    persistent = True
+
+    def __init__(self, token=None):
+        super().__init__({'_client_token': token or uuid.uuid4().hex})
+        self._session_id = self['_client_token']
+
+    def load(self):
+        """Restore the stored snapshot; returns the number of keys restored"""
+        with use_session(self):
+            return restore_session_state()
+
+    def save(self):
+        """Write the keys marked dirty since the last load or save; returns the number written"""
+        with use_session(self):
+            return persist_session_state()
@@ -0,0 +1,201 @@
+"""
+Tracing utilities for Etsy AI Assistant
+Lightweight nested spans with monotonic timing, a ring buffer of recent traces tagged by session and JSONL export
+"""
+import functools
+import json
+import os
+import secrets
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from config.settings import TRACE_BUFFER_SIZE, TRACE_MAX_SPANS
+from config.env_config import get_trace_file
+from .context import get_session
+
+
+_current_span = ContextVar('current_span', default=None)
+_trace_session = ContextVar('trace_session', default=None)
+_recent_traces = deque(maxlen=TRACE_BUFFER_SIZE)
+_traces_lock = threading.Lock()
+_export_lock = threading.Lock()
+
+
+class _Trace:
+    """Spans sharing one root, owned by the session that started it; wall clock is sampled once, offsets come from perf_counter"""
+    __slots__ = ('trace_id', 'session_id', 'spans', 'start_time', 'start_perf', 'dropped')
+
+    def __init__(self, session_id):
+        self.trace_id = secrets.token_hex(16)
+        self.session_id = session_id
+        self.spans = []
+        self.start_time = time.time()
+        self.start_perf = time.perf_counter()
+        self.dropped = 0
+
+
+class Span:
+    """One timed stage of work"""
+    __slots__ = ('trace', 'span_id', 'parent', 'name', 'attributes', 'start', 'end', 'depth', 'status')
+
+    def __init__(self, name, trace, parent, attributes):
+        self.trace = trace
+        self.span_id = secrets.token_hex(8)
+        self.parent = parent
+        self.name = name
+        self.attributes = attributes
+        self.start = time.perf_counter()
+        self.end = None
+        self.depth = parent.depth + 1 if parent is not None else 0
+        self.status = 'ok'
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    @property
+    def duration(self):
+        return (self.end if self.end is not None else time.perf_counter()) - self.start
+
+    def to_otlp(self):
+        """Export in the OTLP/JSON span shape"""
+        trace = self.trace
+        start_ns = int((trace.start_time + self.start - trace.start_perf) * 1e9)
+        end_ns = start_ns + int(self.duration * 1e9)
+        return {
+            'traceId': trace.trace_id,
+            'spanId': self.span_id,
+            'parentSpanId': self.parent.span_id if self.parent is not None else '',
+            'name': self.name,
+            'startTimeUnixNano': start_ns,
+            'endTimeUnixNano': end_ns,
+            'attributes': [
+                {'key': key, 'value': {'stringValue': str(value)}} for key, value in self.attributes.items()
+            ],
+            'status': {'code': 2 if self.status == 'error' else 1}
+        }
+
+
+@contextmanager
+def span(name, **attributes):
+    """Time a block as a span nested under the current one; a span without a parent starts a trace"""
+    parent = _current_span.get()
+    trace = parent.trace if parent is not None else _Trace(_get_trace_session())
+    current = Span(name, trace, parent, attributes)
+    if len(trace.spans) < TRACE_MAX_SPANS:
+        trace.spans.append(current)
+    else:
+        trace.dropped += 1
+
+    token = _current_span.set(current)
+    try:
+        yield current
+    except Exception as e:
+        current.status = 'error'
+        current.attributes['error'] = type(e).__name__
+        raise
+    finally:
+        current.end = time.perf_counter()
+        _current_span.reset(token)
+        if parent is None:
+            _finish_trace(trace)
+
+
+def traced(name=None):
+    """Decorator that runs a function inside a span"""
+    def decorator(func):
+        span_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def trace_session(session_id):
+    """Attribute traces started in a block to a session, for work running off the session's script thread"""
+    token = _trace_session.set(session_id)
+    try:
+        yield
+    finally:
+        _trace_session.reset(token)
+
+
+def _get_trace_session():
+    session_id = _trace_session.get()
+    return session_id if session_id is not None else get_session().session_id
+
+
+def get_current_span():
+    """Get the innermost open span, or None"""
+    return _current_span.get()
+
+
+def _finish_trace(trace):
+    """Keep a finished trace in the ring buffer and export it if a trace file is configured"""
+    with _traces_lock:
+        _recent_traces.append(trace)
+
+    path = get_trace_file()
+    if path:
+        try:
+            export_trace(trace, path)
+        except OSError:
+            pass
+
+
+def export_trace(trace, path):
+    """Append a trace's spans to a JSONL file, one OTLP/JSON span per line"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    lines = ''.join(json.dumps(s.to_otlp(), ensure_ascii=False) + '\n' for s in trace.spans)
+    with _export_lock:
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(lines)
+
+
+def get_recent_traces(limit=TRACE_BUFFER_SIZE, name=None, session_id=None):
+    """Get recent finished traces, newest first, as waterfall-ready dicts; only one session's when session_id is given"""
+    with _traces_lock:
+        traces = list(_recent_traces)
+
+    result = []
+    for trace in reversed(traces):
+        root = trace.spans[0]
+        if name is not None and root.name != name:
+            continue
+        if session_id is not None and trace.session_id != session_id:
+            continue
+        result.append({
+            'trace_id': trace.trace_id,
+            'session_id': trace.session_id,
+            'name': root.name,
+            'start_time': trace.start_time,
+            'duration_ms': root.duration * 1000,
+            'dropped_spans': trace.dropped,
+            'spans': [
+                {
+                    'name': s.name,
+                    'depth': s.depth,
+                    'offset_ms': (s.start - root.start) * 1000,
+                    'duration_ms': s.duration * 1000,
+                    'status': s.status,
+                    'attributes': dict(s.attributes)
+                }
+                for s in trace.spans
+            ]
+        })
+        if len(result) >= limit:
+            break
+    return result
+
+
+def clear_traces():
+    """Drop all buffered traces"""
+    with _traces_lock:
+        _recent_traces.clear()
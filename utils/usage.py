@@ -0,0 +1,174 @@
+"""
+Token usage and cost utilities for Etsy AI Assistant
+Per-call usage capture aggregated per step, listing, session and day
+"""
+import time
+from config.settings import MODEL_PRICES, LISTING_COST_BUDGET_USD, USAGE_DB_PATH, BATCH_PRICE_FACTOR
+from .analytics import get_current_step
+from .context import get_session, mark_dirty
+from .error_handler import APIError, EtsyAIError, log_error
+from .history_db import get_database
+from .metrics import registry
+from .session_helpers import get_form_fingerprint
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS usage_daily (
+    day TEXT NOT NULL,
+    model TEXT NOT NULL,
+    step TEXT NOT NULL,
+    calls INTEGER NOT NULL DEFAULT 0,
+    prompt_tokens INTEGER NOT NULL DEFAULT 0,
+    completion_tokens INTEGER NOT NULL DEFAULT 0,
+    images INTEGER NOT NULL DEFAULT 0,
+    cost REAL NOT NULL DEFAULT 0,
+    cache_hits INTEGER NOT NULL DEFAULT 0,
+    saved_cost REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, model, step)
+);
+"""
+
+TOKENS = registry.counter('etsy_ai_tokens_total', 'Tokens used by model and kind', ('model', 'kind'))
+COST = registry.counter('etsy_ai_cost_usd_total', 'Estimated API cost in USD by model and step', ('model', 'step'))
+SAVED_COST = registry.counter('etsy_ai_saved_cost_usd_total', 'API cost avoided by cache hits, by step', ('step',))
+
+USAGE_FIELDS = ('calls', 'prompt_tokens', 'completion_tokens', 'images', 'cost', 'cache_hits', 'saved_cost')
+
+
+def _new_totals():
+    return dict.fromkeys(USAGE_FIELDS, 0)
+
+
+def _get_usage():
+    """Get the session usage dict"""
+    session = get_session()
+    if 'usage' not in session:
+        session['usage'] = {'total': _new_totals(), 'by_step': {}, 'by_listing': {}}
+    return session['usage']
+
+
+def _get_db():
+    return get_database(USAGE_DB_PATH, SCHEMA)
+
+
+def calculate_cost(model, prompt_tokens=0, completion_tokens=0, images=0, size=None, batch=False):
+    """Estimate the USD cost of a call from the price table; unpriced models or sizes are logged and cost 0"""
+    prices = MODEL_PRICES.get(model)
+    if prices is None:
+        log_error(EtsyAIError(f"No price for model {model}", 'unknown_price', {'model': model}))
+        prices = {}
+    cost = (prompt_tokens * prices.get('prompt', 0) + completion_tokens * prices.get('completion', 0)) / 1000
+    if images:
+        if size not in prices and model in MODEL_PRICES:
+            log_error(EtsyAIError(f"No price for {model} size {size}", 'unknown_price', {'model': model, 'size': size}))
+        cost += images * prices.get(size, 0)
+    return cost * BATCH_PRICE_FACTOR if batch else cost
+
+
+def extract_usage(response):
+    """Get (prompt_tokens, completion_tokens) from an API response"""
+    usage = getattr(response, 'usage', None)
+    if usage is None:
+        return 0, 0
+    return getattr(usage, 'prompt_tokens', 0) or 0, getattr(usage, 'completion_tokens', 0) or 0
+
+
+def _record(usage_delta, model):
+    """Add a usage delta to the step, listing, session and daily aggregates"""
+    step = get_current_step()
+    step_key = str(step) if step is not None else 'none'
+    usage = _get_usage()
+
+    for totals in (usage['total'], usage['by_step'].setdefault(step_key, _new_totals())):
+        for field, value in usage_delta.items():
+            totals[field] += value
+
+    if usage_delta.get('cost'):
+        listing = get_form_fingerprint()
+        usage['by_listing'][listing] = usage['by_listing'].get(listing, 0) + usage_delta['cost']
+    mark_dirty('usage')
+
+    columns = ', '.join(usage_delta)
+    _get_db().execute(
+        f"""
+        INSERT INTO usage_daily (day, model, step, {columns}) VALUES (?, ?, ?{', ?' * len(usage_delta)})
+        ON CONFLICT (day, model, step) DO UPDATE SET
+        {', '.join(f'{field} = {field} + excluded.{field}' for field in usage_delta)}
+        """,
+        (time.strftime('%Y-%m-%d'), model, step_key, *usage_delta.values())
+    )
+    return step_key
+
+
+def track_usage(model, prompt_tokens=0, completion_tokens=0, images=0, size=None, batch=False):
+    """Record the usage of one API call (or Batch API request); returns the usage dict to keep with cached responses"""
+    cost = calculate_cost(model, prompt_tokens, completion_tokens, images, size, batch)
+    step_key = _record({
+        'calls': 1,
+        'prompt_tokens': prompt_tokens,
+        'completion_tokens': completion_tokens,
+        'images': images,
+        'cost': cost
+    }, model)
+
+    if prompt_tokens:
+        TOKENS.inc(prompt_tokens, model=model, kind='prompt')
+    if completion_tokens:
+        TOKENS.inc(completion_tokens, model=model, kind='completion')
+    COST.inc(cost, model=model, step=step_key)
+
+    return {'model': model, 'prompt_tokens': prompt_tokens, 'completion_tokens': completion_tokens, 'cost': cost}
+
+
+def track_cache_savings(usage):
+    """Record a cache hit and the cost the original call would have had again"""
+    saved = usage['cost'] if usage else 0
+    model = usage['model'] if usage else 'unknown'
+    step_key = _record({'cache_hits': 1, 'saved_cost': saved}, model)
+    SAVED_COST.inc(saved, step=step_key)
+
+
+def get_listing_cost(fingerprint=None):
+    """Get the cost spent on the current (or given) listing in this session"""
+    return _get_usage()['by_listing'].get(fingerprint or get_form_fingerprint(), 0)
+
+
+def check_listing_budget():
+    """Raise APIError when the current listing has used up its cost budget"""
+    if LISTING_COST_BUDGET_USD is None:
+        return
+    spent = get_listing_cost()
+    if spent >= LISTING_COST_BUDGET_USD:
+        raise APIError(
+            f"Listing cost budget reached (${spent:.3f} of ${LISTING_COST_BUDGET_USD:.2f}). "
+            "Cached results are still available.",
+            error_code='budget_exceeded'
+        )
+
+
+def get_usage_summary():
+    """Get session usage totals, steps ordered by cost, and the current listing's budget use"""
+    usage = _get_usage()
+    listing_cost = get_listing_cost()
+    return {
+        'total': dict(usage['total']),
+        'by_step': sorted(
+            ({'step': step, **totals} for step, totals in usage['by_step'].items()),
+            key=lambda row: row['cost'], reverse=True
+        ),
+        'listing_cost': listing_cost,
+        'listing_budget': LISTING_COST_BUDGET_USD,
+        'listing_budget_used': (listing_cost / LISTING_COST_BUDGET_USD) * 100 if LISTING_COST_BUDGET_USD else 0
+    }
+
+
+def get_daily_usage(days=7):
+    """Get process-wide usage per day and step for the last `days` days, newest first"""
+    since = time.strftime('%Y-%m-%d', time.localtime(time.time() - (days - 1) * 86400))
+    rows = _get_db().execute(
+        f"SELECT day, step, SUM(calls), SUM(prompt_tokens), SUM(completion_tokens), SUM(images), "
+        f"SUM(cost), SUM(cache_hits), SUM(saved_cost) FROM usage_daily WHERE day >= ? "
+        f"GROUP BY day, step ORDER BY day DESC, SUM(cost) DESC",
+        (since,)
+    )
+    return [dict(zip(('day', 'step') + USAGE_FIELDS, row)) for row in rows]